@@ -0,0 +1,164 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from structured_log import get_logger, progress
+
+# OpenDART 일일 한도는 한국 시간 자정에 초기화됨
+KST = timezone(timedelta(hours=9))
+
+log = get_logger('api_keys')
+
+
+class QuotaExhausted(Exception):
+    """모든 API 키가 오늘 한도를 소진했을 때 발생하는 예외"""
+
+
+def key_id(api_key: str) -> str:
+    """사용량 기록에 쓸 키 식별자 (키 원문은 저장하지 않음)"""
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:12]
+
+
+class ApiKeyPool:
+    """여러 DART API 키를 번갈아 쓰는 키 풀
+
+    키마다 하루 요청 수를 SQLite 파일에 기록하고(같은 파일을 쓰는 프로세스끼리 공유),
+    초당 요청 수를 토큰 버킷으로 제한합니다. 요청은 지금 토큰이 있는 키 중 오늘 남은 한도가 가장 많은 키로
+    보내며, 한도 초과(020) 응답을 받은 키는 그날은 더 이상 쓰지 않습니다.
+    """
+
+    def __init__(self, api_keys: List[str], usage_db: str = "result/.api_key_usage.db",
+                 daily_quota: int = 20000, rate_per_second: float = 10.0):
+        """
+        Args:
+            api_keys (list): DART API 키 목록
+            usage_db (str): 키별 일일 사용량을 기록할 SQLite 파일 경로
+            daily_quota (int): 키 하나의 하루 요청 한도
+            rate_per_second (float): 키 하나의 초당 최대 요청 수
+        """
+        self.api_keys = list(dict.fromkeys(key for key in api_keys if key))
+        if not self.api_keys:
+            raise ValueError("API 키가 하나 이상 필요합니다.")
+        self.daily_quota = daily_quota
+        self.rate_per_second = rate_per_second
+        self.usage_db = Path(usage_db)
+        self.usage_db.parent.mkdir(parents=True, exist_ok=True)
+        # 한도 확인과 사용량 증가를 한 트랜잭션으로 묶기 위해 BEGIN/COMMIT은 직접 관리
+        self.conn = sqlite3.connect(str(self.usage_db), timeout=30, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA busy_timeout=30000")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS key_usage (
+                day TEXT NOT NULL,
+                key_id TEXT NOT NULL,
+                requests INTEGER NOT NULL DEFAULT 0,
+                retired INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (day, key_id)
+            )
+        """)
+        self._lock = threading.Lock()
+        # 키별 토큰 버킷: [남은 토큰, 마지막 충전 시각]
+        self._buckets = {key: [rate_per_second, time.monotonic()] for key in self.api_keys}
+
+    @staticmethod
+    def today() -> str:
+        """한국 시간 기준 오늘 날짜"""
+        return datetime.now(KST).strftime('%Y%m%d')
+
+    def usage(self) -> Dict[str, Dict[str, int]]:
+        """오늘 키별 요청 수와 사용 중지 여부를 반환합니다. (키 식별자 기준)"""
+        rows = self.conn.execute(
+            "SELECT key_id, requests, retired FROM key_usage WHERE day = ?", (self.today(),)
+        ).fetchall()
+        recorded = {row[0]: {'requests': row[1], 'retired': bool(row[2])} for row in rows}
+        return {key_id(key): recorded.get(key_id(key), {'requests': 0, 'retired': False}) for key in self.api_keys}
+
+    def _transaction(self, sql_steps):
+        """쓰기 잠금(BEGIN IMMEDIATE)을 잡고 sql_steps를 실행합니다. (같은 DB를 쓰는 프로세스끼리 직렬화)"""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = sql_steps()
+            self.conn.execute("COMMIT")
+            return result
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def acquire(self) -> str:
+        """토큰이 있는 키 중 남은 한도가 가장 많은 키를 골라 요청 1건을 기록하고 반환합니다.
+
+        쓸 수 있는 모든 키의 초당 요청 수가 한도에 닿았을 때만 토큰이 찰 때까지 기다립니다.
+
+        Raises:
+            QuotaExhausted: 모든 키가 오늘 한도를 소진한 경우
+        """
+        while True:
+            with self._lock:
+                key, wait_seconds = self._transaction(self._claim)
+            if key:
+                return key
+            time.sleep(wait_seconds)
+
+    def _claim(self) -> Tuple[Optional[str], float]:
+        """(트랜잭션 안에서) 키 하나의 토큰과 오늘 한도 1건을 차지합니다.
+
+        Returns:
+            (키, 0) 또는 토큰이 있는 키가 없으면 (None, 가장 빨리 토큰이 차는 키까지 기다릴 시간)
+        """
+        day = self.today()
+        usage = self.usage()
+        candidates = [key for key in self.api_keys
+                      if not usage[key_id(key)]['retired'] and usage[key_id(key)]['requests'] < self.daily_quota]
+        if not candidates:
+            raise QuotaExhausted("모든 API 키가 오늘 요청 한도를 소진했습니다.")
+        tokens = {key: self._refill(key) for key in candidates}
+        ready = [key for key in candidates if tokens[key] >= 1]
+        if not ready:
+            return None, min((1 - tokens[key]) / self.rate_per_second for key in candidates)
+        key = max(ready, key=lambda k: (self.daily_quota - usage[key_id(k)]['requests'], tokens[k]))
+        self._buckets[key][0] = tokens[key] - 1
+        self.conn.execute(
+            "INSERT INTO key_usage (day, key_id, requests) VALUES (?, ?, 1) "
+            "ON CONFLICT (day, key_id) DO UPDATE SET requests = requests + 1",
+            (day, key_id(key))
+        )
+        return key, 0
+
+    def _refill(self, key: str) -> float:
+        """키의 토큰 버킷을 지금 시각까지 충전하고 남은 토큰 수를 반환합니다."""
+        bucket = self._buckets[key]
+        now = time.monotonic()
+        bucket[0] = min(self.rate_per_second, bucket[0] + (now - bucket[1]) * self.rate_per_second)
+        bucket[1] = now
+        return bucket[0]
+
+    def retire(self, api_key: str) -> int:
+        """한도 초과 응답을 받은 키를 오늘 하루 사용 중지하고 아직 쓸 수 있는 키 수를 반환합니다."""
+        with self._lock:
+            self._transaction(lambda: self.conn.execute(
+                "INSERT INTO key_usage (day, key_id, retired) VALUES (?, ?, 1) "
+                "ON CONFLICT (day, key_id) DO UPDATE SET retired = 1",
+                (self.today(), key_id(api_key))
+            ))
+            remaining = sum(1 for info in self.usage().values() if not info['retired'])
+        progress(log, logging.WARNING, "⛔", "API 키 %s의 오늘 한도가 소진되어 사용을 중지합니다. (남은 키 %d개)",
+                 key_id(api_key), remaining)
+        return remaining
+
+    def report(self) -> None:
+        """오늘 키별 사용량을 알립니다."""
+        with self._lock:
+            usage = self.usage()
+        for kid, info in usage.items():
+            state = "중지" if info['retired'] else "사용 중"
+            progress(log, logging.INFO, "🔑", "%s: 오늘 %s/%s건 (%s)",
+                     kid, f"{info['requests']:,}", f"{self.daily_quota:,}", state)
+
+    def close(self):
+        """DB 연결을 닫습니다."""
+        self.conn.close()
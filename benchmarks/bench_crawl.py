@@ -0,0 +1,124 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.mock_dart import add_server_arguments, server_options, start_mock_server  # noqa: E402
+
+# 모의 서버에 키 하나만 주면 020 응답 한 번에 크롤링이 멈추므로 여러 키로 분산
+MOCK_API_KEYS = [f"mock-key-{i}" for i in range(1, 9)]
+
+
+def write_jobs(path: Path, companies: int, jobs: int, year: str, report_type: str) -> None:
+    """모의 회사 jobs개의 작업 명세(JSONL)를 만듭니다. (회사 수보다 많으면 처음부터 다시)"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(jobs):
+            job = {'company_name': f"모의기업{i % companies + 1:04d}", 'year': year, 'report_type': report_type}
+            f.write(json.dumps(job, ensure_ascii=False) + '\n')
+
+
+def crawl_env(server_env: Dict[str, str], work_dir: Path, key_rate: Optional[float]) -> Dict[str, str]:
+    """모의 서버를 향하고, 키 사용량·지표를 작업 디렉토리에 기록하는 크롤러 환경"""
+    env = {key: value for key, value in os.environ.items() if not key.startswith('DART_')}
+    env.update(server_env)
+    env.update({
+        'DART_API_KEYS': ','.join(MOCK_API_KEYS),
+        'DART_KEY_USAGE_DB': str(work_dir / 'api_key_usage.db'),
+        'METRICS_SUMMARY_DIR': str(work_dir / 'runs'),
+        'METRICS_TEXTFILE': '',
+        'JOB_QUEUE_DB': '',
+        'LOG_LEVEL': 'WARNING',
+        'PYTHONDONTWRITEBYTECODE': '1',
+    })
+    if key_rate:
+        env['DART_KEY_RATE'] = str(key_rate)
+    return env
+
+
+def measure(workers: int, jobs_file: Path, args) -> Dict:
+    """새 모의 서버와 새 크롤러 프로세스로 작업자 workers개의 일괄 크롤링을 잽니다."""
+    server = start_mock_server(**server_options(args))
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            work_dir = Path(work_dir)
+            command = [sys.executable, str(REPO_ROOT / 'dart_cli.py'), 'crawl', '--config', str(jobs_file),
+                       '--output-dir', str(work_dir / 'out'), '--workers', str(workers)]
+            started = time.perf_counter()
+            completed = subprocess.run(command, cwd=work_dir, env=crawl_env(server.env(), work_dir, args.key_rate),
+                                       capture_output=True, text=True)
+            wall = time.perf_counter() - started
+            summaries = sorted((work_dir / 'runs').glob('*.json'))
+            summary = json.loads(summaries[-1].read_text(encoding='utf-8')) if summaries else {}
+            tail = completed.stdout.strip().splitlines()[-3:]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    counters = summary.get('counters', {})
+    ok = counters.get('crawl_jobs_ok', 0)
+    return {
+        'workers': workers,
+        'exit_code': completed.returncode,
+        'wall_seconds': round(wall, 3),
+        'jobs_ok': ok,
+        'jobs_failed': counters.get('crawl_jobs_failed', 0),
+        'jobs_per_s': round(ok / wall, 2) if wall else None,
+        'stages': {name: {'count': stage['count'], 'errors': stage['errors'], 'p95_seconds': stage['p95_seconds']}
+                   for name, stage in summary.get('stages', {}).items()},
+        'server': server.snapshot(),
+        'tail': tail,
+    }
+
+
+def print_result(result: Dict) -> None:
+    print(f"⏱️ 작업자 {result['workers']}개: {result['wall_seconds']:.2f}초, 성공 {result['jobs_ok']} / "
+          f"실패 {result['jobs_failed']} ({result['jobs_per_s']}건/s, 종료 코드 {result['exit_code']})")
+    for endpoint, stats in result['server'].items():
+        responses = ', '.join(f"{outcome} {count}" for outcome, count in sorted(stats['responses'].items()))
+        print(f"   🌐 [{endpoint}] 요청 {stats['requests']}회, 최대 동시 {stats['max_in_flight']} ({responses})")
+    for name in ('list', 'sub_docs', 'notes_fetch'):
+        stage = result['stages'].get(name)
+        if stage and stage['p95_seconds'] is not None:
+            print(f"   ⏱️ [{name}] {stage['count']}회, p95 ≤{stage['p95_seconds'] * 1000:.0f}ms, 오류 {stage['errors']}회")
+    if result['exit_code'] not in (0, 1):
+        print("   ❌ " + ' / '.join(result['tail']))
+
+
+def main(argv: Optional[List[str]] = None):
+    """모의 DART 서버 일괄 크롤링 벤치마크 실행 함수"""
+    parser = argparse.ArgumentParser(description="모의 DART 서버로 일괄 크롤링 처리량과 동시 요청 동작을 잽니다.")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8], help="비교할 작업자 수 (기본: 1 2 4 8)")
+    parser.add_argument('--jobs', type=int, default=40, help="크롤링할 작업 수 (기본: 40)")
+    parser.add_argument('--year', default='2025')
+    parser.add_argument('--report-type', default='반기보고서')
+    parser.add_argument('--key-rate', type=float, help="키 하나의 초당 최대 요청 수 (없으면 크롤러 기본값)")
+    parser.add_argument('--json', help="결과를 저장할 JSON 파일 경로")
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory() as jobs_dir:
+        jobs_file = Path(jobs_dir) / 'jobs.jsonl'
+        write_jobs(jobs_file, args.companies, args.jobs, args.year, args.report_type)
+        print(f"🧪 모의 DART 서버: 작업 {args.jobs}건, 지연 {args.latency}초 ±{args.jitter}, "
+              f"500 {args.error_rate:.0%}, 020 {args.throttle_rate:.0%}, 최대 동시 {args.max_concurrency or '무제한'}")
+        for workers in args.workers:
+            result = measure(workers, jobs_file, args)
+            print_result(result)
+            results.append(result)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
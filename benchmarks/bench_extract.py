@@ -0,0 +1,158 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.synthetic_notes import SIZE_PRESETS, write_notes_file  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# 측정하는 추출 단계 (stage_metrics의 단계 이름 그대로)
+EXTRACT_STAGES = ('html_parse', 'section_find', 'table_extract', 'merge', 'csv_write')
+
+# 기본으로 측정하는 크기 (large는 실행마다 1분 이상·수 GB 메모리가 필요하므로 --sizes로 지정할 때만)
+DEFAULT_SIZES = ['tiny', 'small', 'medium']
+
+
+def max_rss_bytes() -> Optional[int]:
+    """이 프로세스의 최대 상주 메모리 (지원하지 않는 플랫폼이면 None)"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def extract_once(html_path: str, output_dir: str) -> Dict:
+    """표 추출을 한 번 실행하고 시간(경과·CPU), 단계별 시간과 건수, 출력 CSV 경로를 반환합니다. (화면 출력은 버림)"""
+    from stage_metrics import METRICS
+    from table_cache import HeaderMemo
+    from table_extractor import TableExtractor
+
+    METRICS.drain()
+    # 실행마다 빈 헤더 메모로 시작해야 첫 실행과 같은 조건으로 잼
+    extractor = TableExtractor(html_path, header_memo=HeaderMemo(), output_dir=output_dir)
+    started, cpu_started = time.perf_counter(), time.process_time()
+    with contextlib.redirect_stdout(io.StringIO()):
+        success = extractor.extract_all_tables()
+    wall, cpu = time.perf_counter() - started, time.process_time() - cpu_started
+    state = METRICS.drain()
+    return {
+        'success': success,
+        'wall': wall,
+        'cpu': cpu,
+        'stages': {name: state['stages'][name]['seconds'] for name in EXTRACT_STAGES if name in state['stages']},
+        'tables': state['counters'].get('tables_extracted', 0),
+        'rows': state['counters'].get('csv_rows', 0),
+        'output': extractor.get_output_filename(),
+    }
+
+
+def run_worker(html_path: str, runs: int) -> Dict:
+    """(하위 프로세스) runs번 시간을 재고, 마지막에 tracemalloc으로 한 번 더 실행해 최대 메모리를 잽니다."""
+    # bs4는 parse_html()에서 처음 불러오므로 미리 불러와 import 시간이 첫 실행에 섞이지 않게 함
+    import bs4  # noqa: F401
+    with tempfile.TemporaryDirectory() as output_dir:
+        timings = [extract_once(html_path, output_dir) for _ in range(runs)]
+        # 추적은 실행을 느리게 하므로 시간 측정과 따로 실행
+        tracemalloc.start()
+        extract_once(html_path, output_dir)
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {
+        'success': all(timing['success'] for timing in timings),
+        'wall': statistics.median(timing['wall'] for timing in timings),
+        'stages': {name: statistics.median(timing['stages'].get(name, 0.0) for timing in timings)
+                   for name in EXTRACT_STAGES},
+        'tables': timings[0]['tables'],
+        'rows': timings[0]['rows'],
+        'traced_peak_bytes': traced_peak,
+        'max_rss_bytes': max_rss_bytes(),
+    }
+
+
+def measure(size: str, work_dir: Path, runs: int) -> Dict:
+    """크기 프리셋의 합성 HTML을 만들고 새 프로세스에서 추출 시간·메모리를 잽니다."""
+    html_path = write_notes_file(str(work_dir), size)
+    size_bytes = html_path.stat().st_size
+    completed = subprocess.run([sys.executable, __file__, '--worker', str(html_path), '--runs', str(runs)],
+                               cwd=REPO_ROOT, capture_output=True, text=True,
+                               env={**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'})
+    if completed.returncode != 0 or not completed.stdout.strip():
+        error = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else 'failed'
+        return {'size': size, 'bytes': size_bytes, 'error': error}
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    stages = result['stages']
+    megabytes = size_bytes / 1024 / 1024
+    result.update({
+        'size': size,
+        'bytes': size_bytes,
+        'error': None,
+        'mb_per_s': round(megabytes / result['wall'], 2) if result['wall'] else None,
+        'parse_mb_per_s': round(megabytes / stages['html_parse'], 2) if stages['html_parse'] else None,
+        'tables_per_s': round(result['tables'] / stages['table_extract'], 1) if stages['table_extract'] else None,
+        'rows_per_s': round(result['rows'] / stages['csv_write'], 1) if stages['csv_write'] else None,
+    })
+    return result
+
+
+def run(sizes: List[str], runs: int) -> List[Dict]:
+    """크기별 추출 벤치마크를 실행하고 결과 목록을 반환합니다."""
+    with tempfile.TemporaryDirectory() as work_dir:
+        return [measure(size, Path(work_dir), runs) for size in sizes]
+
+
+def print_result(result: Dict) -> None:
+    megabytes = result['bytes'] / 1024 / 1024
+    if result.get('error'):
+        print(f"❌ {result['size']} ({megabytes:,.1f}MB): {result['error'][:80]}")
+        return
+    print(f"⏱️ {result['size']} ({megabytes:,.1f}MB, 표 {result['tables']}개, CSV {result['rows']}행): "
+          f"{result['wall']:.3f}초, {result['mb_per_s']}MB/s")
+    for name in EXTRACT_STAGES:
+        print(f"   [{name:<13}] {result['stages'][name] * 1000:>9.1f}ms")
+    print(f"   파싱 {result['parse_mb_per_s']}MB/s, 표 추출 {result['tables_per_s']}개/s, CSV {result['rows_per_s']}행/s")
+    rss = f", 최대 RSS {result['max_rss_bytes'] / 1024 / 1024:,.1f}MB" if result['max_rss_bytes'] else ""
+    print(f"   🧠 최대 메모리 {result['traced_peak_bytes'] / 1024 / 1024:,.1f}MB (tracemalloc){rss}")
+
+
+def main(argv: Optional[List[str]] = None):
+    """표 추출 벤치마크 실행 함수"""
+    parser = argparse.ArgumentParser(description="합성 주석 HTML 크기별 표 추출 벤치마크 (처리량, 최대 메모리)")
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZE_PRESETS), default=DEFAULT_SIZES,
+                        help="측정할 크기 프리셋 (기본: tiny small medium; large는 50MB)")
+    parser.add_argument('--runs', type=int, default=3, help="크기마다 반복 실행 횟수 (중앙값 사용)")
+    parser.add_argument('--json', help="결과를 저장할 JSON 파일 경로")
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.runs)))
+        return
+
+    results = run(args.sizes, args.runs)
+    for result in results:
+        print_result(result)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# 무거운 의존성: 불러오는 데 시간이 오래 걸리므로 실제로 쓸 때만 불러와야 하는 모듈
+HEAVY_MODULES = ['pandas', 'numpy', 'OpenDartReader', 'requests', 'bs4', 'dotenv']
+
+# 측정 대상: (이름, 실행할 import 문)
+TARGETS = [
+    ('dart_crawler', 'import dart_crawler'),
+    ('table_extractor', 'import table_extractor'),
+    ('dart_cli', 'import dart_cli'),
+    ('job_queue 작업자', 'import job_queue, job_specs'),
+    ('REPORT_CODES만 사용', 'from dart_crawler import REPORT_CODES'),
+]
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+try:
+    exec({statement!r})
+    error = None
+except Exception as e:
+    error = f"{{type(e).__name__}}: {{e}}"
+elapsed = time.perf_counter() - started
+print(json.dumps({{'seconds': elapsed, 'error': error,
+                  'heavy': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(statement: str, cwd: Path, runs: int) -> Dict:
+    """새 인터프리터에서 statement를 runs번 실행해 import 시간(중앙값)과 프로세스 전체 시간을 잽니다."""
+    import_times = []
+    process_times = []
+    result = {}
+    # 설정 파일·API 키 없이 불러올 수 있어야 하므로 빈 환경에서 측정 (예전 코드 비교용으로 키만 임시 값)
+    env = {key: value for key, value in os.environ.items() if not key.startswith('DART_')}
+    env['DART_API_KEY'] = 'benchmark'
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+    code = PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+    for _ in range(runs):
+        started = time.perf_counter()
+        completed = subprocess.run([sys.executable, '-c', code], cwd=cwd, env=env,
+                                   capture_output=True, text=True)
+        process_times.append(time.perf_counter() - started)
+        if completed.returncode != 0 or not completed.stdout.strip():
+            return {'error': completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else 'failed'}
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        if result['error']:
+            return result
+        import_times.append(result['seconds'])
+    return {
+        'import_ms': round(statistics.median(import_times) * 1000, 1),
+        'process_ms': round(statistics.median(process_times) * 1000, 1),
+        'heavy': result.get('heavy', []),
+        'error': None,
+    }
+
+
+def export_ref(ref: str, target_dir: Path) -> None:
+    """git ref의 저장소 내용을 target_dir에 풀어 놓습니다. (비교 측정용)"""
+    archive = subprocess.run(['git', 'archive', '--format=tar', ref], cwd=REPO_ROOT,
+                             capture_output=True, check=True).stdout
+    archive_path = target_dir / 'ref.tar'
+    archive_path.write_bytes(archive)
+    with tarfile.open(archive_path) as tar:
+        if hasattr(tarfile, 'data_filter'):
+            tar.extractall(target_dir, filter='data')
+        else:
+            tar.extractall(target_dir)
+
+
+def run(runs: int, compare_ref: Optional[str]) -> List[Dict]:
+    """모든 측정 대상의 시작 시간을 재고 결과 목록을 반환합니다."""
+    baseline = measure('pass', REPO_ROOT, runs)
+    results = []
+    with tempfile.TemporaryDirectory() as ref_dir:
+        if compare_ref:
+            export_ref(compare_ref, Path(ref_dir))
+        for name, statement in TARGETS:
+            row = {'target': name, 'current': measure(statement, REPO_ROOT, runs)}
+            if compare_ref:
+                row['ref'] = measure(statement, Path(ref_dir), runs)
+            results.append(row)
+    print(f"🐍 빈 인터프리터 시작: {baseline['process_ms']}ms (중앙값, {runs}회)")
+    return results
+
+
+def format_cell(measurement: Dict) -> str:
+    if measurement.get('error'):
+        return f"실패 ({measurement['error'][:60]})"
+    heavy = ','.join(measurement['heavy']) or '-'
+    return f"{measurement['import_ms']:>7.1f}ms import / {measurement['process_ms']:>7.1f}ms 전체 [무거운 모듈: {heavy}]"
+
+
+def main(argv: Optional[List[str]] = None):
+    """시작 시간 벤치마크 실행 함수"""
+    parser = argparse.ArgumentParser(description="모듈 import(콜드 스타트) 시간 벤치마크")
+    parser.add_argument('--runs', type=int, default=7, help="대상마다 새 프로세스로 측정할 횟수")
+    parser.add_argument('--compare-ref', help="함께 측정할 git ref (예: HEAD~1)")
+    parser.add_argument('--json', help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args(argv)
+
+    results = run(args.runs, args.compare_ref)
+    for row in results:
+        print(f"⏱️ {row['target']}")
+        print(f"   현재: {format_cell(row['current'])}")
+        if 'ref' in row:
+            print(f"   {args.compare_ref}: {format_cell(row['ref'])}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
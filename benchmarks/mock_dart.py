@@ -0,0 +1,322 @@
+import argparse
+import io
+import json
+import random
+import sys
+import threading
+import time
+import zipfile
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.synthetic_notes import notes_body  # noqa: E402
+
+# 모의 서버 경로 → 엔드포인트 이름 (크롤러의 요청 제한기 이름과 같음)
+ENDPOINTS = {
+    '/api/corpCode.xml': 'corp_code',
+    '/api/list.json': 'list',
+    '/dsaf001/main.do': 'sub_docs',
+    '/report/viewer.do': 'viewer',
+}
+
+# OpenAPI 응답(JSON/XML 상태 코드)을 쓰는 엔드포인트. 나머지는 웹 페이지라 020 대신 HTTP 오류로 응답
+API_ENDPOINTS = ('corp_code', 'list')
+
+# 회사마다 올라오는 정기공시: (보고서명 형식, 접수 월일) — 사업보고서는 전년도 결산
+PERIODIC_FILINGS = [
+    ('사업보고서 ({prev}.12)', '0315'),
+    ('분기보고서 ({year}.03)', '0515'),
+    ('반기보고서 ({year}.06)', '0814'),
+    ('분기보고서 ({year}.09)', '1114'),
+]
+
+# 공시 뷰어 목차 (연결재무제표 주석은 3번째 하위 서류)
+SUB_DOC_TITLES = ['1. 요약재무정보', '2. 연결재무제표', '3. 연결재무제표 주석', '4. 재무제표', '5. 재무제표 주석']
+
+
+class MockDartServer(ThreadingHTTPServer):
+    """OpenDART(corpCode.xml, list.json)와 공시 뷰어(main.do, viewer.do)를 흉내 내는 로컬 서버
+
+    요청마다 지연(latency ± jitter)을 넣고, error_rate 비율로 HTTP 500, throttle_rate 비율로 020(요청 제한 초과)을
+    돌려줍니다. (크롤러는 020을 받은 키를 그날 쉬게 하므로 키 풀 동작을 확인할 때 사용)
+    엔드포인트별 동시 요청이 max_concurrency를 넘으면 초과한 요청은 HTTP 429로 거절합니다. (동시 요청 한도 조절 확인용)
+    엔드포인트별 요청 수·응답 코드·최대 동시 요청 수는 /_stats에서 JSON으로 볼 수 있습니다.
+    """
+
+    daemon_threads = True
+    # 여러 작업자가 한꺼번에 접속해도 연결이 거절되지 않도록 대기열을 넉넉히
+    request_queue_size = 128
+
+    def __init__(self, address: Tuple[str, int], companies: int = 100, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, throttle_rate: float = 0.0, max_concurrency: int = 0,
+                 subsidiaries: int = 20, notes_bytes: int = 0, seed: int = 0):
+        """
+        Args:
+            address (tuple): (호스트, 포트). 포트가 0이면 빈 포트를 골라 씀
+            companies (int): 고유번호 목록에 넣을 모의 회사 수 (모의기업0001, 모의기업0002, ...)
+            latency (float): 응답마다 넣을 평균 지연 (초)
+            jitter (float): 지연에 더할 ± 무작위 폭 (초)
+            error_rate (float): HTTP 500으로 응답할 비율 (0~1)
+            throttle_rate (float): 020(요청 제한 초과)으로 응답할 비율 (0~1)
+            max_concurrency (int): 엔드포인트별 최대 동시 요청 수 (0이면 제한 없음)
+            subsidiaries (int): 주석 본문 개요 표의 종속기업 수
+            notes_bytes (int): 주석 본문 목표 크기 (바이트, 0이면 개요와 주석 하나만)
+            seed (int): 오류 주입 난수 시드
+        """
+        super().__init__(address, MockDartHandler)
+        self.companies = companies
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.max_concurrency = max_concurrency
+        self.subsidiaries = subsidiaries
+        self.notes_bytes = notes_bytes
+        self.rng = random.Random(seed)
+        self.in_flight: Dict[str, int] = {}
+        self.stats: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._corp_code_zip: Optional[bytes] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> Dict[str, str]:
+        """크롤러를 이 서버로 향하게 하는 환경변수"""
+        return {
+            'DART_CORP_CODE_URL': f"{self.base_url}/api/corpCode.xml",
+            'DART_LIST_URL': f"{self.base_url}/api/list.json",
+            'DART_SUB_DOCS_URL': f"{self.base_url}/dsaf001/main.do",
+            'DART_VIEWER_URL': f"{self.base_url}/report/viewer.do",
+        }
+
+    def company_name(self, index: int) -> str:
+        return f"모의기업{index:04d}"
+
+    def begin(self, endpoint: str) -> Optional[str]:
+        """요청을 집계하고 주입할 결과를 정합니다. (None이면 정상 응답, 'error'/'throttled'/'overloaded')"""
+        with self._lock:
+            stats = self.stats.setdefault(endpoint, {'requests': 0, 'max_in_flight': 0, 'responses': {}})
+            stats['requests'] += 1
+            in_flight = self.in_flight.get(endpoint, 0) + 1
+            self.in_flight[endpoint] = in_flight
+            stats['max_in_flight'] = max(stats['max_in_flight'], in_flight)
+            if self.max_concurrency and in_flight > self.max_concurrency:
+                return 'overloaded'
+            draw = self.rng.random()
+        if draw < self.error_rate:
+            return 'error'
+        if draw < self.error_rate + self.throttle_rate:
+            return 'throttled'
+        return None
+
+    def finish(self, endpoint: str, outcome: str) -> None:
+        with self._lock:
+            self.in_flight[endpoint] -= 1
+            responses = self.stats[endpoint]['responses']
+            responses[outcome] = responses.get(outcome, 0) + 1
+
+    def delay(self) -> float:
+        with self._lock:
+            return max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return json.loads(json.dumps(self.stats))
+
+    def corp_code_zip(self) -> bytes:
+        """고유번호 목록 zip (CORPCODE.xml 하나)"""
+        if self._corp_code_zip is None:
+            items = ''.join(
+                f"<list><corp_code>{index:08d}</corp_code><corp_name>{self.company_name(index)}</corp_name>"
+                f"<stock_code>{index * 10:06d}</stock_code><modify_date>20250101</modify_date></list>"
+                for index in range(1, self.companies + 1))
+            buffer = io.BytesIO()
+            with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+                zip_file.writestr('CORPCODE.xml', f'<?xml version="1.0" encoding="UTF-8"?><result>{items}</result>')
+            self._corp_code_zip = buffer.getvalue()
+        return self._corp_code_zip
+
+    def filings(self, corp_code: str, year: str) -> List[Dict[str, str]]:
+        """회사의 그 해 정기공시 목록 (접수번호는 접수일자 + 회사 번호)"""
+        index = int(corp_code) if corp_code.isdigit() else 0
+        if not 1 <= index <= self.companies or not year.isdigit():
+            return []
+        return [{
+            'corp_code': corp_code, 'corp_name': self.company_name(index), 'stock_code': f"{index * 10:06d}",
+            'corp_cls': 'Y', 'report_nm': report_nm.format(year=year, prev=int(year) - 1),
+            'rcept_no': f"{year}{month_day}{index:06d}", 'flr_nm': self.company_name(index),
+            'rcept_dt': f"{year}{month_day}", 'rm': '',
+        } for report_nm, month_day in PERIODIC_FILINGS]
+
+
+@lru_cache(maxsize=256)
+def cached_notes_body(subsidiaries: int, notes_bytes: int, seed: int) -> str:
+    return notes_body(subsidiaries, notes_bytes, seed)
+
+
+class MockDartHandler(BaseHTTPRequestHandler):
+    server: MockDartServer
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        # 요청마다 stderr에 찍는 기본 접속 로그는 끔
+        pass
+
+    def send_body(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, data: Dict, status: int = 200) -> None:
+        self.send_body(status, json.dumps(data, ensure_ascii=False).encode('utf-8'), 'application/json; charset=utf-8')
+
+    def send_status_xml(self, status: str, message: str) -> None:
+        body = f'<?xml version="1.0" encoding="UTF-8"?><result><status>{status}</status><message>{message}</message></result>'
+        self.send_body(200, body.encode('utf-8'), 'application/xml; charset=utf-8')
+
+    def send_throttled(self, endpoint: str) -> None:
+        message = '사용한도를 초과하였습니다.'
+        if endpoint == 'corp_code':
+            self.send_status_xml('020', message)
+        else:
+            self.send_json({'status': '020', 'message': message})
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if url.path == '/_stats':
+            self.send_json(self.server.snapshot())
+            return
+        endpoint = ENDPOINTS.get(url.path)
+        if endpoint is None:
+            self.send_body(404, b'not found', 'text/plain')
+            return
+
+        injected = self.server.begin(endpoint)
+        outcome = injected or 'ok'
+        try:
+            time.sleep(self.server.delay())
+            if injected == 'error':
+                self.send_body(500, b'internal server error', 'text/plain')
+            elif injected == 'overloaded':
+                self.send_body(429, b'too many requests', 'text/plain')
+            elif injected == 'throttled':
+                if endpoint in API_ENDPOINTS:
+                    self.send_throttled(endpoint)
+                else:
+                    self.send_body(429, b'too many requests', 'text/plain')
+            elif endpoint in API_ENDPOINTS and not params.get('crtfc_key'):
+                outcome = 'no_key'
+                if endpoint == 'corp_code':
+                    self.send_status_xml('010', '등록되지 않은 키입니다.')
+                else:
+                    self.send_json({'status': '010', 'message': '등록되지 않은 키입니다.'})
+            else:
+                getattr(self, f"serve_{endpoint}")(params)
+        except (BrokenPipeError, ConnectionResetError):
+            outcome = 'disconnected'
+        finally:
+            self.server.finish(endpoint, outcome)
+
+    def serve_corp_code(self, params: Dict[str, str]) -> None:
+        self.send_body(200, self.server.corp_code_zip(), 'application/zip')
+
+    def serve_list(self, params: Dict[str, str]) -> None:
+        filings = self.server.filings(params.get('corp_code', ''), params.get('bgn_de', '')[:4])
+        if not filings:
+            self.send_json({'status': '013', 'message': '조회된 데이타가 없습니다.'})
+            return
+        self.send_json({'status': '000', 'message': '정상', 'page_no': 1, 'page_count': 100,
+                        'total_count': len(filings), 'total_page': 1, 'list': filings})
+
+    def serve_sub_docs(self, params: Dict[str, str]) -> None:
+        rcept_no = params.get('rcpNo', '')
+        nodes = []
+        for number, title in enumerate(SUB_DOC_TITLES, start=1):
+            nodes.append(
+                f'\t\tvar node2 = {{}};\n'
+                f'\t\tnode2[\'text\'] = "{title}";\n'
+                f'\t\tnode2[\'id\'] = "{number}";\n'
+                f'\t\tnode2[\'rcpNo\'] = "{rcept_no}";\n'
+                f'\t\tnode2[\'dcmNo\'] = "{rcept_no[-7:] or 0}";\n'
+                f'\t\tnode2[\'eleId\'] = "{number}";\n'
+                f'\t\tnode2[\'offset\'] = "{number * 1000}";\n'
+                f'\t\tnode2[\'length\'] = "{number * 500}";\n'
+                f'\t\tnode2[\'dtd\'] = "dart4.xsd";\n'
+                f'\t\tnode2[\'tocNo\'] = "{number}";\n')
+        page = f'<html><head><script type="text/javascript">\n{"".join(nodes)}</script></head><body></body></html>'
+        self.send_body(200, page.encode('utf-8'), 'text/html; charset=utf-8')
+
+    def serve_viewer(self, params: Dict[str, str]) -> None:
+        rcept_no = params.get('rcpNo')
+        if not rcept_no:
+            # 크롤러가 세션을 만들려고 먼저 여는 페이지
+            self.send_body(200, b'<html><body></body></html>', 'text/html; charset=utf-8')
+            return
+        seed = int(rcept_no) if rcept_no.isdigit() else 0
+        body = cached_notes_body(self.server.subsidiaries, self.server.notes_bytes, seed)
+        page = f'<html><head><meta charset="utf-8"></head><body>{body}</body></html>'
+        self.send_body(200, page.encode('utf-8'), 'text/html; charset=utf-8')
+
+
+def start_mock_server(host: str = '127.0.0.1', port: int = 0, **options) -> MockDartServer:
+    """모의 서버를 백그라운드 스레드에서 시작합니다. (server.shutdown()으로 종료)"""
+    server = MockDartServer((host, port), **options)
+    threading.Thread(target=server.serve_forever, name='mock-dart', daemon=True).start()
+    return server
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    """모의 서버 옵션 인자 (벤치마크 스크립트와 공유)"""
+    parser.add_argument('--companies', type=int, default=100, help="모의 회사 수 (기본: 100)")
+    parser.add_argument('--latency', type=float, default=0.05, help="응답 평균 지연 (초, 기본: 0.05)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="지연 ± 무작위 폭 (초)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="HTTP 500 응답 비율 (0~1)")
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="020 응답 비율 (0~1)")
+    parser.add_argument('--max-concurrency', type=int, default=0,
+                        help="엔드포인트별 최대 동시 요청 수 (넘으면 HTTP 429, 0이면 제한 없음)")
+    parser.add_argument('--subsidiaries', type=int, default=20, help="주석 본문 종속기업 수 (기본: 20)")
+    parser.add_argument('--notes-kb', type=int, default=0, help="주석 본문 목표 크기 (KB, 기본: 개요와 주석 하나만)")
+
+
+def server_options(args) -> Dict:
+    return {'companies': args.companies, 'latency': args.latency, 'jitter': args.jitter,
+            'error_rate': args.error_rate, 'throttle_rate': args.throttle_rate,
+            'max_concurrency': args.max_concurrency, 'subsidiaries': args.subsidiaries,
+            'notes_bytes': args.notes_kb * 1024}
+
+
+def main(argv: Optional[List[str]] = None):
+    """모의 OpenDART 서버 실행 함수"""
+    parser = argparse.ArgumentParser(description="오프라인 크롤링 성능 측정용 모의 OpenDART·공시 뷰어 서버")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8099, help="포트 (기본: 8099)")
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = MockDartServer((args.host, args.port), **server_options(args))
+    print(f"🧪 모의 DART 서버: {server.base_url} (회사 {args.companies}개, 통계: {server.base_url}/_stats)")
+    print("   크롤러 환경변수:")
+    for key, value in server.env().items():
+        print(f"   export {key}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️ 모의 서버를 종료합니다.")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
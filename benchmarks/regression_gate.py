@@ -0,0 +1,218 @@
+import argparse
+import gc
+import json
+import platform
+import shutil
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.bench_extract import extract_once  # noqa: E402
+from benchmarks.synthetic_notes import write_notes_file  # noqa: E402
+
+# 골든 CSV와 기준 시간·메모리를 저장하는 디렉토리
+FIXTURES_DIR = REPO_ROOT / 'benchmarks' / 'fixtures'
+
+# 합성 공시 고정 자료: 이름 → (크기 프리셋, 시드, 보고서 유형)
+SYNTHETIC_FIXTURES: Dict[str, Tuple[str, int, str]] = {
+    'synthetic-tiny': ('tiny', 0, '반기보고서'),
+    'synthetic-tiny-annual': ('tiny', 7, '사업보고서'),
+    'synthetic-small': ('small', 0, '반기보고서'),
+}
+
+# 기준 대비 허용 증가율 (시간은 측정 잡음이 크므로 메모리보다 넉넉히)
+TIME_TOLERANCE = 0.25
+MEMORY_TOLERANCE = 0.10
+# 아주 짧은 고정 자료의 시간 잡음을 흡수하는 최소 여유 (초)
+TIME_SLACK = 0.01
+
+# 종료 코드
+EXIT_OK = 0
+EXIT_REGRESSION = 1
+
+
+def collect_fixtures(work_dir: Path, names: Optional[List[str]], corpus: Optional[str]) -> Dict[str, Path]:
+    """고정 자료 이름 → 주석 HTML 경로 (합성 공시는 work_dir에 만들고, 저장된 공시는 corpus에서 찾음)"""
+    fixtures = {}
+    for name, (size, seed, report_type) in SYNTHETIC_FIXTURES.items():
+        if names and name not in names:
+            continue
+        fixtures[name] = write_notes_file(str(work_dir / name), size, report_type=report_type, seed=seed)
+    if corpus:
+        for html_path in sorted(Path(corpus).glob('*_연결재무제표주석.html')):
+            name = html_path.name[:-len('_연결재무제표주석.html')]
+            if not names or name in names:
+                fixtures[name] = html_path
+    return fixtures
+
+
+def run_fixture(html_path: Path, output_dir: Path, runs: int) -> Dict:
+    """고정 자료 하나를 runs번 추출해 가장 짧은 CPU 시간을 재고, tracemalloc으로 한 번 더 실행해 최대 메모리를 잽니다."""
+    # 첫 실행은 지연 import가 섞여 느리므로 출력 비교에만 쓰고 시간에서는 뺌
+    first = extract_once(str(html_path), str(output_dir))
+    # timeit처럼 시간 측정 중에는 GC를 꺼서 수거 시점에 따른 흔들림을 없앰
+    gc.collect()
+    gc.disable()
+    try:
+        timings = [extract_once(str(html_path), str(output_dir)) for _ in range(runs)]
+    finally:
+        gc.enable()
+    tracemalloc.start()
+    try:
+        extract_once(str(html_path), str(output_dir))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'success': first['success'] and all(timing['success'] for timing in timings),
+        # 경과 시간은 다른 프로세스에 밀려 들쭉날쭉하므로 CPU 시간으로 재고,
+        # 잡음은 시간을 늘리기만 하므로 중앙값보다 최솟값이 안정적
+        'seconds': round(min(timing['cpu'] for timing in timings), 4),
+        'peak_bytes': peak,
+        'output': Path(first['output']),
+    }
+
+
+def compare_output(output: Path, golden: Path) -> Optional[str]:
+    """출력 CSV를 골든 파일과 바이트 단위로 비교합니다. (같으면 None, 다르면 이유)"""
+    if not golden.exists():
+        return f"골든 파일 없음 ({golden.name}, --update-golden으로 생성)"
+    if not output.exists():
+        return "출력 CSV가 만들어지지 않음"
+    actual, expected = output.read_bytes(), golden.read_bytes()
+    if actual == expected:
+        return None
+    actual_lines, expected_lines = actual.splitlines(), expected.splitlines()
+    for line_no, (left, right) in enumerate(zip(actual_lines, expected_lines), start=1):
+        if left != right:
+            return f"{line_no}행부터 다름: {left.decode('utf-8-sig', 'replace')[:80]!r}"
+    return f"행 수가 다름: {len(actual_lines)}행 (골든 {len(expected_lines)}행)"
+
+
+def check_budget(result: Dict, baseline: Optional[Dict], time_tolerance: float,
+                 memory_tolerance: float) -> List[str]:
+    """기준 대비 시간·최대 메모리 초과 항목을 반환합니다."""
+    if not baseline:
+        return []
+    problems = []
+    time_budget = baseline['seconds'] * (1 + time_tolerance) + TIME_SLACK
+    if result['seconds'] > time_budget:
+        problems.append(f"시간 {result['seconds']:.3f}초 > 예산 {time_budget:.3f}초 (기준 {baseline['seconds']:.3f}초)")
+    memory_budget = baseline['peak_bytes'] * (1 + memory_tolerance)
+    if result['peak_bytes'] > memory_budget:
+        problems.append(f"메모리 {result['peak_bytes'] / 1024 / 1024:.1f}MB > 예산 {memory_budget / 1024 / 1024:.1f}MB "
+                        f"(기준 {baseline['peak_bytes'] / 1024 / 1024:.1f}MB)")
+    return problems
+
+
+def load_baseline(path: Path) -> Dict:
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(path: Path, results: Dict[str, Dict], previous: Dict) -> None:
+    """측정값으로 기준을 갱신합니다. (이번에 측정하지 않은 고정 자료의 기준은 그대로 둠)"""
+    fixtures = dict(previous.get('fixtures', {}))
+    fixtures.update({name: {'seconds': result['seconds'], 'peak_bytes': result['peak_bytes']}
+                     for name, result in results.items()})
+    baseline = {
+        'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': f"{platform.system()} {platform.machine()}",
+        'fixtures': dict(sorted(fixtures.items())),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """표 추출 회귀 검사 실행 함수 (종료 코드 반환)"""
+    parser = argparse.ArgumentParser(
+        description="고정 자료로 표 추출 결과(골든 CSV)와 시간·최대 메모리 예산(기준 대비)을 검사합니다.",
+        epilog=f"종료 코드: {EXIT_OK} 통과, {EXIT_REGRESSION} 출력 변경 또는 예산 초과")
+    parser.add_argument('--fixtures', nargs='+', help="검사할 고정 자료 이름 (기본: 전체)")
+    parser.add_argument('--corpus', help="저장된 주석 HTML 디렉토리 (*_연결재무제표주석.html도 고정 자료로 검사)")
+    parser.add_argument('--fixtures-dir', default=str(FIXTURES_DIR), help="골든 CSV·기준 파일 디렉토리")
+    parser.add_argument('--runs', type=int, default=5, help="고정 자료마다 반복 실행 횟수 (시간은 최솟값)")
+    parser.add_argument('--time-tolerance', type=float, default=TIME_TOLERANCE,
+                        help=f"기준 대비 허용 시간 증가율 (기본: {TIME_TOLERANCE})")
+    parser.add_argument('--memory-tolerance', type=float, default=MEMORY_TOLERANCE,
+                        help=f"기준 대비 허용 최대 메모리 증가율 (기본: {MEMORY_TOLERANCE})")
+    parser.add_argument('--update-golden', action='store_true', help="의도한 출력 변경이면 골든 CSV를 현재 출력으로 교체")
+    parser.add_argument('--update-baseline', action='store_true', help="현재 측정값을 새 시간·메모리 기준으로 저장")
+    parser.add_argument('--json', help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args(argv)
+
+    fixtures_dir = Path(args.fixtures_dir)
+    golden_dir = fixtures_dir / 'golden'
+    baseline_path = fixtures_dir / 'baseline.json'
+    baseline = load_baseline(baseline_path)
+    # bs4는 parse_html()에서 처음 불러오므로 미리 불러와 import 시간이 첫 고정 자료에 섞이지 않게 함
+    import bs4  # noqa: F401
+
+    results = {}
+    failed = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        fixtures = collect_fixtures(work_dir / 'input', args.fixtures, args.corpus)
+        if not fixtures:
+            print("❌ 검사할 고정 자료가 없습니다.")
+            return EXIT_REGRESSION
+        for name, html_path in fixtures.items():
+            result = run_fixture(html_path, work_dir / 'output' / name, args.runs)
+            results[name] = result
+            golden = golden_dir / f"{name}.csv"
+            problems = [] if result['success'] else ["추출 실패"]
+            if args.update_golden and result['output'].exists():
+                golden_dir.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(result['output'], golden)
+            else:
+                mismatch = compare_output(result['output'], golden)
+                if mismatch:
+                    problems.append(f"출력 변경: {mismatch}")
+            if not args.update_baseline:
+                problems += check_budget(result, baseline.get('fixtures', {}).get(name),
+                                         args.time_tolerance, args.memory_tolerance)
+
+            reference = baseline.get('fixtures', {}).get(name)
+            versus = (f" (기준 {reference['seconds']:.3f}초, {reference['peak_bytes'] / 1024 / 1024:.1f}MB)"
+                      if reference else " (기준 없음)")
+            print(f"{'❌' if problems else '✅'} {name}: {result['seconds']:.3f}초, "
+                  f"최대 {result['peak_bytes'] / 1024 / 1024:.1f}MB{versus}")
+            for problem in problems:
+                print(f"   - {problem}")
+            if reference and not problems and result['seconds'] < reference['seconds'] * (1 - args.time_tolerance):
+                print(f"   💡 기준보다 {1 - result['seconds'] / reference['seconds']:.0%} 빠름 "
+                      f"(--update-baseline으로 기준을 낮출 수 있음)")
+            if problems:
+                failed.append(name)
+            result.update({'output': result['output'].name, 'problems': problems})
+
+    if args.update_golden:
+        print(f"💾 골든 CSV 갱신: {golden_dir}")
+    if args.update_baseline:
+        save_baseline(baseline_path, results, baseline)
+        print(f"💾 시간·메모리 기준 갱신: {baseline_path}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.json}")
+    if failed:
+        print(f"\n❌ 회귀 검사 실패: {len(failed)}/{len(results)}개 고정 자료 ({', '.join(failed)})")
+        return EXIT_REGRESSION
+    print(f"\n🎉 회귀 검사 통과: {len(results)}개 고정 자료")
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+import argparse
+import random
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# 크기별 프리셋: 이름 → (종속기업 수, 목표 파일 크기(바이트), 0이면 개요 주석만)
+SIZE_PRESETS: Dict[str, Tuple[int, int]] = {
+    'tiny': (3, 0),
+    'small': (30, 1 * 1024 * 1024),
+    'medium': (150, 10 * 1024 * 1024),
+    'large': (400, 50 * 1024 * 1024),
+}
+
+# DART 주석 표의 회색 헤더 셀 스타일
+HEADER_STYLE = 'background-color:#D7D7D7'
+
+# 개요 주석 뒤에 이어 붙이는 다른 주석 제목 (목표 크기까지 반복)
+FILLER_NOTES = [
+    '재무제표 작성기준', '중요한 회계정책', '중요한 회계추정 및 가정', '영업부문', '공정가치',
+    '금융상품', '현금및현금성자산', '매출채권 및 기타채권', '재고자산', '유형자산', '무형자산',
+    '리스', '차입금', '충당부채', '퇴직급여', '법인세', '특수관계자 거래', '우발부채와 약정사항',
+]
+
+LOCATIONS = ['대한민국', '미국', '중국', '베트남', '일본', '독일', '인도', '멕시코']
+INDUSTRIES = ['제조업', '도소매업', '서비스업', '금융업', '부동산업', '연구개발']
+NAME_PREFIXES = ['한빛', '누리', '다온', '미래', '새솔', '가람', '온결', '푸른', '해담', '라온']
+NAME_SUFFIXES = ['테크', '소재', '물산', '로지스', '에너지', '바이오', '솔루션', '케미칼']
+
+
+def header_cell(text: str, colspan: int = 1, rowspan: int = 1) -> str:
+    spans = (f' COLSPAN="{colspan}"' if colspan > 1 else '') + (f' ROWSPAN="{rowspan}"' if rowspan > 1 else '')
+    return f'<TD ALIGN="CENTER" VALIGN="MIDDLE" STYLE="{HEADER_STYLE}"{spans}>{text}</TD>'
+
+
+def data_row(values: Sequence[str]) -> str:
+    cells = [f'<TD ALIGN="LEFT">{values[0]}</TD>']
+    cells += [f'<TD ALIGN="RIGHT">{value}</TD>' for value in values[1:]]
+    return '<TR>' + ''.join(cells) + '</TR>'
+
+
+def table(header_rows: List[List[Tuple[str, int, int]]], rows: List[Sequence[str]], width: int,
+          unit: Optional[str] = '천원') -> str:
+    """DART 뷰어 형식의 표 (단위 행, 회색 헤더 행, 데이터 행)"""
+    parts = ['<TABLE class="TABLE" width="100%" border="1" cellspacing="0" cellpadding="0" '
+             'style="border-collapse:collapse;"><TBODY>']
+    if unit:
+        parts.append(f'<TR><TD ALIGN="RIGHT" COLSPAN="{width}">(단위:{unit})</TD></TR>')
+    for header_row in header_rows:
+        parts.append('<TR>' + ''.join(header_cell(*cell) for cell in header_row) + '</TR>')
+    parts.extend(data_row(row) for row in rows)
+    parts.append('</TBODY></TABLE>')
+    return ''.join(parts)
+
+
+def simple_headers(names: Sequence[str]) -> List[List[Tuple[str, int, int]]]:
+    return [[(name, 1, 1) for name in names]]
+
+
+def amount(rng: random.Random, low: int = -5_000_000, high: int = 90_000_000) -> str:
+    """DART 표기(천 단위 쉼표, 음수는 괄호)의 금액"""
+    value = rng.randint(low, high)
+    return f"({-value:,})" if value < 0 else f"{value:,}"
+
+
+def subsidiary_names(count: int, rng: random.Random) -> List[str]:
+    names = []
+    for i in range(count):
+        name = f"{rng.choice(NAME_PREFIXES)}{rng.choice(NAME_SUFFIXES)}"
+        names.append(f"{name}{i + 1}" if count > len(NAME_PREFIXES) else name)
+    return names
+
+
+def overview_note(subsidiaries: List[str], rng: random.Random) -> str:
+    """1. 지배기업의 개요 주석 ((1)~(7) 하위 항목)"""
+    parts = ['<P>1. 지배기업의 개요</P>',
+             '<P>지배기업은 전자부품의 제조 및 판매를 주된 사업으로 하고 있으며, 본사는 서울특별시에 있습니다.</P>']
+
+    # (1) 종속기업 현황: 2단 헤더 (rowspan/colspan)
+    parts.append('<P>(1) 당반기말 현재 연결대상 종속기업의 현황은 다음과 같습니다.</P>')
+    header_rows = [[('종속기업명', 1, 2), ('소재지', 1, 2), ('업종', 1, 2), ('지분율(%)', 2, 1), ('결산월', 1, 2)],
+                   [('당반기말', 1, 1), ('전기말', 1, 1)]]
+    rows = []
+    for name in subsidiaries:
+        share = rng.choice(['100.00', '51.00', '75.50', '60.00', '88.20'])
+        rows.append([name, rng.choice(LOCATIONS), rng.choice(INDUSTRIES), share, share, '12월'])
+    parts.append(table(header_rows, rows, 6, unit=None))
+
+    # (2) 연결범위 변동
+    parts.append('<P>(2) 당반기 중 연결범위의 변동 내용은 다음과 같습니다.</P>')
+    changed = subsidiaries[:max(1, len(subsidiaries) // 20)]
+    parts.append(table(simple_headers(['구분', '회사명', '사유']),
+                       [[rng.choice(['신규 편입', '연결 제외']), name, rng.choice(['신규 설립', '지분 취득', '청산'])]
+                        for name in changed], 3, unit=None))
+
+    # (3)~(5) 요약 재무정보: 기간별 표
+    summaries = [
+        ('3', '연결대상 종속기업의 요약재무상태는 다음과 같습니다.', ['당반기말', '전기말'], ['자산', '부채', '자본']),
+        ('4', '연결대상 종속기업의 요약경영성과는 다음과 같습니다.', ['당반기', '전반기'], ['매출액', '반기순손익', '총포괄손익']),
+        ('5', '연결대상 종속기업의 요약현금흐름은 다음과 같습니다.', ['당반기', '전반기'],
+         ['영업활동현금흐름', '투자활동현금흐름', '재무활동현금흐름', '현금의 증감']),
+    ]
+    for number, title, periods, columns in summaries:
+        parts.append(f'<P>({number}) {title}</P>')
+        for period in periods:
+            parts.append(f'<P>&lt;{period}&gt;</P>')
+            parts.append(table(simple_headers(['구분'] + columns),
+                               [[name] + [amount(rng) for _ in columns] for name in subsidiaries],
+                               len(columns) + 1))
+
+    # (6) 비지배지분: 기간마다 열 구성이 다름
+    parts.append('<P>(6) 당반기와 전기 중 연결대상 종속기업에 대한 비지배지분의 변동내역은 다음과 같습니다.</P>')
+    minority = subsidiaries[:max(1, len(subsidiaries) // 3)]
+    for period, columns in (('당반기말', ['기초', '반기순손익', '기타변동', '연결범위의 변동', '반기말']),
+                            ('전기말', ['기초', '당기순손익', '배당', '기말'])):
+        parts.append(f'<P>&lt;{period}&gt;</P>')
+        parts.append(table(simple_headers(['구분'] + columns),
+                           [[name] + [amount(rng, 0, 9_000_000) for _ in columns] for name in minority],
+                           len(columns) + 1))
+
+    # (7) 비지배지분과의 거래
+    parts.append('<P>(7) 당반기 중 비지배지분과의 거래가 자본에 미치는 영향은 다음과 같습니다.</P>')
+    parts.append(table(simple_headers(['구분', '금액']),
+                       [['취득한 비지배지분의 장부금액', amount(rng, 0, 90_000)],
+                        ['비지배지분에 지급한 대가', amount(rng, -90_000, -1)],
+                        ['지배기업 소유주지분에 인식된 금액', amount(rng, -9_000, 9_000)]], 2))
+    return ''.join(parts)
+
+
+def filler_note(number: int, title: str, rng: random.Random, rows: int) -> str:
+    """개요 외 주석 하나 (설명 문단과 기간별 표)"""
+    parts = [f'<P>{number}. {title}</P>',
+             f'<P>연결실체의 {title} 관련 내역은 다음과 같으며, 비교 표시된 전기 금액은 재작성되지 않았습니다.</P>']
+    for period in ('당반기말', '전기말'):
+        parts.append(f'<P>&lt;{period}&gt;</P>')
+        header_rows = [[('구분', 1, 2), ('장부금액', 2, 1), ('공정가치', 1, 2)], [('유동', 1, 1), ('비유동', 1, 1)]]
+        parts.append(table(header_rows, [[f"{title} 항목{i + 1}"] + [amount(rng) for _ in range(3)]
+                                         for i in range(rows)], 4))
+    return ''.join(parts)
+
+
+def notes_body(subsidiaries: int = 3, target_bytes: int = 0, seed: int = 0) -> str:
+    """공시 뷰어의 연결재무제표 주석 본문 (개요 주석과 목표 크기까지 이어 붙인 다른 주석)
+
+    Args:
+        subsidiaries (int): 개요 주석 표에 넣을 종속기업 수
+        target_bytes (int): 목표 본문 크기(UTF-8 바이트). 개요 뒤에 다른 주석을 이어 붙여 맞춤 (0이면 개요와 주석 하나만)
+        seed (int): 난수 시드 (같은 인자면 항상 같은 본문)
+    """
+    rng = random.Random(seed)
+    parts = [overview_note(subsidiary_names(subsidiaries, rng), rng)]
+    size = len(parts[0].encode('utf-8'))
+
+    # 마지막 주석 번호(2.)가 있어야 개요 주석의 끝을 찾으므로 최소 하나는 붙임
+    number = 2
+    while number == 2 or size < target_bytes:
+        title = FILLER_NOTES[(number - 2) % len(FILLER_NOTES)]
+        note = filler_note(number, title, rng, rows=max(5, subsidiaries // 4))
+        parts.append(note)
+        size += len(note.encode('utf-8'))
+        number += 1
+    return ''.join(parts)
+
+
+def generate_notes_html(subsidiaries: int = 3, target_bytes: int = 0, company: str = '합성전자',
+                        year: str = '2025', report_type: str = '반기보고서', seed: int = 0) -> str:
+    """크롤러가 저장하는 것과 같은 구조의 합성 연결재무제표 주석 HTML을 만듭니다.
+
+    Args:
+        subsidiaries (int): 개요 주석 표에 넣을 종속기업 수
+        target_bytes (int): 목표 파일 크기(UTF-8 바이트). 개요 뒤에 다른 주석을 이어 붙여 맞춤 (0이면 개요만)
+        company (str): 회사명
+        year (str): 연도
+        report_type (str): 보고서 유형
+        seed (int): 난수 시드 (같은 인자면 항상 같은 HTML)
+    """
+    head = (f'<!DOCTYPE html>\n<html lang="ko">\n<head>\n<meta charset="UTF-8">\n'
+            f'<title>{company} {year}년 {report_type} 연결재무제표 주석</title>\n</head>\n<body>\n'
+            f'<div class="header">\n<h1>📊 {company} {year}년 {report_type} 연결재무제표 주석</h1>\n'
+            f'<p><strong>🏢 회사명:</strong> {company}</p>\n<p><strong>📅 연도:</strong> {year}</p>\n'
+            f'<p><strong>📋 보고서 유형:</strong> {report_type}</p>\n'
+            f'<p><strong>🔢 접수번호:</strong> {year}0814{seed:06d}</p>\n</div>\n'
+            f'<div class="content">\n<h2>📖 연결재무제표 주석 내용</h2>\n<hr>\n')
+    tail = '\n</div>\n</body>\n</html>'
+    body_bytes = max(0, target_bytes - len((head + tail).encode('utf-8'))) if target_bytes else 0
+    return head + notes_body(subsidiaries, body_bytes, seed) + tail
+
+
+def write_notes_file(output_dir: str, size: str = 'tiny', company: Optional[str] = None,
+                     year: str = '2025', report_type: str = '반기보고서', seed: int = 0) -> Path:
+    """프리셋 크기의 합성 주석 HTML을 크롤러 파일명 규칙으로 저장하고 경로를 반환합니다."""
+    subsidiaries, target_bytes = SIZE_PRESETS[size]
+    company = company or f"합성{size}"
+    path = Path(output_dir) / f"{company}_{year}_{report_type}_연결재무제표주석.html"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(generate_notes_html(subsidiaries, target_bytes, company, year, report_type, seed),
+                    encoding='utf-8')
+    return path
+
+
+def main(argv: Optional[List[str]] = None):
+    """합성 주석 HTML 생성 실행 함수"""
+    parser = argparse.ArgumentParser(description="DART 형식의 합성 연결재무제표 주석 HTML 생성 (벤치마크·테스트용)")
+    parser.add_argument('--size', choices=list(SIZE_PRESETS), default='tiny',
+                        help="크기 프리셋 (tiny: 개요만, small 1MB, medium 10MB, large 50MB)")
+    parser.add_argument('--output-dir', default='result', help="저장 디렉토리 (기본: result)")
+    parser.add_argument('--company', help="회사명 (기본: 합성{크기})")
+    parser.add_argument('--year', default='2025')
+    parser.add_argument('--report-type', default='반기보고서')
+    parser.add_argument('--seed', type=int, default=0, help="난수 시드")
+    args = parser.parse_args(argv)
+
+    path = write_notes_file(args.output_dir, args.size, args.company, args.year, args.report_type, args.seed)
+    print(f"✅ 합성 주석 HTML 생성: {path} ({path.stat().st_size / 1024 / 1024:,.1f}MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
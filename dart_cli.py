@@ -0,0 +1,258 @@
+import argparse
+import glob
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from job_specs import shard_arg
+from stage_metrics import export_run_metrics
+from structured_log import get_logger, setup_logging
+from job_profiler import PROFILER, default_profile_dir
+
+# 종료 코드
+EXIT_OK = 0           # 모든 작업 성공
+EXIT_PARTIAL = 1      # 일부 작업 실패 (다시 실행하면 실패한 작업만 이어서 처리)
+EXIT_USAGE = 2        # 잘못된 인자·설정 파일·API 키 등 실행 전 오류
+EXIT_CRASH = 70       # 예기치 않은 오류로 중단 (EX_SOFTWARE)
+EXIT_INTERRUPTED = 130  # Ctrl+C로 중단
+
+OUTPUT_FORMATS = ('csv', 'csv.gz')
+
+log = get_logger('cli')
+
+
+def positive_int(value: str) -> int:
+    """1 이상의 정수 인자"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"1 이상이어야 합니다: {value}")
+    return number
+
+
+def config_exists(config_file: str) -> bool:
+    if Path(config_file).exists():
+        return True
+    print(f"❌ 설정 파일을 찾을 수 없습니다: {config_file}")
+    return False
+
+
+def cmd_crawl(args) -> int:
+    """설정 파일의 작업을 묻지 않고 일괄 크롤링합니다."""
+    if not config_exists(args.config):
+        return EXIT_USAGE
+    # 크롤러는 API 키가 필요하므로 crawl/run에서만 불러옴
+    import dart_crawler
+
+    try:
+        client = dart_crawler.DartClient(output_dir=args.output_dir, crawl_workers=args.workers)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return EXIT_USAGE
+    if args.concurrency:
+        client.throttle.set_max_limit(args.concurrency)
+    dart_crawler.set_client(client)
+
+    queue_db = args.queue_db if args.queue_db is not None else client.job_queue_db
+    success = dart_crawler.process_companies_from_config(args.config, queue_db=queue_db or None, shard=args.shard)
+    if success:
+        print("\n🎉 모든 기업의 크롤링이 완료되었습니다!")
+        return EXIT_OK
+    print("\n⚠️ 일부 기업의 크롤링에 실패했습니다.")
+    return EXIT_PARTIAL
+
+
+def cmd_extract(args) -> int:
+    """저장된 주석 HTML에서 표 데이터를 추출합니다. (HTML 파일을 지정하면 그 파일들만)"""
+    from table_extractor import BatchTableExtractor, extract_html_files
+
+    if args.html_files:
+        success = extract_html_files(args.html_files, output_dir=args.output_dir, output_format=args.format,
+                                     cache_dir=args.cache_dir)
+        return EXIT_OK if success else EXIT_PARTIAL
+
+    if not config_exists(args.config):
+        return EXIT_USAGE
+    batch_extractor = BatchTableExtractor(args.config, combined_output=args.combined_output,
+                                          cache_dir=args.cache_dir, force=args.force, shard=args.shard,
+                                          output_dir=args.output_dir, output_format=args.format,
+                                          workers=args.workers)
+    if not batch_extractor.load_config():
+        print("\n❌ 설정 파일 로드에 실패했습니다.")
+        return EXIT_USAGE
+    if batch_extractor.process_all_companies():
+        print("\n🎉 모든 기업의 표 데이터 추출이 완료되었습니다!")
+        return EXIT_OK
+    print("\n⚠️ 일부 기업의 표 데이터 추출에 실패했습니다.")
+    return EXIT_PARTIAL
+
+
+def cmd_run(args) -> int:
+    """크롤링 후 표 데이터 추출까지 이어서 실행합니다. (크롤링이 일부 실패해도 받은 공시는 추출)"""
+    crawl_code = cmd_crawl(args)
+    if crawl_code == EXIT_USAGE:
+        return crawl_code
+    print("\n🔄 표 데이터 추출을 시작합니다...")
+    # 크롤링 작업자 수는 스레드 수이므로 추출은 프로세스 1개(기본)로 처리
+    args.workers = args.extract_workers
+    extract_code = cmd_extract(args)
+    return max(crawl_code, extract_code)
+
+
+def cmd_index(args) -> int:
+    """저장된 주석 HTML을 전문 검색 색인(과 바이트 오프셋 인덱스)에 추가합니다."""
+    from notes_search import NotesSearchIndex
+
+    html_files = args.html_files or sorted(glob.glob(str(Path(args.output_dir) / '*_연결재무제표주석.html')))
+    if not html_files:
+        print(f"❌ 색인할 주석 HTML 파일이 없습니다: {args.output_dir}")
+        return EXIT_USAGE
+
+    db_path = args.db or str(Path(args.output_dir) / 'notes_index.db')
+    failed = 0
+    search_index = NotesSearchIndex(db_path)
+    try:
+        for html_file in html_files:
+            try:
+                if args.offsets:
+                    from notes_index import NotesIndex
+                    NotesIndex.load_or_build(html_file)
+                if search_index.add_html_file(html_file):
+                    print(f"✅ 색인 완료: {html_file}")
+                    continue
+                print(f"❌ 접수번호를 찾을 수 없어 색인하지 못했습니다: {html_file}")
+            except Exception as e:
+                print(f"❌ 색인 실패: {html_file} ({e})")
+            failed += 1
+    finally:
+        search_index.close()
+    print(f"\n📊 색인 결과: {len(html_files) - failed}/{len(html_files)}개 성공 ({db_path})")
+    return EXIT_OK if not failed else EXIT_PARTIAL
+
+
+def cmd_bench(args) -> int:
+    """시작 시간(startup), 합성 주석 크기별 표 추출(extract) 벤치마크 또는 추출 회귀 검사(gate)를 실행합니다."""
+    argv = ['--runs', str(args.runs)] if args.runs else []
+    if args.json:
+        argv += ['--json', args.json]
+    if args.suite == 'extract':
+        from benchmarks import bench_extract
+        if args.sizes:
+            argv += ['--sizes', *args.sizes]
+        bench_extract.main(argv)
+        return EXIT_OK
+    if args.suite == 'gate':
+        from benchmarks import regression_gate
+        return regression_gate.main(argv)
+
+    from benchmarks import bench_startup
+    if args.compare_ref:
+        argv += ['--compare-ref', args.compare_ref]
+    bench_startup.main(argv)
+    return EXIT_OK
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="DART 연결재무제표 주석 크롤링·표 추출 (묻지 않고 실행)",
+        epilog=f"종료 코드: {EXIT_OK} 성공, {EXIT_PARTIAL} 일부 실패, {EXIT_USAGE} 인자·설정 오류, "
+               f"{EXIT_CRASH} 예기치 않은 오류, {EXIT_INTERRUPTED} 중단")
+    subparsers = parser.add_subparsers(dest='command', required=True, metavar='command')
+
+    # 공통 인자
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--output-dir', default='result', help="주석 HTML·CSV 저장 디렉토리 (기본: result)")
+    common.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'], type=str.upper,
+                        help="로그 수준 (없으면 LOG_LEVEL, 기본 INFO; DEBUG면 공시·하위 서류·표별 상세 로그)")
+    common.add_argument('--log-file', help="JSON Lines 로그 파일 (없으면 LOG_FILE, 비어 있으면 stderr)")
+
+    jobs = argparse.ArgumentParser(add_help=False)
+    jobs.add_argument('--config', default='companies_config.json', help="설정 파일 (JSON 또는 JSONL 작업 명세)")
+    jobs.add_argument('--shard', type=shard_arg, help="전체 작업 중 i번 샤드만 처리 (i/N, i는 0부터)")
+
+    profiling = argparse.ArgumentParser(add_help=False)
+    profiling.add_argument('--profile', action='store_true',
+                           help="작업마다 cProfile 실행 (.prof 파일과 상위 함수 보고서)")
+    profiling.add_argument('--trace-memory', action='store_true',
+                           help="작업마다 tracemalloc 최대 사용량과 할당 위치 기록")
+    profiling.add_argument('--profile-dir', help="프로파일 결과 디렉토리 (기본: 출력 디렉토리/profile/시작시각)")
+    profiling.add_argument('--profile-top', type=positive_int, default=20, help="보고서에 보여줄 항목 수 (기본: 20)")
+
+    crawl = argparse.ArgumentParser(add_help=False)
+    crawl.add_argument('--concurrency', type=positive_int,
+                       help="엔드포인트별 최대 동시 요청 수 (기본: 작업자 수, 실제 값은 응답에 따라 자동 조절)")
+    crawl.add_argument('--queue-db', help="영속 작업 큐 경로 (없으면 JOB_QUEUE_DB 환경변수)")
+
+    extract = argparse.ArgumentParser(add_help=False)
+    extract.add_argument('--cache-dir', help="표 캐시 디렉토리 (변경 없는 HTML은 파싱 생략)")
+    extract.add_argument('--format', choices=OUTPUT_FORMATS, default='csv', help="공시별 출력 형식 (기본: csv)")
+    extract.add_argument('--combined-output', help="모든 공시를 이어 쓸 통합 CSV(.gz) 경로")
+    extract.add_argument('--force', action='store_true', help="변경 사항이 없는 공시도 다시 추출")
+
+    parser_crawl = subparsers.add_parser('crawl', parents=[common, jobs, crawl, profiling], help="일괄 크롤링")
+    parser_crawl.add_argument('--workers', type=positive_int, help="동시 작업 스레드 수 (없으면 CRAWL_WORKERS, 기본 4)")
+    parser_crawl.set_defaults(func=cmd_crawl)
+
+    parser_extract = subparsers.add_parser('extract', parents=[common, jobs, extract, profiling], help="표 데이터 추출")
+    parser_extract.add_argument('html_files', nargs='*', help="추출할 주석 HTML 파일 (없으면 설정 파일의 작업)")
+    parser_extract.add_argument('--workers', type=positive_int, default=1, help="HTML 파싱 프로세스 수 (기본: 1)")
+    parser_extract.set_defaults(func=cmd_extract)
+
+    parser_run = subparsers.add_parser('run', parents=[common, jobs, crawl, extract, profiling],
+                                       help="크롤링 후 표 데이터 추출")
+    parser_run.add_argument('--workers', type=positive_int, help="동시 크롤링 스레드 수 (없으면 CRAWL_WORKERS, 기본 4)")
+    parser_run.add_argument('--extract-workers', type=positive_int, default=1, help="HTML 파싱 프로세스 수 (기본: 1)")
+    parser_run.set_defaults(func=cmd_run, html_files=[])
+
+    parser_index = subparsers.add_parser('index', parents=[common], help="저장된 주석 HTML 전문 검색 색인")
+    parser_index.add_argument('html_files', nargs='*', help="색인할 HTML 파일 (없으면 출력 디렉토리의 주석 HTML 전체)")
+    parser_index.add_argument('--db', help="색인 DB 경로 (기본: 출력 디렉토리/notes_index.db)")
+    parser_index.add_argument('--offsets', action='store_true', help="표 추출용 바이트 오프셋 인덱스(.idx.json)도 생성")
+    parser_index.set_defaults(func=cmd_index)
+
+    parser_bench = subparsers.add_parser('bench', help="시작 시간·표 추출 벤치마크, 추출 회귀 검사")
+    parser_bench.add_argument('--suite', choices=['startup', 'extract', 'gate'], default='startup',
+                              help="startup: 모듈 import 시간, extract: 합성 주석 크기별 추출 처리량·메모리, "
+                                   "gate: 골든 CSV·시간·메모리 기준 회귀 검사 (실패 시 종료 코드 1)")
+    parser_bench.add_argument('--runs', type=positive_int, help="반복 측정 횟수 (기본: startup 7, extract 3, gate 5)")
+    parser_bench.add_argument('--compare-ref', help="(startup) 함께 측정할 git ref (예: HEAD~1)")
+    parser_bench.add_argument('--sizes', nargs='+', choices=['tiny', 'small', 'medium', 'large'],
+                              help="(extract) 측정할 크기 (기본: tiny small medium)")
+    parser_bench.add_argument('--json', help="결과를 저장할 JSON 파일 경로")
+    parser_bench.set_defaults(func=cmd_bench)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI 실행 함수 (종료 코드 반환)"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == 'extract' and args.html_files:
+        # HTML 파일을 직접 지정하면 설정 파일의 작업 목록을 쓰지 않으므로 일괄 처리 옵션은 적용할 수 없음
+        ignored = [option for option, used in (('--combined-output', args.combined_output), ('--force', args.force),
+                                               ('--shard', args.shard), ('--workers', args.workers > 1)) if used]
+        if ignored:
+            parser.error(f"HTML 파일을 지정하면 {', '.join(ignored)} 옵션을 사용할 수 없습니다.")
+    setup_logging(getattr(args, 'log_level', None), getattr(args, 'log_file', None))
+    if getattr(args, 'profile', False) or getattr(args, 'trace_memory', False):
+        PROFILER.configure(args.profile_dir or default_profile_dir(args.output_dir), profile=args.profile,
+                           trace_memory=args.trace_memory, top_n=args.profile_top)
+    exit_code = EXIT_CRASH
+    try:
+        exit_code = args.func(args)
+        return exit_code
+    except KeyboardInterrupt:
+        exit_code = EXIT_INTERRUPTED
+        print("\n⏹️ 중단되었습니다. 같은 명령으로 다시 실행하면 이어서 처리합니다.")
+        return exit_code
+    except Exception as e:
+        log.exception("예기치 않은 오류로 중단되었습니다: %s", e)
+        return exit_code
+    finally:
+        # 중단되거나 일부 실패한 실행도 어디까지 얼마나 걸렸는지 남김
+        export_run_metrics(args.command, getattr(args, 'output_dir', 'result'),
+                           exit_code=exit_code, shard=getattr(args, 'shard', None))
+        PROFILER.report()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
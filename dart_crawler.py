@@ -1,31 +1,119 @@
-import requests
+import argparse
+import logging
+import threading
 import zipfile
 import io
 import xml.etree.ElementTree as ET
 import json
 import os
 from pathlib import Path
-from typing import Union, Dict, List, Optional
-from bs4 import BeautifulSoup
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Union, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 import re
-from OpenDartReader.dart import OpenDartReader
-from dotenv import load_dotenv
+from notes_search import NotesSearchIndex
+from job_specs import iter_jobs, iter_shard, job_key, shard_arg, shard_path
+from job_queue import JOB_STATES, JobQueue, default_worker_id
+from dart_throttle import DART_STATUS_THROTTLED, DartThrottled, ThrottleRegistry
+from api_key_pool import ApiKeyPool, QuotaExhausted
+from stage_metrics import METRICS, export_run_metrics
+from structured_log import get_logger, job_context, progress, set_interactive, setup_logging
+from job_profiler import PROFILER
 
-# 환경변수 로드
-load_dotenv()
+# requests, BeautifulSoup, OpenDartReader(pandas)는 무거우므로 실제로 네트워크를 쓸 때 불러옴.
+# 설정(.env)도 모듈을 불러올 때가 아니라 DartClient를 만들 때 읽으므로
+# API 키 없이도 REPORT_CODES 같은 도우미를 가져다 쓸 수 있음.
 
-# 환경변수에서 설정값 가져오기
-api_key = os.getenv('DART_API_KEY')
-corp_code_url_base = os.getenv('DART_CORP_CODE_URL', 'https://opendart.fss.or.kr/api/corpCode.xml')
-list_url = os.getenv('DART_LIST_URL', 'https://opendart.fss.or.kr/api/list.json')
-output_dir = Path(os.getenv('OUTPUT_DIR', 'result'))
+class DartClient:
+    """DART 접속 설정과 API 키 풀, 엔드포인트별 요청 제한기를 묶은 클라이언트"""
+    
+    def __init__(self, api_keys: Optional[List[str]] = None, output_dir: Optional[str] = None,
+                 crawl_workers: Optional[int] = None):
+        """
+        Args:
+            api_keys (list, optional): DART API 키 목록 (없으면 DART_API_KEYS / DART_API_KEY 환경변수)
+            output_dir (str, optional): 출력 디렉토리 (없으면 OUTPUT_DIR 환경변수, 기본 result)
+            crawl_workers (int, optional): 일괄 크롤링 동시 작업 수 (없으면 CRAWL_WORKERS 환경변수, 기본 4)
+        """
+        from dotenv import load_dotenv
+        
+        # 환경변수 로드
+        load_dotenv()
+        
+        # 환경변수에서 설정값 가져오기
+        if not api_keys:
+            # 여러 키를 쉼표로 나열하면 남은 한도가 가장 많은 키로 요청을 분산
+            api_keys = [key.strip() for key in os.getenv('DART_API_KEYS', '').split(',') if key.strip()]
+            api_keys = api_keys or [os.getenv('DART_API_KEY')]
+        # API 키 검증
+        if not any(api_keys):
+            raise ValueError("DART_API_KEY 환경변수가 설정되지 않았습니다. .env 파일을 확인해주세요.")
+        self.api_keys = [key for key in api_keys if key]
+        self.api_key = self.api_keys[0]
+        self.corp_code_url_base = os.getenv('DART_CORP_CODE_URL', 'https://opendart.fss.or.kr/api/corpCode.xml')
+        self.list_url = os.getenv('DART_LIST_URL', 'https://opendart.fss.or.kr/api/list.json')
+        # 하위 서류 목록(main.do) 주소: 지정하면 OpenDartReader 대신 직접 조회 (모의 서버·프록시용)
+        self.sub_docs_url = os.getenv('DART_SUB_DOCS_URL', '')
+        # 하위 서류 목록을 직접 조회할 때 하위 서류 URL을 만들 뷰어 주소
+        self.viewer_url = os.getenv('DART_VIEWER_URL', 'https://dart.fss.or.kr/report/viewer.do')
+        self.output_dir = Path(output_dir or os.getenv('OUTPUT_DIR', 'result'))
+        # 일괄 크롤링 동시 작업 수 (엔드포인트별 실제 동시 요청 수는 응답 상황에 따라 자동 조절)
+        self.crawl_workers = max(1, int(crawl_workers or os.getenv('CRAWL_WORKERS', '4')))
+        # 일괄 처리 작업 큐 경로 (지정하면 중단된 실행을 이어서 처리하고 여러 작업자가 나눠 처리)
+        self.job_queue_db = os.getenv('JOB_QUEUE_DB', '')
+        # 주석 전문 검색 색인 경로 (빈 값이면 색인하지 않음)
+        self.notes_index_db = os.getenv('NOTES_INDEX_DB', str(self.output_dir / 'notes_index.db'))
+        
+        # 키별 일일 사용량·초당 요청 수를 관리하는 키 풀
+        self.key_pool = ApiKeyPool(
+            self.api_keys,
+            usage_db=os.getenv('DART_KEY_USAGE_DB', str(self.output_dir / '.api_key_usage.db')),
+            daily_quota=int(os.getenv('DART_DAILY_QUOTA', '20000')),
+            rate_per_second=float(os.getenv('DART_KEY_RATE', '10')),
+        )
+        # 엔드포인트별(list, viewer, sub_docs, corp_code) 적응형 동시 요청 제한기
+        self.throttle = ThrottleRegistry(max_limit=self.crawl_workers)
+        self._corp_code_map = None
+        self._corp_code_lock = threading.Lock()
+    
+    def load_corp_code_map(self) -> Dict[str, str]:
+        """회사명 → 고유번호 사전을 만듭니다. (클라이언트당 한 번만 다운로드)"""
+        # 여러 작업자 스레드가 동시에 처음 호출해도 한 번만 내려받도록 잠금
+        with self._corp_code_lock:
+            if self._corp_code_map is None:
+                corp_code_map = {}
+                for corp in iter_corp_codes(self):
+                    # 같은 이름이 여러 개면 기존처럼 목록에서 먼저 나온 회사를 사용
+                    corp_code_map.setdefault(corp['corp_name'], corp['corp_code'])
+                self._corp_code_map = corp_code_map
+            return self._corp_code_map
+
+_default_client: Optional[DartClient] = None
+_default_client_lock = threading.Lock()
+
+def get_client() -> DartClient:
+    """기본 클라이언트를 반환합니다. (처음 호출할 때 환경변수로 생성)"""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = DartClient()
+        return _default_client
 
-# API 키 검증
-if not api_key:
-    raise ValueError("DART_API_KEY 환경변수가 설정되지 않았습니다. .env 파일을 확인해주세요.")
+def set_client(client: DartClient) -> None:
+    """기본 클라이언트를 바꿉니다. (설정을 코드에서 지정할 때)"""
+    global _default_client
+    with _default_client_lock:
+        _default_client = client
 
-# DART에서 제공하는 전체 회사 고유번호 목록 URL
-corp_code_url = f"{corp_code_url_base}?crtfc_key={api_key}"
+# 예전처럼 dart_crawler.api_key, dart_crawler.output_dir 등으로 설정값을 읽을 수 있도록 기본 클라이언트에 위임
+_CLIENT_ATTRIBUTES = {'api_key', 'api_keys', 'corp_code_url_base', 'list_url', 'sub_docs_url', 'viewer_url',
+                      'output_dir', 'crawl_workers', 'job_queue_db', 'notes_index_db', 'key_pool', 'throttle'}
+
+def __getattr__(name: str):
+    if name in _CLIENT_ATTRIBUTES:
+        return getattr(get_client(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+log = get_logger('crawler')
 
 # 보고서 코드 매핑
 REPORT_CODES = {
@@ -36,32 +124,59 @@ REPORT_CODES = {
     "5": {"name": "3분기보고서", "code": "11013", "quarter": "09"}   # 9월
 }
 
-def get_corp_code(company_name: str) -> Optional[str]:
-    """회사명을 입력받아 DART 고유번호를 반환합니다."""
-    try:
-        # URL 요청하여 zip 파일 다운로드
-        res = requests.get(corp_code_url)
+def iter_corp_codes(client: Optional[DartClient] = None) -> Iterator[Dict[str, str]]:
+    """DART 전체 회사 고유번호 목록을 한 회사씩 생성합니다. (XML을 한 번에 트리로 만들지 않음)"""
+    import requests
+    
+    client = client or get_client()
+    key_pool = client.key_pool
+    
+    # URL 요청하여 zip 파일 다운로드
+    def fetch():
+        key = key_pool.acquire()
+        res = requests.get(client.corp_code_url_base, params={'crtfc_key': key}, timeout=120)
         res.raise_for_status()
+        # 정상이면 zip 파일, 오류면 status가 담긴 XML이 옴
+        if not res.content.startswith(b'PK'):
+            error = ET.fromstring(res.content)
+            status = error.findtext('status')
+            if status == DART_STATUS_THROTTLED:
+                remaining = key_pool.retire(key)
+                raise DartThrottled(error.findtext('message'), key_rotated=remaining > 0)
+            raise RuntimeError(f"고유번호 목록 조회 실패: {status}")
+        METRICS.add_bytes('corp_lookup', len(res.content))
+        return res
 
-        # 메모리 상에서 zip 파일 압축 해제
-        zip_file = zipfile.ZipFile(io.BytesIO(res.content))
-        xml_data = zip_file.read('CORPCODE.xml')
+    res = client.throttle.get('corp_code').call(fetch)
 
-        # XML 파싱
-        root = ET.fromstring(xml_data)
-        
-        for company in root.findall('.//list'):
-            corp_name = company.find('corp_name').text
-            corp_code = company.find('corp_code').text
-            
-            if corp_name == company_name:
-                return corp_code
-        return None
+    # 메모리 상에서 zip 파일 압축 해제 후 <list> 단위로 스트리밍 파싱
+    zip_file = zipfile.ZipFile(io.BytesIO(res.content))
+    with zip_file.open('CORPCODE.xml') as xml_file:
+        for _, element in ET.iterparse(xml_file):
+            if element.tag != 'list':
+                continue
+            yield {
+                'corp_code': (element.findtext('corp_code') or '').strip(),
+                'corp_name': (element.findtext('corp_name') or '').strip(),
+                'stock_code': (element.findtext('stock_code') or '').strip(),
+                'modify_date': (element.findtext('modify_date') or '').strip(),
+            }
+            element.clear()
+
+def get_corp_code(company_name: str) -> Optional[str]:
+    """회사명을 입력받아 DART 고유번호를 반환합니다."""
+    try:
+        # 첫 호출은 고유번호 목록 다운로드·파싱 시간까지 포함
+        with METRICS.stage('corp_lookup'):
+            return get_client().load_corp_code_map().get(company_name)
+    except QuotaExhausted:
+        raise
     except Exception as e:
-        print(f"회사 고유번호 조회 중 오류: {e}")
+        progress(log, logging.WARNING, "❌", "회사 고유번호 조회 중 오류: %s", e, exc_info=True)
         return None
 
-def get_consolidated_financial_notes(company_name: str, year: str, report_type: str) -> Optional[Dict]:
+def get_consolidated_financial_notes(company_name: str, year: str, report_type: str,
+                                     corp_code: Optional[str] = None) -> Optional[Dict]:
     """
     특정 회사의 연결재무제표 주석을 가져옵니다.
     
@@ -69,69 +184,83 @@ def get_consolidated_financial_notes(company_name: str, year: str, report_type:
         company_name (str): 회사명
         year (str): 연도
         report_type (str): 보고서 유형 (1-5)
+        corp_code (str, optional): 회사 고유번호 (작업 명세에 있으면 고유번호 조회 생략)
     
     Returns:
         dict: 주석 정보 (성공 시) 또는 None (실패 시)
     """
     try:
-        print(f"=== {company_name} {year}년 {REPORT_CODES[report_type]['name']} 연결재무제표 주석 조회 ===")
+        progress(log, logging.DEBUG, "===", "%s %s년 %s 연결재무제표 주석 조회 ===",
+                 company_name, year, REPORT_CODES[report_type]['name'])
         
         # 1단계: 회사 고유번호 찾기
-        print(f"\n1️⃣ 회사 고유번호 조회 중...")
-        corp_code = get_corp_code(company_name)
+        progress(log, logging.DEBUG, "\n1️⃣", "회사 고유번호 조회 중...")
+        corp_code = corp_code or get_corp_code(company_name)
         if not corp_code:
-            print(f"❌ '{company_name}'의 고유번호를 찾을 수 없습니다.")
+            progress(log, logging.WARNING, "❌", "'%s'의 고유번호를 찾을 수 없습니다.", company_name)
             return None
         
-        print(f"✅ 회사 고유번호: {corp_code}")
+        progress(log, logging.DEBUG, "✅", "회사 고유번호: %s", corp_code)
         
         # 2단계: 보고서 목록 조회
-        print(f"\n2️⃣ {year}년도 보고서 목록 조회 중...")
+        progress(log, logging.DEBUG, "\n2️⃣", "%s년도 보고서 목록 조회 중...", year)
         reports = get_report_list(corp_code, year, report_type)
         if not reports:
-            print(f"❌ {year}년도에 해당하는 보고서를 찾을 수 없습니다.")
+            progress(log, logging.WARNING, "❌", "%s년도에 해당하는 보고서를 찾을 수 없습니다.", year)
             return None
         
-        print(f"✅ {len(reports)}개의 보고서를 찾았습니다.")
+        progress(log, logging.DEBUG, "✅", "%d개의 보고서를 찾았습니다.", len(reports))
         
         # 3단계: 각 보고서에서 연결재무제표 주석 찾기
         for i, report in enumerate(reports):
             rcept_no = report.get('rcept_no')
             rcept_dt = report.get('rcept_dt')
             
-            print(f"\n3️⃣ {i+1}번째 보고서 처리 중...")
-            print(f"   📋 접수번호: {rcept_no}")
-            print(f"   📅 접수일자: {rcept_dt}")
+            progress(log, logging.DEBUG, "\n3️⃣", "%d번째 보고서 처리 중... (접수번호: %s, 접수일자: %s)",
+                     i + 1, rcept_no, rcept_dt)
             
             # 4단계: 하위 서류 목록 조회
             notes_info = get_consolidated_notes_from_report(rcept_no)
             if notes_info:
-                print(f"✅ 연결재무제표 주석을 성공적으로 찾았습니다!")
-                return {
-                    'company_name': company_name,
-                    'year': year,
-                    'report_type': REPORT_CODES[report_type]['name'],
-                    'rcept_no': rcept_no,
-                    'rcept_dt': rcept_dt,
-                    'notes_title': notes_info['title'],
-                    'notes_url': notes_info['url'],
-                    'html_content': notes_info['html_content'],
-                    'text_content': notes_info['text_content'],
-                    'html_length': len(notes_info['html_content']),
-                    'text_length': len(notes_info['text_content'])
-                }
+                progress(log, logging.DEBUG, "✅", "연결재무제표 주석을 성공적으로 찾았습니다!")
+                return build_notes_result(company_name, year, REPORT_CODES[report_type]['name'],
+                                          rcept_no, rcept_dt, notes_info)
             else:
-                print(f"❌ 이 보고서에서 연결재무제표 주석을 찾을 수 없습니다.")
+                progress(log, logging.DEBUG, "❌", "이 보고서에서 연결재무제표 주석을 찾을 수 없습니다.",
+                         extra={'rcept_no': rcept_no})
         
-        print(f"\n❌ {year}년도 모든 보고서에서 연결재무제표 주석을 찾을 수 없습니다.")
+        progress(log, logging.WARNING, "\n❌", "%s년도 모든 보고서에서 연결재무제표 주석을 찾을 수 없습니다.", year)
         return None
         
+    except QuotaExhausted:
+        raise
     except Exception as e:
-        print(f"❌ 연결재무제표 주석 조회 중 오류: {e}")
+        progress(log, logging.WARNING, "❌", "연결재무제표 주석 조회 중 오류: %s", e, exc_info=True)
         return None
 
+def build_notes_result(company_name: str, year: str, report_type_name: str,
+                       rcept_no: str, rcept_dt: str, notes_info: Dict) -> Dict:
+    """하위 서류에서 찾은 주석 정보를 조회 결과 형식으로 만듭니다."""
+    return {
+        'company_name': company_name,
+        'year': year,
+        'report_type': report_type_name,
+        'rcept_no': rcept_no,
+        'rcept_dt': rcept_dt,
+        'notes_title': notes_info['title'],
+        'notes_url': notes_info['url'],
+        'html_content': notes_info['html_content'],
+        'text_content': notes_info['text_content'],
+        'html_length': len(notes_info['html_content']),
+        'text_length': len(notes_info['text_content'])
+    }
+
 def get_report_list(corp_code: str, year: str, report_type_key: str) -> Optional[List[Dict]]:
     """특정 회사의 보고서 목록을 조회합니다."""
+    import requests
+    
+    client = get_client()
+    key_pool = client.key_pool
     # 여러 연도로 시도 (DART API는 공시 연도와 다를 수 있음)
     years_to_try = [year, str(int(year)-1), str(int(year)-2)]
     
@@ -141,13 +270,12 @@ def get_report_list(corp_code: str, year: str, report_type_key: str) -> Optional
     quarter_month = report_info.get('quarter', None)
     
     for try_year in years_to_try:
-        print(f"   🔍 {try_year}년도로 시도 중...")
+        progress(log, logging.DEBUG, "   🔍", "%s년도로 시도 중...", try_year)
         
         try:
             # 직접 DART API로 보고서 목록 조회
             
             params = {
-                'crtfc_key': api_key,
                 'corp_code': corp_code,
                 'bgn_de': f"{try_year}0101",
                 'end_de': f"{try_year}1231",
@@ -156,20 +284,31 @@ def get_report_list(corp_code: str, year: str, report_type_key: str) -> Optional
                 'page_count': 100
             }
             
-            res = requests.get(list_url, params=params)
-            res.raise_for_status()
+            def fetch():
+                key = key_pool.acquire()
+                res = requests.get(client.list_url, params={**params, 'crtfc_key': key}, timeout=30)
+                res.raise_for_status()
+                METRICS.add_bytes('list', len(res.content))
+                data = res.json()
+                if data.get('status') == DART_STATUS_THROTTLED:
+                    # 한도를 넘긴 키는 오늘 하루 쉬고, 다시 시도할 때 다른 키를 사용
+                    remaining = key_pool.retire(key)
+                    raise DartThrottled(data.get('message'), key_rotated=remaining > 0)
+                return data
             
-            data = res.json()
+            with METRICS.stage('list'):
+                data = client.throttle.get('list').call(fetch)
             
             if data.get('status') != '000':
-                print(f"      ❌ API 오류: {data.get('message')}")
+                progress(log, logging.DEBUG, "      ❌", "API 오류: %s", data.get('message'))
                 continue
             
-            print(f"      ✅ API 응답: {data.get('message')}")
-            print(f"      📊 데이터 개수: {len(data.get('list', []))}")
+            progress(log, logging.DEBUG, "      ✅", "API 응답: %s (데이터 %d개)",
+                     data.get('message'), len(data.get('list', [])))
+            METRICS.count('filings_listed', len(data.get('list', [])))
             
             if len(data.get('list', [])) == 0:
-                print(f"      ❌ 데이터가 없습니다.")
+                progress(log, logging.DEBUG, "      ❌", "데이터가 없습니다.")
                 continue
             
             # 해당 보고서 유형의 보고서만 필터링
@@ -178,7 +317,8 @@ def get_report_list(corp_code: str, year: str, report_type_key: str) -> Optional
                 report_name = item.get('report_nm', '')
                 rcept_dt = item.get('rcept_dt', '')  # 접수일자 (YYYYMMDD 형식)
                 
-                print(f"      📋 {report_code} {report_name} (접수일: {rcept_dt})")
+                log.debug("공시 %s %s (접수일: %s)", report_code, report_name, rcept_dt,
+                          extra={'rcept_no': item.get('rcept_no'), 'rcept_dt': rcept_dt})
                 
                 # 보고서 제목에 해당 유형이 포함되어 있는지 확인
                 if report_code == "11014" and "반기보고서" in report_name:
@@ -193,42 +333,53 @@ def get_report_list(corp_code: str, year: str, report_type_key: str) -> Optional
                             report_month = rcept_dt[4:6]
                             # 1분기보고서: 03월 근처 (02~05월), 3분기보고서: 09월 근처 (08~11월)
                             if quarter_month == "03" and report_month in ["02", "03", "04", "05"]:
-                                print(f"         🎯 1분기보고서 매칭 ({report_month}월)")
+                                log.debug("1분기보고서 매칭 (%s월)", report_month)
                                 target_reports.append(item)
                             elif quarter_month == "09" and report_month in ["08", "09", "10", "11"]:
-                                print(f"         🎯 3분기보고서 매칭 ({report_month}월)")
+                                log.debug("3분기보고서 매칭 (%s월)", report_month)
                                 target_reports.append(item)
                     else:
                         # 일반 분기보고서 (모든 분기)
                         target_reports.append(item)
             
             if target_reports:
-                print(f"      🎯 {len(target_reports)}개의 해당 보고서를 찾았습니다!")
+                progress(log, logging.DEBUG, "      🎯", "%d개의 해당 보고서를 찾았습니다!", len(target_reports))
                 return target_reports
             else:
-                print(f"      ❌ 해당 보고서 유형을 찾을 수 없습니다.")
+                progress(log, logging.DEBUG, "      ❌", "해당 보고서 유형을 찾을 수 없습니다.")
                 
+        except QuotaExhausted:
+            raise
         except Exception as e:
-            print(f"      ❌ 처리 중 오류: {e}")
+            progress(log, logging.WARNING, "      ❌", "보고서 목록 처리 중 오류 (%s년): %s", try_year, e, exc_info=True)
             continue
     
     return None
 
 def get_notes_content_from_url(url: str) -> Optional[Dict]:
     """URL에서 주석 내용을 가져옵니다."""
+    import requests
+    from bs4 import BeautifulSoup
+    
     try:
-        print(f"         📥 URL에서 내용 가져오는 중...")
+        progress(log, logging.DEBUG, "         📥", "URL에서 내용 가져오는 중...", extra={'url': url})
         
-        # 세션 생성하여 세션 유지
-        session = requests.Session()
-        
-        # 먼저 메인 페이지에 접속하여 세션 생성
-        main_url = url.split('?')[0] + '?' + '&'.join([p for p in url.split('?')[1].split('&') if not p.startswith('rcpNo=')])
-        session.get(main_url)
+        def fetch():
+            # 세션 생성하여 세션 유지
+            session = requests.Session()
+            
+            # 먼저 메인 페이지에 접속하여 세션 생성
+            main_url = url.split('?')[0] + '?' + '&'.join([p for p in url.split('?')[1].split('&') if not p.startswith('rcpNo=')])
+            session.get(main_url, timeout=30)
+            
+            # 주석 페이지 접속
+            response = session.get(url, timeout=60)
+            response.raise_for_status()
+            METRICS.add_bytes('notes_fetch', len(response.content))
+            return response
         
-        # 주석 페이지 접속
-        response = session.get(url)
-        response.raise_for_status()
+        with METRICS.stage('notes_fetch'):
+            response = get_client().throttle.get('viewer').call(fetch)
         
         # HTML 원본과 정리된 텍스트 모두 반환
         html_content = response.content.decode('utf-8')
@@ -247,45 +398,88 @@ def get_notes_content_from_url(url: str) -> Optional[Dict]:
         clean_text = re.sub(r'\s+', ' ', text_content).strip()
         
         if len(clean_text) > 100:  # 의미있는 내용이 있는 경우만
-            print(f"         ✅ 내용 추출 성공! (HTML: {len(html_content)} 문자, 텍스트: {len(clean_text)} 문자)")
+            progress(log, logging.DEBUG, "         ✅", "내용 추출 성공! (HTML: %d 문자, 텍스트: %d 문자)",
+                     len(html_content), len(clean_text))
             return {
                 'html': html_content,
                 'text': clean_text
             }
         else:
-            print(f"         ❌ 추출된 내용이 너무 짧습니다.")
+            progress(log, logging.DEBUG, "         ❌", "추출된 내용이 너무 짧습니다.", extra={'url': url})
             return None
             
     except Exception as e:
-        print(f"         ❌ URL에서 내용 가져오기 실패: {e}")
+        progress(log, logging.WARNING, "         ❌", "URL에서 내용 가져오기 실패: %s", e, exc_info=True,
+                 extra={'url': url})
         return None
 
+# 공시 뷰어(main.do)의 목차 노드: 제목, id, 접수번호, 문서번호, 요소 id, 위치, 길이, DTD
+_SUB_DOC_NODE = re.compile(
+    r"node[12]\['text'\][ =]+\"(.*?)\";\s+"
+    r"node[12]\['id'\][ =]+\"(\d+)\";\s+"
+    r"node[12]\['rcpNo'\][ =]+\"(\d+)\";\s+"
+    r"node[12]\['dcmNo'\][ =]+\"(\d+)\";\s+"
+    r"node[12]\['eleId'\][ =]+\"(\d+)\";\s+"
+    r"node[12]\['offset'\][ =]+\"(\d+)\";\s+"
+    r"node[12]\['length'\][ =]+\"(\d+)\";\s+"
+    r"node[12]\['dtd'\][ =]+\"(.*?)\";"
+)
+
+def fetch_sub_docs(rcept_no: str, client: Optional[DartClient] = None) -> List[Dict[str, str]]:
+    """공시 뷰어(DART_SUB_DOCS_URL) 목차에서 하위 서류 제목과 URL 목록을 가져옵니다."""
+    import requests
+    
+    client = client or get_client()
+    res = requests.get(client.sub_docs_url, params={'rcpNo': rcept_no}, timeout=30)
+    res.raise_for_status()
+    METRICS.add_bytes('sub_docs', len(res.content))
+    sub_docs = []
+    for title, _, rcp_no, dcm_no, ele_id, offset, length, dtd in _SUB_DOC_NODE.findall(res.text):
+        query = f"rcpNo={rcp_no}&dcmNo={dcm_no}&eleId={ele_id}&offset={offset}&length={length}&dtd={dtd}"
+        sub_docs.append({'title': title, 'url': f"{client.viewer_url}?{query}"})
+    return sub_docs
+
+def list_sub_docs(rcept_no: str, client: Optional[DartClient] = None) -> List[Dict[str, str]]:
+    """보고서의 하위 서류 목록({'title', 'url'})을 반환합니다.
+    
+    DART_SUB_DOCS_URL이 있으면 그 주소에서 직접, 없으면 OpenDartReader로 조회합니다.
+    """
+    client = client or get_client()
+    if client.sub_docs_url:
+        return fetch_sub_docs(rcept_no, client)
+    # OpenDartReader 객체 생성 (pandas를 함께 불러오므로 처음 쓸 때 import)
+    from OpenDartReader.dart import OpenDartReader
+    dart = OpenDartReader(client.api_key)
+    sub_reports = dart.sub_docs(rcept_no)
+    return [] if sub_reports is None else sub_reports.to_dict('records')
+
 def get_consolidated_notes_from_report(rcept_no: str) -> Optional[Dict]:
     """특정 보고서에서 연결재무제표 주석 정보를 가져옵니다."""
     try:
-        # OpenDartReader 객체 생성
-        dart = OpenDartReader(api_key)
+        client = get_client()
         
-        print(f"   4️⃣ OpenDartReader로 하위 서류 조회 중...")
+        progress(log, logging.DEBUG, "   4️⃣", "하위 서류 조회 중...", extra={'rcept_no': rcept_no})
         
         # 하위 서류 목록 가져오기
-        sub_reports = dart.sub_docs(rcept_no)
+        with METRICS.stage('sub_docs'):
+            sub_reports = client.throttle.get('sub_docs').call(lambda: list_sub_docs(rcept_no, client))
         
-        if sub_reports is None or len(sub_reports) == 0:
-            print(f"      ❌ 하위 서류를 찾을 수 없습니다.")
+        if not sub_reports:
+            progress(log, logging.DEBUG, "      ❌", "하위 서류를 찾을 수 없습니다.", extra={'rcept_no': rcept_no})
             return None
         
-        print(f"      ✅ 하위 서류 {len(sub_reports)}개를 찾았습니다!")
+        progress(log, logging.DEBUG, "      ✅", "하위 서류 %d개를 찾았습니다!", len(sub_reports),
+                 extra={'rcept_no': rcept_no})
         
         # 연결재무제표 주석 관련 하위 서류 찾기
-        for idx, sub_report in sub_reports.iterrows():
+        for idx, sub_report in enumerate(sub_reports):
             title = sub_report.get('title', '')
             url = sub_report.get('url', '')
             
-            print(f"         {idx+1:2d}. {title}")
+            log.debug("하위 서류 %d. %s", idx + 1, title, extra={'rcept_no': rcept_no})
             
             if '연결재무제표 주석' in title:
-                print(f"         🎯 연결재무제표 주석을 찾았습니다!")
+                progress(log, logging.DEBUG, "         🎯", "연결재무제표 주석을 찾았습니다!", extra={'rcept_no': rcept_no})
                 
                 # 해당 URL에서 내용 가져오기
                 content_info = get_notes_content_from_url(url)
@@ -297,14 +491,16 @@ def get_consolidated_notes_from_report(rcept_no: str) -> Optional[Dict]:
                         'text_content': content_info['text']
                     }
                 else:
-                    print(f"         ❌ 내용 추출에 실패했습니다.")
+                    progress(log, logging.DEBUG, "         ❌", "내용 추출에 실패했습니다.", extra={'rcept_no': rcept_no})
                     continue
         
-        print(f"      ❌ 연결재무제표 주석 관련 하위 서류를 찾을 수 없습니다.")
+        progress(log, logging.DEBUG, "      ❌", "연결재무제표 주석 관련 하위 서류를 찾을 수 없습니다.",
+                 extra={'rcept_no': rcept_no})
         return None
         
     except Exception as e:
-        print(f"      ❌ 하위 서류 조회 중 오류: {e}")
+        progress(log, logging.WARNING, "      ❌", "하위 서류 조회 중 오류: %s", e, exc_info=True,
+                 extra={'rcept_no': rcept_no})
         return None
 
 def get_report_type_key(report_name: str) -> Optional[str]:
@@ -360,24 +556,33 @@ def display_notes_result(result: Dict) -> None:
         print(f"{'-'*80}")
         print(text_content)
 
-def save_notes_to_files(result: Dict, company_name: str, year: str, report_type: str) -> bool:
-    """주석 내용을 HTML과 텍스트 파일로 저장합니다."""
+def index_notes_result(result: Dict, index_db: Optional[str] = None) -> bool:
+    """조회한 주석 텍스트를 전문 검색 색인에 추가합니다. (index_db가 없으면 NOTES_INDEX_DB)"""
+    index_db = index_db or get_client().notes_index_db
+    if not index_db:
+        return False
     try:
-        # 출력 디렉토리 생성
-        output_dir.mkdir(exist_ok=True)
-        
-        # 보고서 타입이 키인지 이름인지 확인하고 이름 추출
-        if report_type in REPORT_CODES:
-            # 키인 경우
-            report_type_name = REPORT_CODES[report_type]['name']
-        else:
-            # 이름인 경우
-            report_type_name = report_type
-        
-        # HTML 파일 저장
-        html_filename = output_dir / f"{company_name}_{year}_{report_type_name}_연결재무제표주석.html"
-        with open(html_filename, 'w', encoding='utf-8') as f:
-            f.write(f"""<!DOCTYPE html>
+        search_index = NotesSearchIndex(index_db)
+        try:
+            search_index.add_notes(result)
+        finally:
+            search_index.close()
+        progress(log, logging.DEBUG, "🔎", "전문 검색 색인 완료: %s", index_db)
+        return True
+    except Exception as e:
+        progress(log, logging.WARNING, "❌", "전문 검색 색인 실패: %s", e, exc_info=True)
+        return False
+
+def report_type_name_for(report_type: str) -> str:
+    """보고서 타입이 키("1"~"5")면 이름으로 바꾸고, 이름이면 그대로 반환합니다."""
+    if report_type in REPORT_CODES:
+        return REPORT_CODES[report_type]['name']
+    return report_type
+
+def render_notes_html(result: Dict, company_name: str, year: str, report_type: str) -> str:
+    """조회 결과를 저장 파일과 같은 HTML 문서(기본 정보 헤더 + 주석 본문)로 만듭니다."""
+    report_type_name = report_type_name_for(report_type)
+    return f"""<!DOCTYPE html>
 <html lang="ko">
 <head>
     <meta charset="UTF-8">
@@ -415,9 +620,24 @@ def save_notes_to_files(result: Dict, company_name: str, year: str, report_type:
         {result['html_content']}
     </div>
 </body>
-</html>""")
+</html>"""
+
+def save_notes_to_files(result: Dict, company_name: str, year: str, report_type: str) -> bool:
+    """주석 내용을 HTML과 텍스트 파일로 저장합니다."""
+    try:
+        # 출력 디렉토리 생성
+        output_dir = get_client().output_dir
+        output_dir.mkdir(exist_ok=True)
+        
+        # 보고서 타입이 키인지 이름인지 확인하고 이름 추출
+        report_type_name = report_type_name_for(report_type)
+        
+        # HTML 파일 저장
+        html_filename = output_dir / f"{company_name}_{year}_{report_type_name}_연결재무제표주석.html"
+        with open(html_filename, 'w', encoding='utf-8') as f:
+            f.write(render_notes_html(result, company_name, year, report_type_name))
         
-        print(f"✅ HTML 파일 저장 완료: {html_filename}")
+        progress(log, logging.DEBUG, "✅", "HTML 파일 저장 완료: %s", html_filename)
         
         # 텍스트 파일도 저장
         # text_filename = output_dir / f"{company_name}_{year}_{report_type_name}_연결재무제표주석.txt"
@@ -437,56 +657,168 @@ def save_notes_to_files(result: Dict, company_name: str, year: str, report_type:
         return True
         
     except Exception as e:
-        print(f"❌ 파일 저장 실패: {e}")
+        progress(log, logging.WARNING, "❌", "파일 저장 실패: %s", e, exc_info=True)
         return False
 
-def process_companies_from_config(config_file: str = "companies_config.json") -> bool:
-    """JSON 설정 파일을 읽어서 여러 기업의 데이터를 일괄 처리합니다."""
+def crawl_job(company_info: Dict[str, str], index_db: Optional[str] = None) -> bool:
+    """작업 명세 하나(회사명, 연도, 보고서 유형)를 크롤링해 파일로 저장합니다."""
+    job_id = job_key(company_info)
+    with job_context(job_id):
+        with PROFILER.job('crawl', job_id), METRICS.stage('crawl_job'):
+            ok = _crawl_job(company_info, index_db)
+        METRICS.count('crawl_jobs_ok' if ok else 'crawl_jobs_failed')
+        log.info("크롤링 %s", "완료" if ok else "실패", extra={'ok': ok})
+    return ok
+
+def _crawl_job(company_info: Dict[str, str], index_db: Optional[str]) -> bool:
+    company_name = company_info.get('company_name')
+    year = company_info.get('year')
+    report_type_name = company_info.get('report_type')
+    
+    # 보고서 타입 이름을 키로 변환
+    report_type_key = get_report_type_key(report_type_name)
+    if not report_type_key:
+        progress(log, logging.WARNING, "❌", "지원하지 않는 보고서 타입입니다: %s", report_type_name)
+        return False
+    
+    # 연결재무제표 주석 조회
+    result = get_consolidated_financial_notes(company_name, year, report_type_key,
+                                              corp_code=company_info.get('corp_code'))
+    
+    if not result:
+        progress(log, logging.DEBUG, "❌", "%s 데이터 조회 실패", company_name)
+        return False
+    
+    index_notes_result(result, index_db)
+    
+    # 자동으로 파일 저장 (일괄 처리에서는 사용자 입력 없이 저장)
+    if not save_notes_to_files(result, company_name, year, report_type_name):
+        progress(log, logging.DEBUG, "❌", "%s 파일 저장 실패", company_name)
+        return False
+    
+    progress(log, logging.DEBUG, "✅", "%s 처리 완료", company_name)
+    return True
+
+def run_jobs_concurrently(jobs: Iterable[Dict[str, str]], handler: Callable[[Dict[str, str]], bool],
+                          workers: int) -> Iterator[Tuple[Dict[str, str], bool]]:
+    """작업을 workers개 스레드로 처리하면서 끝나는 순서대로 (작업, 성공 여부)를 생성합니다.
+
+    작업 목록은 작업자 수의 두 배까지만 미리 읽으므로 작업 명세가 커도 메모리를 많이 쓰지 않습니다.
+    """
+    # 작업 하나의 오류는 실패로 기록하고 다음 작업을 계속 처리 (API 한도 소진만 전체 중단)
+    def safe_handler(job):
+        try:
+            return handler(job)
+        except QuotaExhausted:
+            raise
+        except Exception as e:
+            progress(log, logging.ERROR, "❌", "%s 처리 중 오류 발생: %s", job.get('company_name'), e, exc_info=True,
+                     extra={'job_id': job_key(job)})
+            return False
+    
+    if workers <= 1:
+        for job in jobs:
+            yield job, safe_handler(job)
+        return
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+        for job in jobs:
+            pending[executor.submit(safe_handler, job)] = job
+            if len(pending) >= workers * 2:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+        for future in wait(pending).done:
+            yield pending[future], future.result()
+
+def process_companies_from_queue(config_file: str, queue_db: str,
+                                 shard: Optional[Tuple[int, int]] = None) -> bool:
+    """설정 파일의 작업을 영속 작업 큐에 넣고, 큐가 빌 때까지 처리합니다.
+
+    이미 큐에 있는 작업은 다시 넣지 않으므로 중단된 실행을 같은 명령으로 이어서 처리할 수 있고,
+    같은 큐 파일을 쓰는 작업자 프로세스를 여러 개 띄우면 작업을 나눠 처리합니다.
+    """
+    client = get_client()
+    crawl_workers = client.crawl_workers
+    queue_db = shard_path(queue_db, shard)
+    index_db = shard_path(client.notes_index_db, shard)
+    queue = JobQueue(queue_db)
     try:
-        # JSON 설정 파일 로드
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        added = queue.enqueue(iter_shard(iter_jobs(config_file), shard))
+        print(f"📥 작업 큐: {queue_db} (새 작업 {added}건)")
+        print("🚀 DART 연결재무제표 주석 일괄 크롤링 시작")
+        print("=" * 60)
         
-        companies = config.get('companies', [])
-        if not companies:
-            print("❌ 설정 파일에 처리할 기업이 없습니다.")
-            return False
         
-        print(f"✅ 설정 파일 로드 완료: {len(companies)}개 기업")
-        print("🚀 DART 연결재무제표 주석 일괄 크롤링 시작")
+        # 스레드마다 자기 연결과 작업자 ID로 큐에서 작업을 가져감
+        def run_thread(thread_no: int) -> Dict[str, int]:
+            thread_queue = JobQueue(queue_db)
+            try:
+                return thread_queue.run_worker(lambda company_info: crawl_job(company_info, index_db),
+                                               f"{default_worker_id()}-{thread_no}", stop_on=(QuotaExhausted,))
+            finally:
+                thread_queue.close()
+        
+        with ThreadPoolExecutor(max_workers=crawl_workers) as executor:
+            results = list(executor.map(run_thread, range(crawl_workers)))
+        counts = queue.stats()
+        done = sum(result['done'] for result in results)
+        failed = sum(result['failed'] for result in results)
+        print(f"\n📊 이 프로세스: 성공 {done}건 / 실패 {failed}건")
+        client.throttle.report()
+        client.key_pool.report()
+        print("📊 큐 상태: " + " / ".join(f"{state}: {counts[state]}" for state in JOB_STATES))
+        return counts['failed'] == 0 and counts['pending'] == 0
+    finally:
+        queue.close()
+
+def process_companies_from_config(config_file: str = "companies_config.json",
+                                  queue_db: Optional[str] = None,
+                                  shard: Optional[Tuple[int, int]] = None) -> bool:
+    """설정 파일(JSON 또는 JSONL 작업 명세)을 읽어서 여러 기업의 데이터를 일괄 처리합니다.
+
+    작업은 iter_jobs()로 하나씩 읽어 바로 처리하므로 상장사 전체처럼
+    작업 수가 많아도 설정 전체를 메모리에 올리지 않습니다.
+
+    Args:
+        config_file (str): 설정 파일 경로
+        queue_db (str, optional): 영속 작업 큐 SQLite 경로 (지정하면 큐를 통해 이어서/나눠서 처리)
+        shard (tuple, optional): (i, N)이면 전체 작업 중 i번 샤드만 처리
+            (전문 검색 색인과 작업 큐 경로에는 샤드 번호를 붙여 다른 샤드와 겹치지 않게 함)
+    """
+    try:
+        if queue_db:
+            return process_companies_from_queue(config_file, queue_db, shard)
+        
+        client = get_client()
+        print(f"🚀 DART 연결재무제표 주석 일괄 크롤링 시작 (작업자 {client.crawl_workers}개)")
+        if shard:
+            print(f"🧩 샤드 {shard[0]}/{shard[1]}만 처리합니다.")
         print("=" * 60)
         
+        index_db = shard_path(client.notes_index_db, shard)
         success_count = 0
-        total_count = len(companies)
+        total_count = 0
         
-        for i, company_info in enumerate(companies, 1):
-            company_name = company_info.get('company_name')
-            year = company_info.get('year')
-            report_type_name = company_info.get('report_type')
-            
-            print(f"\n📋 [{i}/{total_count}] {company_name} {year} {report_type_name} 처리 중...")
-            print("-" * 50)
-            
-            # 보고서 타입 이름을 키로 변환
-            report_type_key = get_report_type_key(report_type_name)
-            if not report_type_key:
-                print(f"❌ 지원하지 않는 보고서 타입입니다: {report_type_name}")
-                continue
-            
-            # 연결재무제표 주석 조회
-            result = get_consolidated_financial_notes(company_name, year, report_type_key)
-            
-            if result:
-                # 자동으로 파일 저장 (일괄 처리에서는 사용자 입력 없이 저장)
-                if save_notes_to_files(result, company_name, year, report_type_name):
-                    print(f"✅ {company_name} 처리 완료")
-                    success_count += 1
-                else:
-                    print(f"❌ {company_name} 파일 저장 실패")
-            else:
-                print(f"❌ {company_name} 데이터 조회 실패")
+        def handle(company_info: Dict[str, str]) -> bool:
+            progress(log, logging.DEBUG, "\n📋", "%s %s %s 처리 중...", company_info.get('company_name'),
+                     company_info.get('year'), company_info.get('report_type'), extra={'job_id': job_key(company_info)})
+            return crawl_job(company_info, index_db)
+        
+        jobs = iter_shard(iter_jobs(config_file), shard)
+        for _, ok in run_jobs_concurrently(jobs, handle, client.crawl_workers):
+            total_count += 1
+            if ok:
+                success_count += 1
+        
+        if not total_count:
+            print("❌ 설정 파일에 처리할 기업이 없습니다.")
+            return False
         
         print(f"\n📊 크롤링 결과: {success_count}/{total_count}개 기업 성공")
+        client.throttle.report()
+        client.key_pool.report()
         return success_count == total_count
         
     except FileNotFoundError:
@@ -495,22 +827,34 @@ def process_companies_from_config(config_file: str = "companies_config.json") ->
     except json.JSONDecodeError:
         print(f"❌ 설정 파일 형식이 올바르지 않습니다: {config_file}")
         return False
+    except QuotaExhausted as e:
+        print(f"⛔ {e} 내일 같은 명령으로 이어서 실행하세요.")
+        get_client().key_pool.report()
+        return False
     except Exception as e:
         print(f"❌ 일괄 처리 중 오류 발생: {e}")
         return False
 
 def main():
     """메인 실행 함수"""
-    config_file = "companies_config.json"
+    parser = argparse.ArgumentParser(description="DART 연결재무제표 주석 크롤러")
+    parser.add_argument('--shard', type=shard_arg,
+                        help="전체 작업 중 i번 샤드만 일괄 처리 (i/N, i는 0부터; 지정하면 묻지 않고 일괄 처리)")
+    args = parser.parse_args()
+    setup_logging()
+    
+    # 설정 파일 (JSON 또는 JSONL 작업 명세)
+    config_file = os.getenv('COMPANIES_CONFIG', 'companies_config.json')
     
     # JSON 설정 파일이 있으면 일괄 처리, 없으면 대화형 모드
     if Path(config_file).exists():
         print("📄 JSON 설정 파일이 발견되었습니다.")
-        mode_choice = input("🔧 실행 모드를 선택하세요 (1: 일괄처리, 2: 대화형): ")
+        mode_choice = "1" if args.shard else input("🔧 실행 모드를 선택하세요 (1: 일괄처리, 2: 대화형): ")
         
         if mode_choice == "1":
             # 일괄 처리 모드
-            crawling_success = process_companies_from_config(config_file)
+            crawling_success = process_companies_from_config(config_file, queue_db=get_client().job_queue_db or None,
+                                                             shard=args.shard)
             
             if crawling_success:
                 print("\n🎉 모든 기업의 크롤링이 완료되었습니다!")
@@ -520,7 +864,8 @@ def main():
                 try:
                     # table_extractor의 main 함수를 직접 호출
                     from table_extractor import BatchTableExtractor
-                    batch_extractor = BatchTableExtractor("companies_config.json")
+                    batch_extractor = BatchTableExtractor(config_file, shard=args.shard,
+                                                          output_dir=str(get_client().output_dir))
                     if batch_extractor.load_config():
                         success = batch_extractor.process_all_companies()
                         if success:
@@ -533,9 +878,11 @@ def main():
                     print(f"❌ 표 데이터 추출 실행 실패: {e}")
             else:
                 print("\n⚠️ 일부 기업의 크롤링에 실패했습니다.")
+            export_run_metrics('crawl', str(get_client().output_dir), shard=args.shard)
             return
     
-    # 대화형 모드 (기존 기능)
+    # 대화형 모드 (기존 기능): 진행 상황을 로그 대신 화면에 출력
+    set_interactive()
     print("🚀 DART 연결재무제표 주석 크롤러")
     print("=" * 50)
     
@@ -554,6 +901,7 @@ def main():
     if result:
         # 결과 표시
         display_notes_result(result)
+        index_notes_result(result)
         
         # 파일로 저장할지 묻기
         save_choice = input(f"\n💾 주석 내용을 파일로 저장하시겠습니까? (y/n): ").lower()
@@ -566,8 +914,9 @@ def main():
                     from table_extractor import TableExtractor
                     # 보고서 타입 키를 이름으로 변환
                     report_type_name = REPORT_CODES[report_type]['name']
-                    html_file = f"result/{company_name}_{year}_{report_type_name}_연결재무제표주석.html"
-                    extractor = TableExtractor(html_file)
+                    output_dir = get_client().output_dir
+                    html_file = output_dir / f"{company_name}_{year}_{report_type_name}_연결재무제표주석.html"
+                    extractor = TableExtractor(str(html_file), output_dir=str(output_dir))
                     success = extractor.extract_all_tables()
                     if success:
                         print("✅ 표 데이터 추출이 완료되었습니다!")
@@ -0,0 +1,227 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional, TypeVar
+
+from structured_log import get_logger, progress
+
+T = TypeVar('T')
+
+log = get_logger('throttle')
+
+# DART OpenAPI 상태 코드: 요청 제한 초과
+DART_STATUS_THROTTLED = '020'
+
+
+class DartThrottled(Exception):
+    """DART가 요청 제한 초과(020)로 응답했을 때 발생하는 예외"""
+
+    def __init__(self, message: Optional[str] = None, key_rotated: bool = False):
+        """
+        Args:
+            message (str, optional): DART 응답 메시지
+            key_rotated (bool): 한도를 넘긴 키를 사용 중지하고 다른 키로 바꿔 보낼 수 있는지 여부
+                (True면 혼잡이 아니라 키 하나의 한도 소진이므로 동시 요청 한도를 줄이지 않음)
+        """
+        super().__init__(message)
+        self.key_rotated = key_rotated
+
+
+class AdaptiveLimiter:
+    """엔드포인트 하나의 동시 요청 수를 AIMD로 조절하는 제한기
+
+    - 응답이 정상이고 평균 지연이 목표 이하이면 한도를 조금씩 올립니다. (additive increase)
+    - 오류·시간 초과·020 응답이나 지연 증가가 보이면 한도를 절반으로 줄입니다. (multiplicative decrease)
+    - 연결 오류·서버 오류가 failure_threshold번 연속되면 회로를 열어 cooldown초 동안 요청을 멈추고,
+      그 뒤 요청 하나로 회복을 확인한 다음 다시 엽니다. (circuit breaker)
+    """
+
+    def __init__(self, name: str, initial_limit: float = 2.0, min_limit: float = 1.0, max_limit: float = 8.0,
+                 latency_target: float = 5.0, backoff: float = 0.5,
+                 failure_threshold: int = 5, cooldown: float = 60.0, throttle_pause: float = 5.0):
+        """
+        Args:
+            name (str): 엔드포인트 이름 (예: "list", "viewer", "sub_docs")
+            initial_limit (float): 처음 동시 요청 한도
+            min_limit (float): 최소 동시 요청 한도
+            max_limit (float): 최대 동시 요청 한도 (보통 작업자 스레드 수)
+            latency_target (float): 이보다 평균 지연(초)이 길어지면 한도를 줄임
+            backoff (float): 한도를 줄일 때 곱하는 비율
+            failure_threshold (int): 회로를 여는 연속 실패 횟수
+            cooldown (float): 회로가 열렸을 때 요청을 멈추는 시간 (초)
+            throttle_pause (float): 020 응답을 받았을 때 요청을 멈추는 시간 (초)
+        """
+        self.name = name
+        self.limit = max(min_limit, min(initial_limit, max_limit))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.throttle_pause = throttle_pause
+
+        self.in_flight = 0
+        self.latency_ewma = 0.0
+        self.consecutive_failures = 0
+        self.paused_until = 0.0
+        self.circuit_open = False
+        self.last_decrease = 0.0
+        self.stats = {'requests': 0, 'failures': 0, 'throttled': 0, 'circuit_opens': 0}
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        """요청 슬롯 하나를 얻을 때까지 기다립니다. (회로가 열려 있으면 닫힐 때까지 대기)"""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    self._cond.wait(self.paused_until - now)
+                    continue
+                # 회로가 열렸다가 대기 시간이 지나면 요청 하나로만 회복 여부 확인 (half-open)
+                allowed = 1 if self.circuit_open else int(self.limit)
+                if self.in_flight < allowed:
+                    self.in_flight += 1
+                    return
+                self._cond.wait()
+
+    def release(self, latency: Optional[float], failed: bool = False, throttled: bool = False) -> None:
+        """요청 결과를 반영하고 슬롯을 돌려줍니다.
+
+        Args:
+            latency (float, optional): 응답 시간 (초). None이면 한도 조절 없이 슬롯만 반환
+            failed (bool): 서버 오류·연결 오류·시간 초과 여부
+            throttled (bool): DART 020(요청 제한 초과) 응답 여부
+        """
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if throttled:
+                # 요청 제한 초과는 장애가 아니라 혼잡 신호이므로 한도를 줄이고 잠시만 멈춤
+                self.stats['throttled'] += 1
+                if self._decrease(now):
+                    self.paused_until = max(self.paused_until, now + self.throttle_pause)
+            elif failed:
+                self.stats['failures'] += 1
+                self.consecutive_failures += 1
+                self._decrease(now)
+                if self.circuit_open or self.consecutive_failures >= self.failure_threshold:
+                    if not self.circuit_open:
+                        self.stats['circuit_opens'] += 1
+                        progress(log, logging.WARNING, "🚧", "[%s] 연속 실패 %d회, %.0f초간 요청을 멈춥니다.",
+                                 self.name, self.consecutive_failures, self.cooldown, extra={'endpoint': self.name})
+                    self.circuit_open = True
+                    self.paused_until = max(self.paused_until, now + self.cooldown)
+            elif latency is not None:
+                self.stats['requests'] += 1
+                self.consecutive_failures = 0
+                if self.circuit_open:
+                    self.circuit_open = False
+                    progress(log, logging.INFO, "✅", "[%s] 응답이 회복되어 요청을 재개합니다.", self.name,
+                             extra={'endpoint': self.name})
+                self.latency_ewma = latency if not self.latency_ewma else 0.8 * self.latency_ewma + 0.2 * latency
+                if self.latency_ewma > self.latency_target:
+                    self._decrease(now)
+                else:
+                    # 한도만큼 응답이 돌아올 때마다 1씩 증가
+                    self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+    def _decrease(self, now: float) -> bool:
+        """한도를 줄이고 줄였는지 반환합니다.
+
+        같은 혼잡 때문에 동시에 실패한 요청들로 한도가 여러 번 줄지 않도록 응답 한 번 걸리는 시간(평균 지연)에 한 번만 줄입니다.
+        """
+        window = self.latency_ewma or self.latency_target
+        if now - self.last_decrease < window:
+            return False
+        self.last_decrease = now
+        self.limit = max(self.min_limit, self.limit * self.backoff)
+        return True
+
+    def call(self, func: Callable[[], T], retries: int = 2) -> T:
+        """func를 슬롯 안에서 실행하고 결과로 한도를 조절합니다.
+
+        020 응답, 연결 오류, 시간 초과, 5xx/429 응답이면 멈춤 시간 뒤 retries번까지 다시 시도합니다.
+        다른 키로 바꿔 보낼 수 있는 020 응답은 한도를 줄이지 않고 바로 다시 시도합니다.
+        그 외 예외는 한도 조절 없이 그대로 전달합니다.
+        """
+        attempt = 0
+        while True:
+            self.acquire()
+            started = time.monotonic()
+            try:
+                result = func()
+            except DartThrottled as e:
+                if e.key_rotated:
+                    with self._cond:
+                        self.stats['throttled'] += 1
+                    self.release(None)
+                else:
+                    self.release(time.monotonic() - started, throttled=True)
+                if attempt >= retries:
+                    raise
+            except Exception as e:
+                transient = is_transient_error(e)
+                self.release(None if not transient else time.monotonic() - started, failed=transient)
+                if not transient or attempt >= retries:
+                    raise
+            else:
+                self.release(time.monotonic() - started)
+                return result
+            attempt += 1
+
+    def snapshot(self) -> Dict:
+        """현재 한도와 통계를 반환합니다."""
+        with self._cond:
+            return {'endpoint': self.name, 'limit': round(self.limit, 2), 'in_flight': self.in_flight,
+                    'latency_ewma': round(self.latency_ewma, 3), 'circuit_open': self.circuit_open, **self.stats}
+
+
+def is_transient_error(error: Exception) -> bool:
+    """서버 용량과 관련된(다시 시도할 만한) 오류인지 확인합니다."""
+    import requests
+
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code >= 500 or error.response.status_code == 429
+    return False
+
+
+class ThrottleRegistry:
+    """엔드포인트별 AdaptiveLimiter 모음"""
+
+    def __init__(self, max_limit: float = 8.0, **limiter_options):
+        """
+        Args:
+            max_limit (float): 엔드포인트별 최대 동시 요청 한도
+            **limiter_options: AdaptiveLimiter에 넘길 나머지 옵션
+        """
+        self.max_limit = max_limit
+        self.limiter_options = limiter_options
+        self.limiters: Dict[str, AdaptiveLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint: str) -> AdaptiveLimiter:
+        """엔드포인트의 제한기를 반환합니다. (없으면 생성)"""
+        with self._lock:
+            if endpoint not in self.limiters:
+                self.limiters[endpoint] = AdaptiveLimiter(endpoint, max_limit=self.max_limit, **self.limiter_options)
+            return self.limiters[endpoint]
+
+    def set_max_limit(self, max_limit: float) -> None:
+        """모든 엔드포인트의 최대 동시 요청 한도를 바꿉니다. (작업자 수가 정해진 뒤 호출)"""
+        with self._lock:
+            self.max_limit = max_limit
+            for limiter in self.limiters.values():
+                limiter.max_limit = max_limit
+                limiter.limit = min(limiter.limit, max_limit)
+
+    def report(self) -> None:
+        """엔드포인트별 한도와 통계를 알립니다."""
+        for limiter in self.limiters.values():
+            info = limiter.snapshot()
+            progress(log, logging.INFO, "🚦", "[%s] 동시 요청 한도 %s, 평균 지연 %s초, 성공 %s / 실패 %s / 020 %s / 차단 %s회",
+                     info['endpoint'], info['limit'], info['latency_ewma'], info['requests'], info['failures'],
+                     info['throttled'], info['circuit_opens'])
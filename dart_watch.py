@@ -0,0 +1,289 @@
+import argparse
+import json
+import logging
+import re
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+import dart_crawler
+from dart_throttle import DART_STATUS_THROTTLED, DartThrottled
+from job_specs import is_jsonl, iter_jobs
+from stage_metrics import METRICS, metrics_textfile
+from structured_log import get_logger, job_context, progress, setup_logging
+from dart_crawler import (
+    build_notes_result, get_consolidated_notes_from_report, index_notes_result, save_notes_to_files
+)
+
+# 보고서명 끝의 보고기간 (예: "반기보고서 (2025.06)")
+REPORT_PERIOD_PATTERN = re.compile(r'\((\d{4})\.(\d{2})\)')
+
+# 보고기간 월 → 보고서 유형 (REPORT_CODES의 이름)
+log = get_logger('watch')
+
+QUARTER_REPORT_TYPES = {
+    "03": "1분기보고서",
+    "06": "반기보고서",
+    "09": "3분기보고서",
+    "12": "사업보고서",
+}
+
+
+def classify_report(report_name: str) -> Optional[Dict[str, str]]:
+    """보고서명에서 연도와 보고서 유형을 판별합니다. (정기보고서가 아니면 None)"""
+    if not any(keyword in report_name for keyword in ("사업보고서", "반기보고서", "분기보고서")):
+        return None
+    period_match = REPORT_PERIOD_PATTERN.search(report_name)
+    if not period_match:
+        return None
+    year, month = period_match.groups()
+    if "사업보고서" in report_name:
+        report_type = "사업보고서"
+    elif "반기보고서" in report_name:
+        report_type = "반기보고서"
+    else:
+        report_type = QUARTER_REPORT_TYPES.get(month)
+        if report_type not in ("1분기보고서", "3분기보고서"):
+            return None
+    return {'year': year, 'report_type': report_type}
+
+
+class FilingWatcher:
+    """DART 정기공시 목록을 주기적으로 조회해 관심 기업의 새 공시를 바로 처리하는 클래스
+
+    마지막으로 처리한 접수번호/접수일자(워터마크)를 파일에 저장하므로
+    재시작해도 이미 처리한 공시는 다시 처리하지 않습니다.
+    처리에 실패한 관심 기업 공시는 접수번호를 워터마크와 함께 저장해 두고
+    다음 조회 때 다시 처리합니다. (MAX_RETRIES번 실패하면 포기)
+    """
+
+    # 실패한 공시를 다시 시도하는 최대 횟수
+    MAX_RETRIES = 5
+
+    def __init__(self, watchlist_file: str = "companies_config.json",
+                 state_file: str = "result/.watch_state.json", lookback_days: int = 7):
+        """
+        Args:
+            watchlist_file (str): 관심 기업 목록 (JSON의 companies[]와 watchlist[], 또는 JSONL 작업 명세의
+                회사명·고유번호)
+            state_file (str): 워터마크를 저장할 파일 경로
+            lookback_days (int): 워터마크가 없을 때 처음 조회할 기간 (일)
+        """
+        self.watchlist_file = Path(watchlist_file)
+        self.state_file = Path(state_file)
+        self.lookback_days = lookback_days
+        self.watchlist: Set[str] = set()
+        # failed: 처리에 실패해 다음 조회 때 다시 시도할 접수번호 → 실패 횟수
+        self.state = {'rcept_no': '', 'rcept_dt': '', 'failed': {}}
+
+    def load(self) -> bool:
+        """관심 기업 목록과 워터마크를 읽습니다."""
+        try:
+            self.watchlist = set()
+            for job in iter_jobs(str(self.watchlist_file)):
+                self.watchlist.update(value for value in (job.get('company_name'), job.get('corp_code')) if value)
+            if not is_jsonl(str(self.watchlist_file)):
+                with open(self.watchlist_file, 'r', encoding='utf-8') as f:
+                    self.watchlist.update(json.load(f).get('watchlist', []))
+            progress(log, logging.INFO, "✅", "관심 기업 %d개 로드 완료", len(self.watchlist))
+        except Exception as e:
+            progress(log, logging.ERROR, "❌", "관심 기업 목록 로드 실패: %s", e, exc_info=True)
+            return False
+
+        if self.state_file.exists():
+            try:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    self.state.update(json.load(f))
+                progress(log, logging.INFO, "📌", "워터마크: %s / %s", self.state['rcept_dt'], self.state['rcept_no'])
+                if self.state['failed']:
+                    progress(log, logging.INFO, "🔁", "다시 시도할 공시 %d건", len(self.state['failed']))
+            except Exception as e:
+                progress(log, logging.WARNING, "⚠️", "워터마크 파일을 읽을 수 없어 처음부터 조회합니다: %s", e)
+        return True
+
+    def save_state(self) -> None:
+        """워터마크를 저장합니다."""
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_file.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False)
+        tmp_path.replace(self.state_file)
+
+    def fetch_new_filings(self) -> List[Dict]:
+        """워터마크 이후 접수된 정기공시와 다시 시도할 공시를 오래된 순으로 반환합니다."""
+        today = datetime.now()
+        begin = self.state['rcept_dt'] or (today - timedelta(days=self.lookback_days)).strftime('%Y%m%d')
+        # 회사를 지정하지 않은 목록 조회는 최대 3개월까지만 가능
+        oldest = (today - timedelta(days=90)).strftime('%Y%m%d')
+        failed = self.state['failed']
+        # 접수번호 앞 8자리가 접수일자이므로 조회 가능 기간을 벗어난 실패 공시는 포기
+        for rcept_no in [rcept_no for rcept_no in failed if rcept_no[:8] < oldest]:
+            progress(log, logging.WARNING, "⚠️", "접수번호 %s는 조회 가능 기간이 지나 다시 시도하지 않습니다.", rcept_no)
+            del failed[rcept_no]
+        if failed:
+            begin = min(begin, min(failed)[:8])
+        begin = max(begin, oldest)
+        filings = []
+        page_no = 1
+        while True:
+            params = {
+                'bgn_de': begin,
+                'end_de': today.strftime('%Y%m%d'),
+                'pblntf_ty': 'A',  # 정기공시
+                'page_no': page_no,
+                'page_count': 100
+            }
+            with METRICS.stage('list'):
+                data = dart_crawler.get_client().throttle.get('list').call(lambda: self._get_list(params))
+            if data.get('status') == '013':  # 조회된 데이터 없음
+                break
+            if data.get('status') != '000':
+                raise RuntimeError(f"API 오류: {data.get('status')} {data.get('message')}")
+
+            items = data.get('list', [])
+            filings.extend(item for item in items
+                           if item.get('rcept_no', '') > self.state['rcept_no'] or item.get('rcept_no') in failed)
+            if page_no >= int(data.get('total_page', 1)) or not items:
+                break
+            page_no += 1
+
+        filings.sort(key=lambda item: item['rcept_no'])
+        return filings
+
+    @staticmethod
+    def _get_list(params: Dict) -> Dict:
+        """공시 목록 한 페이지를 조회합니다. (020 응답은 DartThrottled로 알림)"""
+        import requests
+
+        client = dart_crawler.get_client()
+        key = client.key_pool.acquire()
+        res = requests.get(client.list_url, params={**params, 'crtfc_key': key}, timeout=30)
+        res.raise_for_status()
+        METRICS.add_bytes('list', len(res.content))
+        data = res.json()
+        if data.get('status') == DART_STATUS_THROTTLED:
+            remaining = client.key_pool.retire(key)
+            raise DartThrottled(data.get('message'), key_rotated=remaining > 0)
+        return data
+
+    def is_watched(self, filing: Dict) -> bool:
+        """공시 회사가 관심 기업 목록에 있는지 확인합니다."""
+        return filing.get('corp_name') in self.watchlist or filing.get('corp_code') in self.watchlist
+
+    def process_filing(self, filing: Dict) -> bool:
+        """새 공시 하나를 크롤링하고 표 데이터까지 추출합니다."""
+        report_info = classify_report(filing.get('report_nm', ''))
+        if not report_info:
+            return False
+
+        company_name = filing['corp_name']
+        year = report_info['year']
+        report_type = report_info['report_type']
+        progress(log, logging.INFO, "\n🆕", "%s %s %s (접수번호: %s)", company_name, year, report_type, filing['rcept_no'])
+
+        notes_info = get_consolidated_notes_from_report(filing['rcept_no'])
+        if not notes_info:
+            progress(log, logging.WARNING, "❌", "%s 연결재무제표 주석을 찾을 수 없습니다.", company_name)
+            return False
+
+        result = build_notes_result(company_name, year, report_type, filing['rcept_no'], filing['rcept_dt'], notes_info)
+        index_notes_result(result)
+        if not save_notes_to_files(result, company_name, year, report_type):
+            return False
+
+        from table_extractor import TableExtractor
+        output_dir = dart_crawler.get_client().output_dir
+        html_file = output_dir / f"{company_name}_{year}_{report_type}_연결재무제표주석.html"
+        # 크롤링 결과와 같은 디렉토리에 CSV를 씀
+        return TableExtractor(str(html_file), output_dir=str(output_dir)).extract_all_tables()
+
+    def poll_once(self) -> int:
+        """한 번 조회하여 관심 기업의 새 공시를 처리하고 처리한 건수를 반환합니다."""
+        filings = self.fetch_new_filings()
+        processed = 0
+        for filing in filings:
+            rcept_no = filing['rcept_no']
+            watched = self.is_watched(filing) and classify_report(filing.get('report_nm', '')) is not None
+            if watched:
+                try:
+                    with job_context(rcept_no):
+                        success = self.process_filing(filing)
+                except Exception as e:
+                    progress(log, logging.ERROR, "❌", "%s 처리 중 오류 발생: %s", filing.get('corp_name'), e,
+                             exc_info=True, extra={'job_id': rcept_no})
+                    success = False
+                if success:
+                    processed += 1
+                    self.state['failed'].pop(rcept_no, None)
+                else:
+                    self.record_failure(filing)
+            # 실패한 공시는 failed에 남겨 두므로 워터마크는 본 공시까지 이동
+            if rcept_no > self.state['rcept_no']:
+                self.state.update(rcept_no=rcept_no, rcept_dt=filing['rcept_dt'])
+            # 관심 기업 공시를 처리할 때마다 저장하고, 나머지는 조회를 마칠 때 한 번에 저장
+            if watched:
+                self.save_state()
+        self.save_state()
+        progress(log, logging.INFO, "🔄", "[%s] 새 정기공시 %d건 확인, 관심 기업 %d건 처리",
+                 f"{datetime.now():%H:%M:%S}", len(filings), processed)
+        METRICS.count('watch_polls')
+        # 계속 실행되는 감시 모드는 조회할 때마다 지표 파일을 갱신 (DART 지연을 바로 확인)
+        textfile = metrics_textfile(str(dart_crawler.get_client().output_dir))
+        if textfile:
+            try:
+                METRICS.write_prometheus(textfile)
+            except OSError as e:
+                progress(log, logging.WARNING, "⚠️", "실행 지표 저장 실패: %s", e)
+        return processed
+
+    def record_failure(self, filing: Dict) -> None:
+        """실패한 공시를 다음 조회 때 다시 시도하도록 기록합니다. (MAX_RETRIES번 실패하면 포기)"""
+        rcept_no = filing['rcept_no']
+        attempts = self.state['failed'].get(rcept_no, 0) + 1
+        if attempts >= self.MAX_RETRIES:
+            self.state['failed'].pop(rcept_no, None)
+            progress(log, logging.WARNING, "⚠️", "%s 공시(접수번호: %s)를 %d번 실패해 더 이상 시도하지 않습니다.",
+                     filing.get('corp_name'), rcept_no, attempts)
+            METRICS.count('watch_filings_abandoned')
+        else:
+            self.state['failed'][rcept_no] = attempts
+            progress(log, logging.WARNING, "🔁", "%s 공시(접수번호: %s)는 다음 조회 때 다시 시도합니다. (%d/%d)",
+                     filing.get('corp_name'), rcept_no, attempts, self.MAX_RETRIES)
+
+    def run(self, interval: int = 300) -> None:
+        """interval초마다 조회를 반복합니다. (Ctrl+C로 종료)"""
+        progress(log, logging.INFO, "👀", "정기공시 감시 시작 (주기: %d초)", interval)
+        try:
+            while True:
+                try:
+                    self.poll_once()
+                except Exception as e:
+                    progress(log, logging.ERROR, "❌", "공시 목록 조회 실패: %s", e, exc_info=True)
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            progress(log, logging.INFO, "\n👋", "감시를 종료합니다.")
+
+
+def main():
+    """감시 모드 실행 함수"""
+    parser = argparse.ArgumentParser(description="DART 정기공시 감시 모드")
+    parser.add_argument('--watchlist', default='companies_config.json', help="관심 기업 목록 (JSON 또는 JSONL 작업 명세)")
+    parser.add_argument('--state', default='result/.watch_state.json', help="워터마크 파일 경로")
+    parser.add_argument('--interval', type=int, default=300, help="조회 주기 (초)")
+    parser.add_argument('--lookback-days', type=int, default=7, help="워터마크가 없을 때 조회할 기간 (일)")
+    parser.add_argument('--once', action='store_true', help="한 번만 조회하고 종료")
+    args = parser.parse_args()
+    setup_logging()
+
+    watcher = FilingWatcher(args.watchlist, args.state, args.lookback_days)
+    if not watcher.load():
+        return
+    if args.once:
+        watcher.poll_once()
+    else:
+        watcher.run(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import hashlib
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# 기본 규칙 파일 (이 모듈과 같은 디렉토리)
+DEFAULT_RULES_FILE = Path(__file__).with_name('extraction_rules.json')
+
+
+def compile_keywords(keywords: List[str]) -> Optional[re.Pattern]:
+    """키워드 목록을 하나의 정규식으로 컴파일합니다. (키워드가 없으면 None)"""
+    if not keywords:
+        return None
+    # 긴 키워드를 먼저 두어 겹치는 키워드가 있어도 한 번에 찾도록 함
+    ordered = sorted(set(keywords), key=len, reverse=True)
+    return re.compile('|'.join(re.escape(keyword) for keyword in ordered))
+
+
+class ExtractionRules:
+    """선언형 추출 규칙 파일을 시작 시 한 번 컴파일해 두는 매처 모음
+
+    섹션 제목 정규화, 피벗 대상, 4,5,7번/6번 병합 조건, 헤더 셀 판별을
+    코드 수정 없이 규칙 파일로 추가·변경할 수 있습니다.
+    """
+
+    def __init__(self, rules: Dict):
+        """
+        Args:
+            rules (dict): 규칙 파일 내용 (extraction_rules.json 형식)
+        """
+        self.rules = rules
+        self.overview_headings = list(rules.get('overview_headings', []))
+
+        # 섹션 제목: 모든 규칙의 키워드를 이름 붙은 그룹 하나의 정규식으로 합침
+        self.section_titles = [rule['title'] for rule in rules.get('section_titles', [])]
+        alternatives = []
+        for index, rule in enumerate(rules.get('section_titles', [])):
+            pattern = compile_keywords(rule['keywords'])
+            if pattern:
+                alternatives.append(f"(?P<t{index}>{pattern.pattern})")
+        self.section_title_pattern = re.compile('|'.join(alternatives)) if alternatives else None
+        self.map_section_title = lru_cache(maxsize=1024)(self._map_section_title)
+
+        # 피벗: 항목번호 → 제목 키워드 매처
+        self.pivot_patterns = {}
+        for rule in rules.get('pivot', []):
+            pattern = compile_keywords(rule.get('keywords', []))
+            for section in rule.get('sections', []):
+                self.pivot_patterns[section] = pattern
+
+        # 4,5,7번 병합
+        merge_performance = rules.get('merge_performance', {})
+        self.performance_sections = list(merge_performance.get('sections', []))
+        self.performance_output_section = merge_performance.get('output_section', '')
+        self.performance_title = merge_performance.get('title', '')
+
+        # 6번 병합
+        merge_equity = rules.get('merge_equity', {})
+        self.equity_section = merge_equity.get('section', '')
+        self.equity_min_tables = int(merge_equity.get('min_tables', 2))
+        self.equity_title = merge_equity.get('title', '')
+
+        # 헤더 셀
+        header_cell = rules.get('header_cell', {})
+        self.header_tags = frozenset(header_cell.get('tags', []))
+        self.header_style_pattern = compile_keywords(header_cell.get('style_keywords', []))
+
+    @classmethod
+    def load(cls, rules_file: Optional[str] = None) -> 'ExtractionRules':
+        """규칙 파일을 읽어 컴파일합니다. (경로가 없으면 기본 규칙 파일)"""
+        path = Path(rules_file) if rules_file else DEFAULT_RULES_FILE
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    @property
+    def fingerprint(self) -> str:
+        """규칙 내용의 짧은 해시 (캐시·매니페스트 무효화용)"""
+        encoded = json.dumps(self.rules, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()[:12]
+
+    def _map_section_title(self, full_title: str) -> str:
+        """섹션 전체 제목을 CSV 항목제목으로 정규화합니다. (규칙 순서가 우선순위)"""
+        if self.section_title_pattern:
+            matched = [int(match.lastgroup[1:]) for match in self.section_title_pattern.finditer(full_title)]
+            if matched:
+                return self.section_titles[min(matched)]
+
+        # 규칙에 없으면 실제 제목의 첫 문장만 사용 (마침표나 쉼표 기준으로 자르기)
+        if '.' in full_title[:50]:
+            return full_title.split('.')[0].strip()
+        elif ',' in full_title[:50]:
+            return full_title.split(',')[0].strip()
+        return full_title.strip()
+
+    @property
+    def pivot_sections(self) -> frozenset:
+        """피벗 규칙이 있는 항목번호들 (피벗 후에는 종속기업 키 컬럼이 없음)"""
+        return frozenset(self.pivot_patterns)
+
+    @property
+    def keyed_sections(self) -> frozenset:
+        """첫 번째 컬럼(종속기업)을 행 키로 조인하는 항목번호들 (4,5번 성과 병합, 6번 비지배지분 병합)"""
+        sections = set(self.performance_sections) - self.pivot_sections
+        if self.equity_section:
+            sections.add(self.equity_section)
+        return frozenset(sections)
+
+    def should_pivot(self, section_num: str, section_title: str) -> bool:
+        """항목번호와 제목이 피벗 규칙에 해당하는지 확인합니다."""
+        if section_num not in self.pivot_patterns:
+            return False
+        pattern = self.pivot_patterns[section_num]
+        return pattern is None or pattern.search(section_title) is not None
+
+    def is_header_cell(self, tag_name: str, style: str) -> bool:
+        """셀이 헤더 셀(회색 배경 또는 th)인지 확인합니다."""
+        if tag_name in self.header_tags:
+            return True
+        return self.header_style_pattern is not None and self.header_style_pattern.search(style) is not None
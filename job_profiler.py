@@ -0,0 +1,229 @@
+import cProfile
+import json
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from structured_log import get_logger
+
+log = get_logger('profiler')
+
+# tracemalloc이 할당 위치마다 저장할 호출 스택 깊이
+# (보고서는 할당한 줄만 쓰므로 1; 깊게 잡으면 할당마다 스택을 복사해 작업이 몇 배 느려짐)
+TRACE_FRAMES = 1
+
+# 작업별 할당 위치에서 제외할 파일
+IGNORED_ALLOCATION_FILES = (tracemalloc.__file__, cProfile.__file__, pstats.__file__,
+                            '<frozen importlib._bootstrap>', '<frozen importlib._bootstrap_external>')
+
+# 단계별로 누적 시간을 모아 볼 대표 함수: 단계 → (파일명, 함수명)
+STAGE_FUNCTIONS = {
+    'corp_lookup': ('dart_crawler.py', 'get_corp_code'),
+    'list': ('dart_crawler.py', 'get_report_list'),
+    'sub_docs': ('dart_crawler.py', 'get_consolidated_notes_from_report'),
+    'notes_fetch': ('dart_crawler.py', 'get_notes_content_from_url'),
+    'html_parse': ('table_extractor.py', 'parse_html'),
+    'section_find': ('table_extractor.py', 'find_sections'),
+    'table_extract': ('table_extractor.py', 'extract_table_title_and_data'),
+    'merge': ('table_extractor.py', 'merge_sections'),
+    'csv_write': ('table_extractor.py', 'write_section'),
+}
+
+
+def safe_name(job_id: str) -> str:
+    """작업 ID를 파일 이름에 쓸 수 있게 바꿉니다."""
+    return re.sub(r'[^\w.-]+', '_', job_id).strip('_')[:120] or 'job'
+
+
+class JobProfiler:
+    """작업 단위 프로파일러
+
+    - profile: 작업마다 cProfile 결과를 {profile_dir}/{종류}-{작업 ID}.prof로 저장
+    - trace_memory: 작업마다 tracemalloc 최대 사용량과 늘어난 메모리의 할당 위치 상위 N개를
+      {profile_dir}/memory.jsonl에 기록
+
+    병렬 추출 작업자 프로세스도 같은 디렉토리에 기록하므로 report()는 실행 전체를 합쳐 보여줍니다.
+    tracemalloc은 프로세스 전체를 추적하므로 작업자 스레드가 여러 개면 동시에 실행된 작업의 할당이 섞입니다.
+    (정확한 작업별 수치가 필요하면 작업자 1개로 실행)
+    """
+
+    def __init__(self):
+        self.profile_dir: Optional[Path] = None
+        self.profile = False
+        self.trace_memory = False
+        self.top_n = 20
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.profile or self.trace_memory
+
+    def configure(self, profile_dir: str, profile: bool = False, trace_memory: bool = False,
+                  top_n: int = 20) -> None:
+        """프로파일링을 켭니다.
+
+        Args:
+            profile_dir (str): .prof 파일과 메모리 기록을 저장할 디렉토리
+            profile (bool): 작업마다 cProfile 실행
+            trace_memory (bool): 작업마다 tracemalloc 최대 사용량·할당 위치 기록
+            top_n (int): 보고서에 보여줄 함수·할당 위치 수
+        """
+        self.profile_dir = Path(profile_dir)
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.top_n = top_n
+        if trace_memory:
+            if tracemalloc.is_tracing():
+                # fork한 작업자는 부모의 추적 기록을 물려받으므로 비워야 스냅숏이 느려지지 않음
+                tracemalloc.clear_traces()
+            else:
+                tracemalloc.start(TRACE_FRAMES)
+
+    def settings(self) -> Dict:
+        """작업자 프로세스에서 같은 설정으로 configure()를 부를 때 쓸 설정"""
+        if not self.enabled:
+            return {}
+        return {'profile_dir': str(self.profile_dir), 'profile': self.profile,
+                'trace_memory': self.trace_memory, 'top_n': self.top_n}
+
+    @contextmanager
+    def job(self, kind: str, job_id: str) -> Iterator[None]:
+        """with 블록을 작업 하나로 프로파일링합니다. (꺼져 있으면 아무것도 하지 않음)"""
+        if not self.enabled:
+            yield
+            return
+
+        name = f"{kind}-{safe_name(job_id)}"
+        # 스냅숏은 프로파일러를 켜기 전에 찍어야 그 시간이 함수별 시간에 섞이지 않음
+        before = None
+        if self.trace_memory:
+            before = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+        profiler = None
+        if self.profile:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError as e:
+                # Python 3.12부터는 프로파일러가 동시에 하나만 켜질 수 있음
+                log.warning("다른 작업을 프로파일링 중이라 이 작업은 건너뜁니다: %s", e, extra={'profile_job': name})
+                profiler = None
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            if profiler is not None:
+                profiler.disable()
+                profiler.dump_stats(str(self.profile_dir / f"{name}.prof"))
+            if before is not None:
+                self._record_memory(kind, job_id, before, elapsed)
+
+    def _record_memory(self, kind: str, job_id: str, before: tracemalloc.Snapshot, elapsed: float) -> None:
+        """작업의 메모리 최대 사용량과 할당 위치 상위 N개를 memory.jsonl에 추가합니다."""
+        _, peak = tracemalloc.get_traced_memory()
+        # 프로파일러 자체와 처음 import하는 모듈 적재는 작업의 할당이 아니므로 제외
+        # (스냅숏 전체에 filter_traces()를 쓰면 추적 건수만큼 느려지므로 줄별로 묶은 뒤 거름)
+        diff = [stat for stat in tracemalloc.take_snapshot().compare_to(before, 'lineno')
+                if stat.traceback[0].filename not in IGNORED_ALLOCATION_FILES]
+        entry = {
+            'kind': kind,
+            'job_id': job_id,
+            'seconds': round(elapsed, 3),
+            'peak_bytes': peak,
+            'net_bytes': sum(stat.size_diff for stat in diff),
+            'top_sites': [
+                {'site': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                 'size_diff': stat.size_diff, 'count_diff': stat.count_diff}
+                for stat in diff[:self.top_n] if stat.size_diff > 0
+            ],
+        }
+        with self._lock:
+            with open(self.profile_dir / 'memory.jsonl', 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        log.info("작업 메모리 최대 %.1fMB", peak / 1024 / 1024, extra={'peak_bytes': peak, 'profile_job': job_id})
+
+    def hot_functions(self, stats: Optional[pstats.Stats] = None) -> List[Dict]:
+        """모든 .prof 파일을 합쳐 자체 실행 시간(tottime)이 긴 함수 상위 N개를 반환합니다."""
+        stats = stats or self._load_stats()
+        if stats is None:
+            return []
+        rows = []
+        for (filename, lineno, funcname), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+            rows.append({'function': f"{Path(filename).name}:{lineno}({funcname})", 'ncalls': ncalls,
+                         'tottime': round(tottime, 4), 'cumtime': round(cumtime, 4)})
+        rows.sort(key=lambda row: row['tottime'], reverse=True)
+        return rows[:self.top_n]
+
+    def stage_times(self, stats: Optional[pstats.Stats] = None) -> Dict[str, Dict]:
+        """단계별 대표 함수의 호출 수와 누적 시간을 반환합니다."""
+        stats = stats or self._load_stats()
+        if stats is None:
+            return {}
+        result = {}
+        for stage, (file_name, func_name) in STAGE_FUNCTIONS.items():
+            for (filename, _, funcname), (_, ncalls, _, cumtime, _) in stats.stats.items():
+                if funcname == func_name and Path(filename).name == file_name:
+                    result[stage] = {'ncalls': ncalls, 'cumtime': round(cumtime, 4)}
+        return result
+
+    def _load_stats(self, stream=None) -> Optional[pstats.Stats]:
+        prof_files = sorted(str(path) for path in self.profile_dir.glob('*.prof'))
+        if not prof_files:
+            return None
+        return pstats.Stats(*prof_files, stream=stream)
+
+    def report(self) -> None:
+        """실행 전체의 함수별·단계별 시간과 작업별 메모리 상위 N개를 출력하고 파일로 저장합니다."""
+        if not self.enabled:
+            return
+        if self.profile:
+            # 전체 보고서(top_functions.txt)는 pstats 형식 그대로 저장
+            with open(self.profile_dir / 'top_functions.txt', 'w', encoding='utf-8') as f:
+                stats = self._load_stats(stream=f)
+                if stats is not None:
+                    stats.sort_stats('cumulative').print_stats(self.top_n)
+                    stats.sort_stats('tottime').print_stats(self.top_n)
+            if stats is not None:
+                print(f"\n🔥 자체 실행 시간 상위 {self.top_n}개 함수 ({len(list(self.profile_dir.glob('*.prof')))}개 작업 합계)")
+                for row in self.hot_functions(stats):
+                    print(f"   {row['tottime']:>9.3f}s 자체 / {row['cumtime']:>9.3f}s 누적  "
+                          f"{row['ncalls']:>8}회  {row['function']}")
+                for stage, info in self.stage_times(stats).items():
+                    print(f"   ⏱️ [{stage}] {info['cumtime']:.3f}s 누적 ({info['ncalls']}회)")
+                print(f"📄 전체 보고서: {self.profile_dir / 'top_functions.txt'}")
+        if self.trace_memory:
+            entries = self.memory_entries()
+            if entries:
+                entries.sort(key=lambda entry: entry['peak_bytes'], reverse=True)
+                print(f"\n🧠 메모리 최대 사용량 상위 {min(self.top_n, len(entries))}개 작업")
+                for entry in entries[:self.top_n]:
+                    print(f"   {entry['peak_bytes'] / 1024 / 1024:>8.1f}MB  {entry['kind']} {entry['job_id']} "
+                          f"({entry['seconds']:.2f}초)")
+                    for site in entry['top_sites'][:3]:
+                        print(f"      +{site['size_diff'] / 1024:,.0f}KB  {site['site']}")
+                print(f"📄 작업별 할당 위치: {self.profile_dir / 'memory.jsonl'}")
+
+    def memory_entries(self) -> List[Dict]:
+        """memory.jsonl의 작업별 메모리 기록을 읽습니다."""
+        path = self.profile_dir / 'memory.jsonl'
+        if not path.exists():
+            return []
+        with open(path, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+
+# 프로세스 전체에서 공유하는 프로파일러 (configure()를 부르기 전에는 꺼져 있음)
+PROFILER = JobProfiler()
+
+
+def default_profile_dir(output_dir: str = "result") -> str:
+    """실행마다 새로 만드는 프로파일 디렉토리 ({output_dir}/profile/{시작시각})"""
+    return str(Path(output_dir) / 'profile' / datetime.now().strftime('%Y%m%d-%H%M%S'))
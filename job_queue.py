@@ -0,0 +1,225 @@
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple, Type
+
+from job_specs import iter_jobs, job_key
+
+JOB_STATES = ('pending', 'running', 'done', 'failed')
+
+
+def default_worker_id() -> str:
+    """호스트명과 프로세스 번호로 작업자 ID를 만듭니다."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class JobQueue:
+    """SQLite 파일 기반의 영속 작업 큐
+
+    작업 상태(pending/running/done/failed), 임대(lease) 만료 시각, 시도 횟수, 오류 내용을 기록합니다.
+    작업 할당은 BEGIN IMMEDIATE 트랜잭션 안에서 이루어지므로 여러 프로세스가 같은 파일을 공유해도
+    한 작업은 한 작업자에게만 할당되고, 중단된 실행은 남은 작업부터 이어서 처리됩니다.
+    임대 시간 안에 끝나지 않은(작업자가 죽은) 작업은 다른 작업자가 다시 가져갑니다.
+    """
+
+    def __init__(self, db_path: str, lease_seconds: int = 600, max_attempts: int = 3):
+        """
+        Args:
+            db_path (str): 큐 SQLite 파일 경로
+            lease_seconds (int): 작업 하나를 할당받은 뒤 완료를 보고해야 하는 시간 (초)
+            max_attempts (int): 실패 시 다시 시도할 최대 횟수 (넘으면 failed)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        # 트랜잭션은 직접 BEGIN/COMMIT으로 관리
+        self.conn = sqlite3.connect(str(self.db_path), timeout=60, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA busy_timeout=60000")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT UNIQUE NOT NULL,
+                spec TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_until REAL,
+                worker TEXT,
+                error TEXT,
+                updated_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, seq);
+        """)
+
+    def _transaction(self, sql_steps: Callable[[], object]):
+        """쓰기 잠금(BEGIN IMMEDIATE)을 잡고 sql_steps를 실행합니다."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = sql_steps()
+            self.conn.execute("COMMIT")
+            return result
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def enqueue(self, jobs: Iterable[Dict[str, str]]) -> int:
+        """작업들을 큐에 추가하고 새로 추가된 개수를 반환합니다. (이미 있는 작업은 그대로 둠)"""
+        now = time.time()
+
+        def insert():
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO jobs (job_id, spec, updated_at) VALUES (?, ?, ?)",
+                ((job_key(job), json.dumps(job, ensure_ascii=False), now) for job in jobs)
+            )
+            return self.conn.total_changes - before
+
+        return self._transaction(insert)
+
+    def claim(self, worker_id: str) -> Optional[Dict]:
+        """처리할 작업 하나를 원자적으로 할당받습니다. (없으면 None)
+
+        대기 중인 작업이나 임대가 만료된 실행 중 작업을 먼저 들어온 순서대로 가져갑니다.
+        """
+        now = time.time()
+
+        def take():
+            # 임대가 만료됐는데 시도 횟수를 다 쓴 작업은 실패 처리
+            self.conn.execute(
+                "UPDATE jobs SET state = 'failed', error = COALESCE(error, '임대 시간 초과'), updated_at = ? "
+                "WHERE state = 'running' AND lease_until < ? AND attempts >= ?",
+                (now, now, self.max_attempts)
+            )
+            row = self.conn.execute(
+                "SELECT job_id, spec, attempts FROM jobs "
+                "WHERE state = 'pending' OR (state = 'running' AND lease_until < ?) "
+                "ORDER BY seq LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute(
+                "UPDATE jobs SET state = 'running', worker = ?, attempts = attempts + 1, "
+                "lease_until = ?, updated_at = ? WHERE job_id = ?",
+                (worker_id, now + self.lease_seconds, now, row[0])
+            )
+            return {'job_id': row[0], 'spec': json.loads(row[1]), 'attempts': row[2] + 1}
+
+        return self._transaction(take)
+
+    def complete(self, job_id: str, worker_id: str) -> None:
+        """작업을 완료 처리합니다."""
+        self._transaction(lambda: self.conn.execute(
+            "UPDATE jobs SET state = 'done', error = NULL, lease_until = NULL, updated_at = ? "
+            "WHERE job_id = ? AND worker = ?",
+            (time.time(), job_id, worker_id)
+        ))
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> None:
+        """작업 실패를 기록합니다. (시도 횟수가 남아 있으면 다시 대기 상태로)"""
+        self._transaction(lambda: self.conn.execute(
+            "UPDATE jobs SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "error = ?, lease_until = NULL, updated_at = ? WHERE job_id = ? AND worker = ?",
+            (self.max_attempts, error, time.time(), job_id, worker_id)
+        ))
+
+    def release(self, job_id: str, worker_id: str) -> None:
+        """할당받은 작업을 처리하지 않고 시도 횟수를 되돌려 대기 상태로 돌려놓습니다."""
+        self._transaction(lambda: self.conn.execute(
+            "UPDATE jobs SET state = 'pending', attempts = MAX(attempts - 1, 0), lease_until = NULL, "
+            "updated_at = ? WHERE job_id = ? AND worker = ?",
+            (time.time(), job_id, worker_id)
+        ))
+
+    def retry_failed(self) -> int:
+        """실패한 작업을 시도 횟수를 초기화해 다시 대기 상태로 돌리고 개수를 반환합니다."""
+        return self._transaction(lambda: self.conn.execute(
+            "UPDATE jobs SET state = 'pending', attempts = 0, updated_at = ? WHERE state = 'failed'",
+            (time.time(),)
+        ).rowcount)
+
+    def stats(self) -> Dict[str, int]:
+        """상태별 작업 수를 반환합니다."""
+        counts = dict.fromkeys(JOB_STATES, 0)
+        counts.update(self.conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall())
+        return counts
+
+    def failures(self, limit: int = 20):
+        """실패한 작업과 오류 내용을 반환합니다."""
+        return self.conn.execute(
+            "SELECT job_id, attempts, error FROM jobs WHERE state = 'failed' ORDER BY seq LIMIT ?", (limit,)
+        ).fetchall()
+
+    def run_worker(self, handler: Callable[[Dict[str, str]], bool], worker_id: Optional[str] = None,
+                   stop_on: Tuple[Type[BaseException], ...] = ()) -> Dict[str, int]:
+        """큐가 빌 때까지 작업을 할당받아 handler로 처리합니다.
+
+        Args:
+            handler: 작업 명세를 받아 성공 여부를 반환하는 함수 (예외도 실패로 기록)
+            worker_id (str, optional): 작업자 ID (없으면 호스트명-PID)
+            stop_on (tuple): 이 예외가 나면 작업을 대기 상태로 되돌리고 예외를 그대로 전달
+                (예: API 한도 소진처럼 작업 탓이 아닌 중단)
+
+        Returns:
+            dict: 이 작업자가 처리한 성공/실패 건수
+        """
+        worker_id = worker_id or default_worker_id()
+        processed = {'done': 0, 'failed': 0}
+        while True:
+            job = self.claim(worker_id)
+            if job is None:
+                break
+            try:
+                ok = handler(job['spec'])
+                error = None if ok else "처리 실패"
+            except stop_on:
+                self.release(job['job_id'], worker_id)
+                raise
+            except Exception as e:
+                ok = False
+                error = f"{type(e).__name__}: {e}"
+            if ok:
+                self.complete(job['job_id'], worker_id)
+                processed['done'] += 1
+            else:
+                self.fail(job['job_id'], worker_id, error)
+                processed['failed'] += 1
+        return processed
+
+    def close(self):
+        """DB 연결을 닫습니다."""
+        self.conn.close()
+
+
+def main():
+    """작업 큐 관리 실행 함수"""
+    parser = argparse.ArgumentParser(description="크롤링 작업 큐 관리")
+    parser.add_argument('command', choices=['enqueue', 'status', 'retry-failed'], help="실행할 명령")
+    parser.add_argument('config', nargs='?', default='companies_config.json',
+                        help="enqueue할 설정 파일 (JSON 또는 JSONL 작업 명세)")
+    parser.add_argument('--db', default='result/job_queue.db', help="큐 DB 경로")
+    args = parser.parse_args()
+
+    queue = JobQueue(args.db)
+    try:
+        if args.command == 'enqueue':
+            added = queue.enqueue(iter_jobs(args.config))
+            print(f"✅ 작업 {added}건 추가 ({args.config})")
+        elif args.command == 'retry-failed':
+            print(f"🔁 실패 작업 {queue.retry_failed()}건을 다시 대기 상태로 돌렸습니다.")
+
+        counts = queue.stats()
+        print("📊 " + " / ".join(f"{state}: {counts[state]}" for state in JOB_STATES))
+        for job_id, attempts, error in queue.failures():
+            print(f"   ❌ {job_id} (시도 {attempts}회): {error}")
+    finally:
+        queue.close()
+
+
+if __name__ == "__main__":
+    main()
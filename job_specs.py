@@ -0,0 +1,191 @@
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+def is_jsonl(config_file: str) -> bool:
+    """JSON Lines 작업 명세 파일인지 확인합니다."""
+    return Path(config_file).suffix.lower() in ('.jsonl', '.ndjson')
+
+
+def job_key(job: Dict[str, str]) -> str:
+    """작업을 식별하는 키를 반환합니다. (고유번호가 있으면 고유번호, 없으면 회사명 기준)"""
+    company = job.get('corp_code') or job.get('company_name', '')
+    return f"{company}|{job.get('year', '')}|{job.get('report_type', '')}"
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """"i/N" 형식의 샤드 지정을 (i, N)으로 바꿉니다. (i는 0부터 N-1까지)"""
+    try:
+        index, count = (int(part) for part in value.split('/', 1))
+    except ValueError:
+        raise ValueError(f"샤드는 i/N 형식이어야 합니다: {value}")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"샤드 번호는 0 이상 {count - 1} 이하여야 합니다: {value}")
+    return index, count
+
+
+def shard_arg(value: str) -> Tuple[int, int]:
+    """argparse용 i/N 샤드 인자 (잘못된 값이면 한국어 오류 메시지와 함께 종료 코드 2)"""
+    try:
+        return parse_shard(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def shard_of(job: Dict[str, str], count: int) -> int:
+    """작업이 속한 샤드 번호를 반환합니다.
+
+    (고유번호, 연도, 보고서 유형)의 SHA-1 해시로 정하므로 실행 환경이나
+    PYTHONHASHSEED와 관계없이 어느 노드에서 계산해도 같은 값이 나옵니다.
+    """
+    digest = hashlib.sha1(job_key(job).encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % count
+
+
+def iter_shard(jobs: Iterable[Dict[str, str]], shard: Optional[Tuple[int, int]]) -> Iterator[Dict[str, str]]:
+    """shard=(i, N)에 속한 작업만 생성합니다. (None이면 전체)"""
+    if shard is None:
+        yield from jobs
+        return
+    index, count = shard
+    for job in jobs:
+        if shard_of(job, count) == index:
+            yield job
+
+
+def shard_path(path: str, shard: Optional[Tuple[int, int]]) -> str:
+    """샤드별로 겹치지 않는 출력 경로를 만듭니다.
+
+    예: result/전체_표데이터.csv.gz → result/전체_표데이터.shard-0-of-4.csv.gz
+    """
+    if shard is None or not path:
+        return path
+    path = Path(path)
+    name = path.name
+    # 확장자(.csv.gz처럼 여러 개일 수 있음) 앞에 삽입, 숨김 파일의 첫 점은 이름으로 취급
+    dot = name.find('.', 1)
+    tag = f".shard-{shard[0]}-of-{shard[1]}"
+    name = name + tag if dot == -1 else name[:dot] + tag + name[dot:]
+    return str(path.with_name(name))
+
+
+def load_extraction_config(config_file: str) -> Dict:
+    """설정 파일의 extraction_config를 읽습니다.
+
+    JSONL 파일은 작업 줄이 나오기 전의 {"extraction_config": {...}} 줄만 읽으므로
+    파일 크기와 관계없이 바로 반환됩니다.
+    """
+    if not is_jsonl(config_file):
+        with open(config_file, 'r', encoding='utf-8') as f:
+            return json.load(f).get('extraction_config', {})
+
+    extraction_config = {}
+    with open(config_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            record = json.loads(line)
+            if 'extraction_config' not in record:
+                break
+            extraction_config.update(record['extraction_config'])
+    return extraction_config
+
+
+def iter_jobs(config_file: str) -> Iterator[Dict[str, str]]:
+    """설정 파일의 작업(회사명, 연도, 보고서 유형)을 하나씩 생성합니다.
+
+    - .jsonl / .ndjson: 한 줄에 작업 하나씩 읽으면서 바로 생성 (전체를 메모리에 올리지 않음)
+    - .json: 기존 companies_config.json 형식의 companies 목록
+    """
+    if not is_jsonl(config_file):
+        with open(config_file, 'r', encoding='utf-8') as f:
+            yield from json.load(f).get('companies', [])
+        return
+
+    with open(config_file, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                print(f"⚠️ {config_file}:{line_no} 작업 명세 형식이 올바르지 않아 건너뜁니다.")
+                continue
+            if 'extraction_config' in record:
+                continue
+            yield record
+
+
+def iter_universe_jobs(years: Iterable[str], report_types: List[str],
+                       stock_codes: Optional[Iterable[str]] = None) -> Iterator[Dict[str, str]]:
+    """DART 고유번호 목록에서 상장사만 골라 (회사 × 연도 × 보고서 유형) 작업을 생성합니다.
+
+    Args:
+        years: 연도 목록 (예: ["2024", "2025"])
+        report_types: 보고서 유형 이름 목록 (예: ["사업보고서", "반기보고서"])
+        stock_codes: 지정하면 이 종목코드의 회사만 포함
+    """
+    # 크롤러 설정(API 키)이 필요한 경우에만 불러옴
+    from dart_crawler import iter_corp_codes
+
+    years = [str(year) for year in years]
+    wanted = set(stock_codes) if stock_codes else None
+    for corp in iter_corp_codes():
+        stock_code = corp.get('stock_code', '').strip()
+        if not stock_code or (wanted is not None and stock_code not in wanted):
+            continue
+        for year in years:
+            for report_type in report_types:
+                yield {
+                    'company_name': corp['corp_name'],
+                    'corp_code': corp['corp_code'],
+                    'stock_code': stock_code,
+                    'year': year,
+                    'report_type': report_type,
+                }
+
+
+def parse_year_range(value: str) -> List[str]:
+    """"2023-2025" 또는 "2024,2025" 형식의 연도 범위를 목록으로 바꿉니다."""
+    if '-' in value:
+        start, end = value.split('-', 1)
+        return [str(year) for year in range(int(start), int(end) + 1)]
+    return [year.strip() for year in value.split(',') if year.strip()]
+
+
+def main():
+    """상장사 전체 작업 명세(JSONL) 생성 실행 함수"""
+    parser = argparse.ArgumentParser(description="상장사 전체 작업 명세(JSONL) 생성")
+    parser.add_argument('--years', required=True, help="연도 범위 (예: 2023-2025 또는 2024,2025)")
+    parser.add_argument('--report-types', default="1분기보고서,반기보고서,3분기보고서,사업보고서",
+                        help="보고서 유형 (쉼표 구분)")
+    parser.add_argument('--stock-codes', help="종목코드 목록 파일 (한 줄에 하나)")
+    parser.add_argument('--output', help="출력 파일 (없으면 표준 출력)")
+    args = parser.parse_args()
+
+    stock_codes = None
+    if args.stock_codes:
+        with open(args.stock_codes, 'r', encoding='utf-8') as f:
+            stock_codes = [line.strip() for line in f if line.strip()]
+
+    report_types = [report_type.strip() for report_type in args.report_types.split(',') if report_type.strip()]
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        count = 0
+        for job in iter_universe_jobs(parse_year_range(args.years), report_types, stock_codes):
+            out.write(json.dumps(job, ensure_ascii=False) + '\n')
+            count += 1
+    finally:
+        if args.output:
+            out.close()
+    print(f"✅ 작업 명세 {count}건 생성 완료", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
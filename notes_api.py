@@ -0,0 +1,155 @@
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from extraction_rules import ExtractionRules
+from table_extractor import META_HEADERS, TableExtractor
+from table_ir import Section
+
+# 항목번호 → 열 이름 → 값 목록 (모든 열의 길이가 같음, 해당 표에 없는 열은 None)
+ItemColumns = Dict[str, List[Optional[str]]]
+
+# extract()/crawl()이 반환할 수 있는 형식
+#   pandas: 항목별 DataFrame (pyarrow가 있으면 Arrow 표를 감싼 ArrowDtype 열)
+#   arrow: 항목별 pyarrow.Table
+#   columns: 항목별 {열 이름: 값 목록} (추가 의존성 없음)
+BACKENDS = ('pandas', 'arrow', 'columns')
+
+
+def unique_headers(headers: List[str]) -> List[str]:
+    """빈·중복 헤더(메타데이터 열 이름 포함)에 번호를 붙여 열 이름으로 쓸 수 있게 만듭니다. (예: 회사명 → 회사명_2)"""
+    seen = {name: 1 for name in META_HEADERS}
+    names = []
+    for index, header in enumerate(headers, start=1):
+        name = header or f"열{index}"
+        seen[name] = seen.get(name, 0) + 1
+        names.append(name if seen[name] == 1 else f"{name}_{seen[name]}")
+    return names
+
+
+def read_source(source: Union[str, bytes, Path], encoding: str = 'utf-8') -> Tuple[str, Optional[str]]:
+    """입력을 (파일 경로 또는 표시용 이름, 메모리의 HTML 문자열)로 나눕니다. (파일이면 HTML은 None)
+
+    문자열은 그 경로에 파일이 있으면 경로로, 없고 태그('<')가 있으면 HTML로 봅니다. (Path는 항상 경로)
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return '<bytes>', bytes(source).decode(encoding)
+    # os.path.exists는 너무 긴 문자열(HTML 본문)이 들어와도 예외 없이 False를 반환
+    if isinstance(source, str) and not os.path.exists(source) and '<' in source:
+        return '<html>', source
+    return str(source), None
+
+
+def collect_columns(extractor: TableExtractor, sections: Iterable[Section]) -> Dict[str, ItemColumns]:
+    """병합 규칙을 적용한 표들을 CSV와 같은 행으로 풀어 항목별 열 목록으로 모읍니다."""
+    items: Dict[str, ItemColumns] = {}
+    for section_num, tables_data in extractor.iter_merged_sections(sections):
+        section_name = f"({section_num})"
+        if extractor.needs_pivot(section_name, tables_data):
+            tables_data = extractor.pivot_table_data(tables_data)
+        for table in tables_data:
+            names = unique_headers(table.headers) if table.headers else None
+            for row in extractor.iter_table_rows(section_name, table):
+                # 항목번호 열 (병합된 4,5,7번은 4번으로 통일된 값)
+                columns = items.setdefault(row[3], {})
+                length = len(next(iter(columns.values()), []))
+                row_names = META_HEADERS + (names or unique_headers([''] * (len(row) - len(META_HEADERS))))
+                # 항목 안에서 표마다 헤더가 다르면 열을 합치고, 앞선 행의 빈 칸은 None
+                for name in row_names:
+                    if name not in columns:
+                        columns[name] = [None] * length
+                values = dict(zip(row_names, row))
+                for name, column in columns.items():
+                    column.append(values.get(name))
+    return items
+
+
+def to_arrow(columns: ItemColumns):
+    """항목 하나의 열 목록을 pyarrow.Table로 만듭니다. (모든 열은 문자열, 빈 칸은 null)"""
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ImportError("Arrow 형식으로 반환하려면 pyarrow가 필요합니다: pip install pyarrow") from None
+    return pa.table({name: pa.array(values, type=pa.string()) for name, values in columns.items()})
+
+
+def to_pandas(columns: ItemColumns):
+    """항목 하나의 열 목록을 DataFrame으로 만듭니다.
+
+    pyarrow가 있으면 열 목록으로 Arrow 표를 만든 뒤(문자열은 이때 한 번 Arrow 버퍼로 복사)
+    ArrowDtype 열로 감싸므로, DataFrame으로 바꿀 때 문자열을 파이썬 객체로 다시 만들지 않습니다.
+    """
+    try:
+        import pandas as pd
+    except ImportError:
+        raise ImportError("DataFrame으로 반환하려면 pandas가 필요합니다: pip install pandas") from None
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return pd.DataFrame(columns)
+    if not hasattr(pd, 'ArrowDtype'):  # pandas 1.5 미만
+        return pd.DataFrame(columns)
+    return to_arrow(columns).to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def convert_items(items: Dict[str, ItemColumns], backend: str) -> Dict[str, Any]:
+    if backend == 'columns':
+        return items
+    convert = to_arrow if backend == 'arrow' else to_pandas
+    return {item: convert(columns) for item, columns in items.items()}
+
+
+def extract(source: Union[str, bytes, Path], backend: str = 'pandas', rules: Optional[ExtractionRules] = None,
+            encoding: str = 'utf-8') -> Optional[Dict[str, Any]]:
+    """주석 HTML에서 표를 추출해 파일을 쓰지 않고 항목번호별 표로 반환합니다.
+
+    CSV 출력과 같은 병합·피벗 규칙을 적용하고, 열은 메타데이터 열(회사명, 년도, 보고서구분, 항목번호,
+    항목제목, 기간구분, 단위) 뒤에 표 헤더가 이어집니다. pandas·pyarrow는 해당 형식을 요청할 때만 불러옵니다.
+
+    Args:
+        source (str | bytes | Path): 주석 HTML 파일 경로, HTML 문자열 또는 HTML 바이트
+        backend (str): 반환 형식 ("pandas", "arrow", "columns")
+        rules (ExtractionRules, optional): 추출 규칙 (없으면 기본 규칙 사용)
+        encoding (str): source가 바이트일 때의 인코딩
+
+    Returns:
+        dict: 항목번호(예: "1", "4") → DataFrame / pyarrow.Table / 열 목록 (추출 실패 시 None)
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"지원하지 않는 반환 형식입니다: {backend} (가능: {', '.join(BACKENDS)})")
+    html_file_path, content = read_source(source, encoding)
+    extractor = TableExtractor(html_file_path, rules=rules)
+    sections = extractor.extract_sections(content)
+    if sections is None:
+        return None
+    return convert_items(collect_columns(extractor, sections), backend)
+
+
+def crawl(company_name: str, year: str, report_type: str, backend: str = 'pandas', corp_code: Optional[str] = None,
+          rules: Optional[ExtractionRules] = None) -> Optional[Dict[str, Any]]:
+    """DART에서 연결재무제표 주석을 받아 HTML·CSV 파일을 쓰지 않고 바로 항목번호별 표로 반환합니다.
+
+    Args:
+        company_name (str): 회사명
+        year (str): 연도
+        report_type (str): 보고서 유형 이름(예: "반기보고서") 또는 키("1"~"5")
+        backend (str): 반환 형식 ("pandas", "arrow", "columns")
+        corp_code (str, optional): 회사 고유번호 (있으면 고유번호 조회 생략)
+        rules (ExtractionRules, optional): 추출 규칙 (없으면 기본 규칙 사용)
+
+    Returns:
+        dict: extract()와 같은 형식 (조회·추출 실패 시 None)
+    """
+    from dart_crawler import REPORT_CODES, get_consolidated_financial_notes, get_report_type_key, render_notes_html
+
+    if backend not in BACKENDS:
+        raise ValueError(f"지원하지 않는 반환 형식입니다: {backend} (가능: {', '.join(BACKENDS)})")
+    report_type_key = report_type if report_type in REPORT_CODES else get_report_type_key(report_type)
+    if not report_type_key:
+        print(f"❌ 지원하지 않는 보고서 타입입니다: {report_type}")
+        return None
+    result = get_consolidated_financial_notes(company_name, year, report_type_key, corp_code=corp_code)
+    if not result:
+        return None
+    # 저장 파일과 같은 헤더를 붙여야 기본 정보(회사명, 연도, 보고서 유형)가 그대로 추출됨
+    return extract(render_notes_html(result, company_name, year, report_type_key), backend, rules)
@@ -0,0 +1,170 @@
+import html
+import json
+import mmap
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# 사이드카 인덱스 형식이 바뀌면 올려서 기존 인덱스를 다시 만들도록 함
+INDEX_VERSION = 1
+
+TABLE_TAG_PATTERN = re.compile(rb'<(/?)table\b[^>]*>', re.IGNORECASE)
+PARAGRAPH_PATTERN = re.compile(rb'<p\b[^>]*>(.*?)</p\s*>', re.IGNORECASE | re.DOTALL)
+HEADER_DIV_PATTERN = re.compile(rb'<div class="header">.*?</div>', re.DOTALL)
+TAG_PATTERN = re.compile(r'<[^>]+>')
+NUMBERED_HEADING_PATTERN = re.compile(r'^(\d+)\.\s')
+
+
+class NotesIndex:
+    """주석 HTML 파일의 바이트 오프셋 인덱스
+
+    파일을 한 번 mmap으로 훑어 모든 <table>과 번호가 붙은 주석 제목(예: "1. 지배기업의 개요")의
+    바이트 위치를 사이드카 파일(<파일명>.idx.json)에 저장합니다.
+    이후에는 전체 파일을 읽거나 파싱하지 않고 필요한 주석/표 구간만 잘라서 파싱할 수 있습니다.
+    """
+
+    def __init__(self, html_file_path: str, index: Dict):
+        """
+        Args:
+            html_file_path (str): HTML 파일 경로
+            index (dict): 인덱스 내용 (build()/load_or_build()로 생성)
+        """
+        self.html_file_path = Path(html_file_path)
+        self.index = index
+
+    @staticmethod
+    def sidecar_path(html_file_path: str) -> Path:
+        """인덱스 사이드카 파일 경로를 반환합니다."""
+        path = Path(html_file_path)
+        return path.with_name(path.name + '.idx.json')
+
+    @staticmethod
+    def _file_stamp(path: Path) -> Tuple[int, int]:
+        stat = path.stat()
+        return stat.st_size, stat.st_mtime_ns
+
+    @classmethod
+    def build(cls, html_file_path: str) -> 'NotesIndex':
+        """파일을 mmap으로 훑어 표와 주석 제목의 바이트 위치를 기록합니다."""
+        path = Path(html_file_path)
+        size, mtime_ns = cls._file_stamp(path)
+        tables = []
+        headings = []
+        header_span = None
+
+        if size:
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # 표 구간 (중첩 표는 가장 바깥 표만 기록)
+                depth = 0
+                start = 0
+                for match in TABLE_TAG_PATTERN.finditer(mm):
+                    if not match.group(1):
+                        if depth == 0:
+                            start = match.start()
+                        depth += 1
+                    elif depth:
+                        depth -= 1
+                        if depth == 0:
+                            tables.append([start, match.end()])
+
+                # 표 밖의 번호 붙은 주석 제목
+                table_index = 0
+                for match in PARAGRAPH_PATTERN.finditer(mm):
+                    offset = match.start()
+                    while table_index < len(tables) and tables[table_index][1] <= offset:
+                        table_index += 1
+                    if table_index < len(tables) and tables[table_index][0] <= offset:
+                        continue
+                    text = html.unescape(TAG_PATTERN.sub('', match.group(1).decode('utf-8', errors='replace'))).strip()
+                    heading_match = NUMBERED_HEADING_PATTERN.match(text)
+                    if heading_match:
+                        headings.append({'number': int(heading_match.group(1)), 'title': text, 'offset': offset})
+
+                header_match = HEADER_DIV_PATTERN.search(mm)
+                if header_match:
+                    header_span = [header_match.start(), header_match.end()]
+
+        index = {
+            'version': INDEX_VERSION,
+            'size': size,
+            'mtime_ns': mtime_ns,
+            'header': header_span,
+            'tables': tables,
+            'headings': headings,
+        }
+        return cls(path, index)
+
+    @classmethod
+    def load_or_build(cls, html_file_path: str) -> 'NotesIndex':
+        """사이드카 인덱스가 최신이면 읽고, 아니면 새로 만들어 저장합니다."""
+        path = Path(html_file_path)
+        sidecar = cls.sidecar_path(path)
+        if sidecar.exists():
+            try:
+                with open(sidecar, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+                size, mtime_ns = cls._file_stamp(path)
+                if (index.get('version') == INDEX_VERSION
+                        and index.get('size') == size and index.get('mtime_ns') == mtime_ns):
+                    return cls(path, index)
+            except (OSError, ValueError):
+                pass
+
+        notes_index = cls.build(path)
+        try:
+            with open(sidecar, 'w', encoding='utf-8') as f:
+                json.dump(notes_index.index, f, ensure_ascii=False)
+        except OSError as e:
+            print(f"⚠️ 인덱스 파일 저장 실패: {sidecar} ({e})")
+        return notes_index
+
+    def _read(self, start: int, end: int) -> bytes:
+        """파일의 [start, end) 바이트 구간을 mmap으로 읽습니다."""
+        with open(self.html_file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm[start:end]
+
+    def find_heading(self, titles: List[str]) -> Optional[int]:
+        """제목이 titles 중 하나인 첫 번째 주석 제목의 순번을 반환합니다."""
+        for position, heading in enumerate(self.index['headings']):
+            if heading['title'] in titles:
+                return position
+        return None
+
+    def note_span(self, position: int) -> Tuple[int, int]:
+        """position번째 주석 제목부터 다음 주석 제목 전까지의 바이트 구간을 반환합니다."""
+        headings = self.index['headings']
+        start = headings[position]['offset']
+        end = headings[position + 1]['offset'] if position + 1 < len(headings) else self.index['size']
+        return start, end
+
+    def note_position(self, note_number: int) -> Optional[int]:
+        """주석 번호(예: 1)에 해당하는 첫 번째 제목의 순번을 반환합니다."""
+        for position, heading in enumerate(self.index['headings']):
+            if heading['number'] == note_number:
+                return position
+        return None
+
+    def read_header_and_note(self, position: int) -> str:
+        """기본 정보 헤더와 position번째 주석 구간만 읽어 HTML 문자열로 반환합니다."""
+        parts = []
+        if self.index.get('header'):
+            parts.append(self._read(*self.index['header']))
+        parts.append(self._read(*self.note_span(position)))
+        return b'\n'.join(parts).decode('utf-8')
+
+    def tables_in_note(self, note_number: int) -> List[Tuple[int, int]]:
+        """주석 번호에 속한 표들의 바이트 구간 목록을 반환합니다."""
+        position = self.note_position(note_number)
+        if position is None:
+            return []
+        start, end = self.note_span(position)
+        return [tuple(span) for span in self.index['tables'] if start <= span[0] < end]
+
+    def parse_table(self, note_number: int, k: int):
+        """주석 N의 k번째(0부터) 표만 읽어 파싱한 <table> 요소를 반환합니다. (없으면 None)"""
+        spans = self.tables_in_note(note_number)
+        if k >= len(spans):
+            return None
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(self._read(*spans[k]).decode('utf-8'), 'html.parser')
+        return soup.find('table')
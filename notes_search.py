@@ -0,0 +1,199 @@
+import argparse
+import html
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from panel_store import fiscal_period
+
+WORD_PATTERN = re.compile(r'\w+')
+TAG_PATTERN = re.compile(r'<[^>]+>')
+SCRIPT_STYLE_PATTERN = re.compile(r'<(script|style)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+
+
+def ngram_tokens(text: str, n: int = 2) -> List[str]:
+    """텍스트를 어절별 문자 n-gram으로 나눕니다. (n자 이하 어절은 그대로)
+
+    한국어는 조사·복합어 때문에 공백 단위 검색이 잘 맞지 않으므로
+    "리스부채를" → ["리스", "스부", "부채", "채를"]처럼 어절 안에서 겹치는 2-gram으로 색인합니다.
+    """
+    tokens = []
+    for word in WORD_PATTERN.findall(text.lower()):
+        if len(word) <= n:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + n] for i in range(len(word) - n + 1))
+    return tokens
+
+
+def build_match_query(query: str, n: int = 2) -> str:
+    """검색어를 FTS5 MATCH 식으로 바꿉니다. (어절마다 n-gram 구(phrase), 어절끼리는 AND)"""
+    phrases = []
+    for word in WORD_PATTERN.findall(query.lower()):
+        grams = ngram_tokens(word, n)
+        if grams:
+            phrases.append('"' + ' '.join(grams) + '"')
+    return ' AND '.join(phrases)
+
+
+class NotesSearchIndex:
+    """수집한 주석 텍스트의 전문(full-text) 역색인
+
+    SQLite FTS5 위에 한국어용 2-gram 토큰을 저장하고 BM25로 순위를 매깁니다.
+    접수번호 단위로 upsert하므로 크롤링하면서 바로 색인할 수 있습니다.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path (str): 색인 SQLite 파일 경로
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # 크롤링 작업자 여러 개가 동시에 색인할 수 있으므로 잠금 대기 시간을 넉넉히 둠
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS notes_docs (
+                doc_id INTEGER PRIMARY KEY,
+                rcept_no TEXT UNIQUE NOT NULL,
+                company TEXT,
+                year TEXT,
+                report_type TEXT,
+                fiscal_period TEXT,
+                rcept_dt TEXT,
+                title TEXT,
+                url TEXT
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(grams, tokenize='unicode61');
+        """)
+        self.conn.commit()
+
+    def add_notes(self, result: Dict) -> None:
+        """get_consolidated_financial_notes() 결과 하나를 색인합니다. (같은 접수번호는 교체)"""
+        self.add_document(
+            rcept_no=result['rcept_no'],
+            company=result['company_name'],
+            year=result['year'],
+            report_type=result['report_type'],
+            rcept_dt=result.get('rcept_dt', ''),
+            title=result.get('notes_title', ''),
+            url=result.get('notes_url', ''),
+            text=result['text_content'],
+        )
+
+    def add_document(self, rcept_no: str, company: str, year: str, report_type: str, text: str,
+                     rcept_dt: str = '', title: str = '', url: str = '') -> None:
+        """문서 하나를 색인합니다. (같은 접수번호는 교체)"""
+        grams = ' '.join(ngram_tokens(text))
+        with self.conn:
+            row = self.conn.execute("SELECT doc_id FROM notes_docs WHERE rcept_no = ?", (rcept_no,)).fetchone()
+            if row:
+                self.conn.execute("DELETE FROM notes_fts WHERE rowid = ?", (row[0],))
+                self.conn.execute("DELETE FROM notes_docs WHERE doc_id = ?", (row[0],))
+            cursor = self.conn.execute(
+                "INSERT INTO notes_docs (rcept_no, company, year, report_type, fiscal_period, rcept_dt, title, url) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (rcept_no, company, year, report_type, fiscal_period(year, report_type), rcept_dt, title, url)
+            )
+            self.conn.execute("INSERT INTO notes_fts (rowid, grams) VALUES (?, ?)", (cursor.lastrowid, grams))
+
+    def add_html_file(self, html_file_path: str) -> bool:
+        """저장된 주석 HTML 파일(save_notes_to_files 형식)을 색인합니다. (기존 파일 일괄 색인용)"""
+        with open(html_file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        def header_value(label: str) -> str:
+            match = re.search(label + r':</strong>\s*([^<]+)', content)
+            return match.group(1).strip() if match else ''
+
+        rcept_no = header_value('접수번호')
+        if not rcept_no:
+            return False
+        body = content.split('<div class="content">', 1)[-1]
+        text = html.unescape(TAG_PATTERN.sub(' ', SCRIPT_STYLE_PATTERN.sub(' ', body)))
+        self.add_document(
+            rcept_no=rcept_no,
+            company=header_value('회사명'),
+            year=header_value('연도'),
+            report_type=header_value('보고서 유형'),
+            rcept_dt=header_value('접수일자'),
+            title=header_value('주석 제목'),
+            text=re.sub(r'\s+', ' ', text).strip(),
+        )
+        return True
+
+    def search(self, query: str, year: Optional[str] = None, report_type: Optional[str] = None,
+               period: Optional[str] = None, company: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """검색어가 모두 들어 있는 문서를 BM25 순위로 반환합니다.
+
+        Args:
+            query (str): 검색어 (예: "리스 부채 재평가")
+            year (str, optional): 연도 필터
+            report_type (str, optional): 보고서 유형 필터 (예: "1분기보고서")
+            period (str, optional): 회계기간 필터 (예: "2025-Q1")
+            company (str, optional): 회사명 필터
+            limit (int): 최대 결과 수
+        """
+        match_query = build_match_query(query)
+        if not match_query:
+            return []
+
+        sql = ("SELECT d.company, d.year, d.report_type, d.fiscal_period, d.rcept_no, d.rcept_dt, d.title, d.url, "
+               "bm25(notes_fts) AS score "
+               "FROM notes_fts JOIN notes_docs d ON d.doc_id = notes_fts.rowid "
+               "WHERE notes_fts MATCH ?")
+        params = [match_query]
+        for column, value in (('year', year), ('report_type', report_type),
+                              ('fiscal_period', period), ('company', company)):
+            if value:
+                sql += f" AND d.{column} = ?"
+                params.append(value)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+
+        columns = ['company', 'year', 'report_type', 'fiscal_period', 'rcept_no', 'rcept_dt', 'title', 'url', 'score']
+        return [dict(zip(columns, row)) for row in self.conn.execute(sql, params)]
+
+    def close(self):
+        """DB 연결을 닫습니다."""
+        self.conn.close()
+
+
+def main():
+    """주석 전문 검색 실행 함수"""
+    parser = argparse.ArgumentParser(description="수집한 연결재무제표 주석 전문 검색")
+    parser.add_argument('query', nargs='?', help="검색어 (예: \"리스 부채 재평가\")")
+    parser.add_argument('--db', default='result/notes_index.db', help="색인 DB 경로")
+    parser.add_argument('--year', help="연도 필터")
+    parser.add_argument('--report-type', help="보고서 유형 필터 (예: 1분기보고서)")
+    parser.add_argument('--period', help="회계기간 필터 (예: 2025-Q1)")
+    parser.add_argument('--company', help="회사명 필터")
+    parser.add_argument('--limit', type=int, default=20, help="최대 결과 수")
+    parser.add_argument('--add-html', nargs='*', default=[], help="색인에 추가할 저장된 주석 HTML 파일들")
+    args = parser.parse_args()
+
+    search_index = NotesSearchIndex(args.db)
+    try:
+        for html_file in args.add_html:
+            if search_index.add_html_file(html_file):
+                print(f"✅ 색인 완료: {html_file}")
+            else:
+                print(f"❌ 접수번호를 찾을 수 없어 색인하지 못했습니다: {html_file}")
+
+        if args.query:
+            started = time.perf_counter()
+            results = search_index.search(args.query, year=args.year, report_type=args.report_type,
+                                          period=args.period, company=args.company, limit=args.limit)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            print(f"🔍 '{args.query}' 검색 결과: {len(results)}건 ({elapsed_ms:.1f}ms)")
+            for rank, result in enumerate(results, 1):
+                print(f"{rank:3d}. {result['company']} {result['year']} {result['report_type']} "
+                      f"(접수번호: {result['rcept_no']}, 점수: {-result['score']:.3f})")
+    finally:
+        search_index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import csv
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from table_ir import Table
+
+# 보고서 유형 → 회계기간 접미사 (정렬 가능한 'YYYY-Qn' 형식)
+FISCAL_PERIOD_SUFFIX = {
+    "1분기보고서": "Q1",
+    "반기보고서": "Q2",
+    "3분기보고서": "Q3",
+    "사업보고서": "Q4",
+}
+
+PANEL_COLUMNS = ['회사명', '종속기업', '행번호', '회계기간', '항목번호', '항목제목', '기간구분', '지표', '값', '단위', '년도', '보고서구분']
+
+
+def fiscal_period(year: str, report_type: str) -> str:
+    """연도와 보고서 유형으로 회계기간 라벨을 만듭니다. (예: 2025, 반기보고서 → 2025-Q2)"""
+    suffix = FISCAL_PERIOD_SUFFIX.get(report_type)
+    return f"{year}-{suffix}" if suffix else f"{year}-{report_type}"
+
+
+class PanelStore:
+    """여러 공시의 표 데이터를 회사 × 종속기업(또는 행번호) × 회계기간 × 지표로 쌓는 패널 저장소
+
+    공시를 추출할 때마다 해당 값만 SQLite에 기록하므로, 새 공시가 들어와도
+    기존 출력 파일을 다시 읽지 않고 패널이 갱신됩니다.
+    같은 회사·회계기간·항목의 값은 나중에 추출된 공시가 항목 단위로 교체합니다.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path (str): 패널 SQLite 파일 경로
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(panel)")]
+        if columns and 'row_no' not in columns:
+            # 예전 패널은 종속기업이 아닌 표의 행이 한 키로 겹쳐 덮어써졌으므로 새 키로 다시 만듦
+            # (추출기 버전이 함께 올라가 다음 일괄 추출에서 모든 공시가 다시 기록됨)
+            print(f"⚠️ 패널 키 구조가 바뀌어 패널을 새로 만듭니다: {self.db_path}")
+            self.conn.execute("DROP TABLE panel")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS panel (
+                company TEXT NOT NULL,
+                subsidiary TEXT NOT NULL,
+                row_no INTEGER NOT NULL,
+                fiscal_period TEXT NOT NULL,
+                item TEXT NOT NULL,
+                item_title TEXT NOT NULL,
+                period TEXT NOT NULL,
+                metric TEXT NOT NULL,
+                value TEXT,
+                unit TEXT,
+                year TEXT,
+                report_type TEXT,
+                PRIMARY KEY (company, subsidiary, row_no, fiscal_period, item, period, metric)
+            )
+        """)
+        self.conn.commit()
+
+    def add_tables(self, company_info: Dict[str, str], item_number: str, tables: List[Table], keyed: bool = True) -> int:
+        """한 섹션의 표들로 패널의 해당 항목을 교체하고 기록한 값 개수를 반환합니다.
+
+        Args:
+            company_info (dict): 회사명/연도/보고서구분
+            item_number (str): 항목번호
+            tables (list): 병합·피벗이 끝난 표 목록
+            keyed (bool): 첫 번째 컬럼이 종속기업(행 키)인지 여부.
+                False면 종속기업 대신 기간구분별 행 순서(행번호)로 행을 구분해 서로 덮어쓰지 않게 합니다.
+                True여도 같은 종속기업·기간구분·지표가 다시 나오면 행번호를 올려 따로 기록합니다.
+        """
+        company = company_info['company']
+        year = company_info['year']
+        report_type = company_info['report_type']
+        fiscal = fiscal_period(year, report_type)
+
+        records = []
+        row_numbers = {}  # 기간구분 → 다음 행번호 (키 없는 표)
+        used_keys = set()  # (종속기업, 행번호, 기간구분, 지표) (키 있는 표의 중복 확인)
+        for table in tables:
+            metrics = table.headers[1:] if keyed else table.headers
+            for row in table.rows:
+                period = table.period if row.period is None else row.period
+                values = row.values[1:] if keyed else row.values
+                subsidiary = row.values[0] if keyed and row.values else ''
+                row_no = 0
+                if not keyed:
+                    row_no = row_numbers.get(period, 0)
+                    row_numbers[period] = row_no + 1
+                else:
+                    # 종속기업 이름이 겹치는 행(소계·동명 법인 등)이 서로 덮어쓰지 않도록 빈 행번호를 찾음
+                    row_metrics = metrics[:len(values)]
+                    while any((subsidiary, row_no, period, metric) in used_keys for metric in row_metrics):
+                        row_no += 1
+                    used_keys.update((subsidiary, row_no, period, metric) for metric in row_metrics)
+                for metric, value in zip(metrics, values):
+                    records.append((company, subsidiary, row_no, fiscal, item_number, table.section_title,
+                                    period or '', metric, value, table.unit, year, report_type))
+
+        # 다시 추출한 항목의 행 수가 줄어도 이전 행이 남지 않도록 항목 단위로 교체
+        self.conn.execute("DELETE FROM panel WHERE company = ? AND fiscal_period = ? AND item = ?",
+                          (company, fiscal, item_number))
+        self.conn.executemany(
+            "INSERT INTO panel VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", records
+        )
+        self.conn.commit()
+        return len(records)
+
+    def export_csv(self, output_path: str, company: Optional[str] = None) -> int:
+        """패널을 회계기간 순으로 정렬해 CSV로 내보내고 행 수를 반환합니다. (company가 없으면 전체)"""
+        query = ("SELECT company, subsidiary, row_no, fiscal_period, item, item_title, period, metric, value, unit, year, report_type "
+                 "FROM panel")
+        params = ()
+        if company:
+            query += " WHERE company = ?"
+            params = (company,)
+        query += " ORDER BY company, subsidiary, item, row_no, metric, fiscal_period, period"
+
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        count = 0
+        with open(output_path, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            writer.writerow(PANEL_COLUMNS)
+            for record in self.conn.execute(query, params):
+                writer.writerow(record)
+                count += 1
+        return count
+
+    def close(self):
+        """DB 연결을 닫습니다."""
+        self.conn.close()
@@ -0,0 +1,223 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+# 측정하는 처리 단계 (순서대로 출력)
+STAGES = ('crawl_job', 'corp_lookup', 'list', 'sub_docs', 'notes_fetch',
+          'html_parse', 'section_find', 'table_extract', 'merge', 'csv_write', 'panel_write')
+
+# 지연 시간 히스토그램 구간 상한 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _new_stage() -> Dict:
+    return {'count': 0, 'errors': 0, 'seconds': 0.0, 'max': 0.0, 'bytes': 0,
+            'buckets': [0] * (len(LATENCY_BUCKETS) + 1)}
+
+
+class StageMetrics:
+    """처리 단계별 소요 시간·오류·전송 바이트와 이벤트 횟수를 모으는 수집기
+
+    여러 스레드에서 동시에 기록해도 되고, 병렬 추출 작업자 프로세스에서 모은 값은
+    drain()으로 꺼내 부모 프로세스의 merge()로 합칩니다.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.stages: Dict[str, Dict] = {}
+        self.counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """with 블록의 소요 시간을 단계 name에 기록합니다. (예외가 나면 오류로도 집계)"""
+        started = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - started, failed)
+
+    def observe(self, name: str, seconds: float, failed: bool = False) -> None:
+        """단계 name의 소요 시간 한 건을 기록합니다."""
+        with self._lock:
+            stage = self.stages.setdefault(name, _new_stage())
+            stage['count'] += 1
+            stage['errors'] += int(failed)
+            stage['seconds'] += seconds
+            stage['max'] = max(stage['max'], seconds)
+            stage['buckets'][bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def add_bytes(self, name: str, size: int) -> None:
+        """단계 name에서 주고받거나 읽은 바이트 수를 더합니다."""
+        with self._lock:
+            self.stages.setdefault(name, _new_stage())['bytes'] += size
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """이벤트 횟수를 더합니다. (예: jobs_ok, filings_listed, csv_rows)"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def drain(self) -> Dict:
+        """지금까지 모은 값을 꺼내고 비웁니다. (작업자 프로세스 → 부모 전달용)"""
+        with self._lock:
+            state = {'stages': self.stages, 'counters': self.counters}
+            self.stages, self.counters = {}, {}
+            return state
+
+    def merge(self, state: Dict) -> None:
+        """drain()으로 꺼낸 값을 더합니다."""
+        with self._lock:
+            for name, other in state['stages'].items():
+                stage = self.stages.setdefault(name, _new_stage())
+                for field in ('count', 'errors', 'seconds', 'bytes'):
+                    stage[field] += other[field]
+                stage['max'] = max(stage['max'], other['max'])
+                stage['buckets'] = [a + b for a, b in zip(stage['buckets'], other['buckets'])]
+            for name, amount in state['counters'].items():
+                self.counters[name] = self.counters.get(name, 0) + amount
+
+    @staticmethod
+    def _quantile(stage: Dict, q: float) -> Optional[float]:
+        """히스토그램으로 분위수를 추정합니다. (해당 구간의 상한값)"""
+        if not stage['count']:
+            return None
+        rank = q * stage['count']
+        seen = 0
+        for upper, bucket_count in zip(LATENCY_BUCKETS + (stage['max'],), stage['buckets']):
+            seen += bucket_count
+            if seen >= rank:
+                return min(upper, stage['max'])
+        return stage['max']
+
+    def _ordered_stages(self):
+        known = [name for name in STAGES if name in self.stages]
+        return known + sorted(name for name in self.stages if name not in STAGES)
+
+    def summary(self) -> Dict:
+        """실행 요약 (단계별 건수·오류·합계/평균/p50/p95/최대 시간·바이트, 이벤트 횟수)"""
+        with self._lock:
+            wall = time.time() - self.started_at
+            stages = {}
+            for name in self._ordered_stages():
+                stage = self.stages[name]
+                stages[name] = {
+                    'count': stage['count'],
+                    'errors': stage['errors'],
+                    'total_seconds': round(stage['seconds'], 4),
+                    'mean_seconds': round(stage['seconds'] / stage['count'], 4) if stage['count'] else None,
+                    'p50_seconds': self._quantile(stage, 0.5),
+                    'p95_seconds': self._quantile(stage, 0.95),
+                    'max_seconds': round(stage['max'], 4),
+                    'bytes': stage['bytes'],
+                    'share_of_wall': round(stage['seconds'] / wall, 4) if wall > 0 else None,
+                }
+            return {
+                'started_at': datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds'),
+                'wall_seconds': round(wall, 3),
+                'stages': stages,
+                'counters': dict(sorted(self.counters.items())),
+            }
+
+    def prometheus_text(self, prefix: str = 'dart') -> str:
+        """Prometheus 텍스트 형식 (node_exporter textfile collector용)"""
+        lines = [
+            f"# HELP {prefix}_stage_duration_seconds Time spent per processing stage.",
+            f"# TYPE {prefix}_stage_duration_seconds histogram",
+        ]
+        with self._lock:
+            ordered = self._ordered_stages()
+            for name in ordered:
+                stage = self.stages[name]
+                cumulative = 0
+                for upper, bucket_count in zip(LATENCY_BUCKETS, stage['buckets']):
+                    cumulative += bucket_count
+                    lines.append(f'{prefix}_stage_duration_seconds_bucket{{stage="{name}",le="{upper}"}} {cumulative}')
+                lines.append(f'{prefix}_stage_duration_seconds_bucket{{stage="{name}",le="+Inf"}} {stage["count"]}')
+                lines.append(f'{prefix}_stage_duration_seconds_sum{{stage="{name}"}} {stage["seconds"]:.6f}')
+                lines.append(f'{prefix}_stage_duration_seconds_count{{stage="{name}"}} {stage["count"]}')
+            for metric, field, help_text in (('stage_errors_total', 'errors', "Failed calls per processing stage."),
+                                             ('stage_bytes_total', 'bytes', "Bytes transferred or read per stage.")):
+                lines.append(f"# HELP {prefix}_{metric} {help_text}")
+                lines.append(f"# TYPE {prefix}_{metric} counter")
+                for name in ordered:
+                    lines.append(f'{prefix}_{metric}{{stage="{name}"}} {self.stages[name][field]}')
+            lines.append(f"# HELP {prefix}_events_total Event counters (jobs, filings, rows).")
+            lines.append(f"# TYPE {prefix}_events_total counter")
+            for name, amount in sorted(self.counters.items()):
+                lines.append(f'{prefix}_events_total{{event="{name}"}} {amount}')
+        lines.append(f"# HELP {prefix}_run_started_seconds Unix time the run started.")
+        lines.append(f"# TYPE {prefix}_run_started_seconds gauge")
+        lines.append(f"{prefix}_run_started_seconds {self.started_at:.0f}")
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str) -> None:
+        """Prometheus 텍스트 파일을 기록합니다. (수집기가 반쯤 쓴 파일을 읽지 않도록 임시 파일 후 교체)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + f".{os.getpid()}.tmp")
+        tmp_path.write_text(self.prometheus_text(), encoding='utf-8')
+        os.replace(tmp_path, path)
+
+    def write_summary(self, path: str, **extra) -> None:
+        """실행 요약 JSON을 기록합니다."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({**extra, **self.summary()}, f, ensure_ascii=False, indent=2)
+
+    def report(self) -> None:
+        """단계별 소요 시간을 출력합니다."""
+        summary = self.summary()
+        for name, stage in summary['stages'].items():
+            if not stage['count']:
+                continue
+            size = ""
+            if stage['bytes']:
+                size = (f", {stage['bytes'] / 1024 / 1024:,.1f}MB" if stage['bytes'] >= 1024 * 1024
+                        else f", {stage['bytes'] / 1024:,.1f}KB")
+            errors = f", 오류 {stage['errors']}건" if stage['errors'] else ""
+            print(f"⏱️ [{name}] {stage['count']}회, 합계 {stage['total_seconds']:.2f}초 "
+                  f"(평균 {stage['mean_seconds'] * 1000:.1f}ms, p95 ≤{stage['p95_seconds'] * 1000:.1f}ms){size}{errors}")
+
+
+# 프로세스 전체에서 공유하는 수집기
+METRICS = StageMetrics()
+
+
+def metrics_textfile(output_dir: str = "result") -> str:
+    """Prometheus 텍스트 파일 경로 (METRICS_TEXTFILE, 기본 {output_dir}/metrics/dart.prom; 빈 값이면 기록 안 함)"""
+    return os.getenv('METRICS_TEXTFILE', str(Path(output_dir) / 'metrics' / 'dart.prom'))
+
+
+def export_run_metrics(command: str, output_dir: str = "result", **extra) -> None:
+    """실행을 마칠 때 단계별 지표를 출력하고 Prometheus 텍스트 파일과 실행 요약 JSON으로 저장합니다.
+
+    - METRICS_TEXTFILE (기본 {output_dir}/metrics/dart.prom): 실행마다 덮어씀
+    - METRICS_SUMMARY_DIR (기본 {output_dir}/metrics/runs): 실행마다 {시작시각}_{명령}.json을 새로 만듦
+    둘 중 하나를 빈 값으로 지정하면 그 파일은 만들지 않습니다.
+    """
+    if not METRICS.stages and not METRICS.counters:
+        return
+    METRICS.report()
+    textfile = metrics_textfile(output_dir)
+    summary_dir = os.getenv('METRICS_SUMMARY_DIR', str(Path(output_dir) / 'metrics' / 'runs'))
+    try:
+        if textfile:
+            METRICS.write_prometheus(textfile)
+        if summary_dir:
+            started = datetime.fromtimestamp(METRICS.started_at).strftime('%Y%m%d-%H%M%S')
+            summary_path = Path(summary_dir) / f"{started}_{os.getpid()}_{command}.json"
+            METRICS.write_summary(str(summary_path), command=command, **extra)
+            print(f"📈 실행 지표 저장: {summary_path}")
+    except OSError as e:
+        print(f"⚠️ 실행 지표 저장 실패: {e}")
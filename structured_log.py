@@ -0,0 +1,163 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+
+# 모든 모듈의 로거는 이 이름 아래에 둠 (예: dart.crawler, dart.extractor)
+ROOT_LOGGER = 'dart'
+
+# 지금 처리 중인 작업 ID (스레드·작업마다 따로 유지)
+current_job: ContextVar[Optional[str]] = ContextVar('current_job', default=None)
+
+# LogRecord 기본 속성 (이 밖의 extra 값만 JSON 필드로 출력)
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'job_id'}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_settings: Dict = {}
+# 대화형 모드면 작업 진행 상황을 화면에 출력 (일괄 처리·라이브러리에서는 로그로만 기록)
+_interactive = False
+
+# 라이브러리로 쓸 때는 setup_logging()을 부르기 전까지 아무것도 출력하지 않음
+logging.getLogger(ROOT_LOGGER).addHandler(logging.NullHandler())
+
+
+def get_logger(name: str) -> logging.Logger:
+    """모듈 로거를 반환합니다. (예: get_logger('crawler') → dart.crawler)"""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def set_interactive(enabled: bool = True) -> None:
+    """progress()가 로그 대신 화면에 출력할지 정합니다. (사용자가 보고 있는 대화형 모드에서만 켬)"""
+    global _interactive
+    _interactive = enabled
+
+
+def progress(logger: logging.Logger, level: int, icon: str, message: str, *args, **kwargs) -> None:
+    """작업 하나의 진행 상황이나 오류를 한 번만 알립니다.
+
+    대화형 모드에서는 아이콘(들여쓰기 포함)을 붙여 print로 출력하고, 그 밖에서는 logger에
+    level로 기록합니다. (exc_info, extra 등 kwargs는 로그에만 적용)
+
+    Args:
+        logger (Logger): 기록할 모듈 로거
+        level (int): 로그 수준 (예: logging.DEBUG)
+        icon (str): 화면 출력에만 붙일 앞부분 (예: "   🔍")
+        message (str): %-형식 메시지
+    """
+    if _interactive:
+        print(f"{icon} {message % args if args else message}")
+    else:
+        # 로그의 파일·줄 번호는 progress()를 부른 곳으로
+        logger.log(level, message, *args, stacklevel=2, **kwargs)
+
+
+@contextmanager
+def job_context(job_id: str) -> Iterator[None]:
+    """with 블록 안에서 남기는 로그에 작업 ID를 붙입니다."""
+    token = current_job.set(job_id)
+    try:
+        yield
+    finally:
+        current_job.reset(token)
+
+
+class JobIdFilter(logging.Filter):
+    """로그를 남긴 스레드의 작업 ID를 레코드에 기록합니다. (큐로 넘기기 전에 실행)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, 'job_id'):
+            record.job_id = current_job.get()
+        return True
+
+
+class JsonLineFormatter(logging.Formatter):
+    """한 줄에 JSON 객체 하나씩 기록하는 포매터"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        if getattr(record, 'job_id', None):
+            entry['job_id'] = record.job_id
+        entry.update({key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES})
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """사람이 읽기 쉬운 한 줄 형식 (LOG_FORMAT=text)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        job = f" [{record.job_id}]" if getattr(record, 'job_id', None) else ""
+        return f"{datetime.fromtimestamp(record.created):%H:%M:%S} {record.levelname[0]}{job} {record.getMessage()}"
+
+
+def setup_logging(level: Optional[str] = None, log_file: Optional[str] = None,
+                  log_format: Optional[str] = None) -> None:
+    """구조화 로그를 설정합니다.
+
+    로그는 메모리 큐에 넣기만 하고 별도 스레드(QueueListener)가 파일이나 stderr에 기록하므로
+    작업자 스레드가 출력 때문에 기다리지 않습니다. 여러 번 호출하면 마지막 설정으로 바뀝니다.
+
+    Args:
+        level (str, optional): 로그 수준 (없으면 LOG_LEVEL 환경변수, 기본 INFO; 항목별 상세 로그는 DEBUG)
+        log_file (str, optional): JSON Lines 로그 파일 (없으면 LOG_FILE 환경변수, 비어 있으면 stderr)
+        log_format (str, optional): "json" 또는 "text" (없으면 LOG_FORMAT 환경변수, 기본 json)
+    """
+    global _listener
+    level = (level or os.getenv('LOG_LEVEL') or 'INFO').upper()
+    log_file = log_file if log_file is not None else os.getenv('LOG_FILE', '')
+    log_format = (log_format or os.getenv('LOG_FORMAT') or 'json').lower()
+    _settings.update(level=level, log_file=log_file, log_format=log_format)
+
+    if log_file:
+        os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+        target = logging.FileHandler(log_file, encoding='utf-8')
+    else:
+        target = logging.StreamHandler(sys.stderr)
+    target.setFormatter(TextFormatter() if log_format == 'text' else JsonLineFormatter())
+
+    shutdown_logging()
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(JobIdFilter())
+
+    root = logging.getLogger(ROOT_LOGGER)
+    for handler in list(root.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+    root.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, target, respect_handler_level=False)
+    _listener.start()
+
+
+def logging_settings() -> Dict:
+    """현재 로그 설정 (병렬 추출 작업자 프로세스에서 같은 설정으로 setup_logging()을 부를 때 사용)"""
+    return dict(_settings)
+
+
+def shutdown_logging() -> None:
+    """큐에 남은 로그를 모두 기록하고 기록 스레드를 멈춥니다."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
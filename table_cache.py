@@ -0,0 +1,213 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from structured_log import get_logger, progress
+from table_ir import Section
+
+log = get_logger('cache')
+
+
+class TableCache:
+    """파싱된 섹션별 표(중간 표현)를 디스크에 저장해 두는 캐시
+
+    키는 HTML 파일 내용의 해시와 추출기 버전으로 만들어지므로,
+    파일이나 파싱 로직이 바뀌지 않았다면 BeautifulSoup 파싱을 건너뛰고
+    병합/CSV 단계만 다시 실행할 수 있습니다.
+    """
+
+    def __init__(self, cache_dir: str, version: str):
+        """
+        Args:
+            cache_dir (str): 캐시 파일을 저장할 디렉토리
+            version (str): 추출기 버전 (파싱 로직이 바뀌면 올려서 기존 캐시를 무효화)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.version = version
+
+    @staticmethod
+    def file_hash(file_path: str) -> str:
+        """파일 내용의 SHA-256 해시를 반환합니다."""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def key_for(self, file_path: str) -> str:
+        """파일 해시와 추출기 버전으로 캐시 키를 만듭니다."""
+        return f"{self.file_hash(file_path)}-v{self.version}"
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.pkl"
+
+    def load(self, key: str) -> Optional[Dict]:
+        """캐시된 기본 정보와 섹션 목록을 반환합니다. (없거나 손상되면 None)"""
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            progress(log, logging.WARNING, "⚠️", "캐시 파일을 읽을 수 없어 다시 파싱합니다: %s (%s)", path, e)
+            return None
+
+    def save(self, key: str, company_info: Dict[str, str], sections: List[Section]) -> None:
+        """기본 정보와 섹션 목록을 캐시에 저장합니다."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'company_info': company_info, 'sections': sections}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        # 여러 프로세스가 동시에 써도 깨진 파일이 보이지 않도록 교체
+        os.replace(tmp_path, path)
+
+
+class ExtractionManifest:
+    """공시별 표 추출 결과의 의존성(입력 해시, 추출기 버전, 설정 해시, 출력 경로)을 기록하는 매니페스트
+
+    JSON Lines 형식으로 이어 쓰며 같은 작업의 기록은 마지막 줄이 우선합니다.
+    """
+
+    def __init__(self, manifest_path: str):
+        """
+        Args:
+            manifest_path (str): 매니페스트 파일 경로 (.jsonl)
+        """
+        self.manifest_path = Path(manifest_path)
+        self.entries: Dict[str, Dict] = {}
+        self.load()
+
+    def load(self) -> None:
+        """기존 매니페스트를 읽습니다. (깨진 줄은 무시)"""
+        if not self.manifest_path.exists():
+            return
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    self.entries[entry['job']] = entry
+                except (ValueError, KeyError):
+                    continue
+
+    @staticmethod
+    def config_hash(config: Dict) -> str:
+        """추출 설정의 해시를 반환합니다."""
+        encoded = json.dumps(config, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+
+    def is_up_to_date(self, job: str, input_hash: str, extractor_version: str, config_hash: str,
+                      output_path: Optional[str] = None) -> bool:
+        """입력·추출기·설정이 그대로이고 출력 파일이 남아 있으면 True를 반환합니다.
+
+        Args:
+            output_path (str, optional): 이번 실행이 쓸 출력 경로 (알 수 있으면 기록된 경로와 같아야 최신)
+        """
+        entry = self.entries.get(job)
+        if not entry:
+            return False
+        if output_path is not None and entry.get('output_path') != str(output_path):
+            return False
+        return (entry.get('input_hash') == input_hash
+                and entry.get('extractor_version') == extractor_version
+                and entry.get('config_hash') == config_hash
+                and Path(entry.get('output_path', '')).exists())
+
+    def record(self, job: str, input_hash: str, extractor_version: str, config_hash: str, output_path: str) -> None:
+        """작업 결과를 매니페스트에 추가합니다."""
+        entry = {
+            'job': job,
+            'input_hash': input_hash,
+            'extractor_version': extractor_version,
+            'config_hash': config_hash,
+            'output_path': str(output_path)
+        }
+        self.entries[job] = entry
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+
+class HeaderMemo:
+    """헤더 구조 시그니처 → 최종 헤더 LRU 메모
+
+    같은 회사는 분기마다 거의 같은 표 양식을 쓰므로, 헤더 행들의
+    (원본 텍스트, colspan, rowspan) 튜플이 같으면 헤더 해석 결과를 재사용합니다.
+    path를 주면 save()/다음 실행 시 파일에서 이어서 사용합니다.
+    저장된 메모의 버전이 다르면(헤더 해석 로직이나 규칙이 바뀌면) 버리고 새로 시작합니다.
+    """
+
+    def __init__(self, maxsize: int = 4096, path: Optional[str] = None, version: str = ''):
+        """
+        Args:
+            maxsize (int): 보관할 최대 시그니처 수 (초과 시 가장 오래 안 쓴 것부터 제거)
+            path (str, optional): 메모를 저장/복원할 파일 경로
+            version (str): 메모 버전 (TableCache와 같은 "파서 버전-규칙 지문", 다르면 저장된 메모를 버림)
+        """
+        self.maxsize = maxsize
+        self.path = Path(path) if path else None
+        self.version = version
+        self.entries: OrderedDict = OrderedDict()
+        # drain() 이후 새로 배운 양식 (작업자 프로세스 → 부모 전달용)
+        self.learned: Dict = {}
+        self.hits = 0
+        self.misses = 0
+        if self.path and self.path.exists():
+            try:
+                with open(self.path, 'rb') as f:
+                    saved = pickle.load(f)
+                # 버전이 없는 예전 형식(목록)도 버전이 다른 것으로 취급
+                if isinstance(saved, dict) and saved.get('version') == self.version:
+                    self.entries = OrderedDict(saved['entries'])
+                else:
+                    progress(log, logging.WARNING, "⚠️", "헤더 메모 버전이 달라 새로 시작합니다: %s", self.path)
+            except Exception as e:
+                progress(log, logging.WARNING, "⚠️", "헤더 메모 파일을 읽을 수 없어 새로 시작합니다: %s (%s)", self.path, e)
+
+    def get(self, signature: Tuple) -> Optional[Tuple]:
+        """시그니처에 해당하는 헤더 해석 결과를 반환합니다. (없으면 None)"""
+        value = self.entries.get(signature)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(signature)
+        self.hits += 1
+        return value
+
+    def put(self, signature: Tuple, value: Tuple) -> None:
+        """헤더 해석 결과를 저장합니다."""
+        self.entries[signature] = value
+        self.entries.move_to_end(signature)
+        self.learned[signature] = value
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def drain(self) -> Dict:
+        """새로 배운 양식과 적중·미적중 횟수를 꺼내고 비웁니다. (작업자 프로세스 → 부모 전달용)"""
+        state = {'learned': list(self.learned.items()), 'hits': self.hits, 'misses': self.misses}
+        self.learned, self.hits, self.misses = {}, 0, 0
+        return state
+
+    def merge(self, state: Dict) -> None:
+        """drain()으로 꺼낸 양식을 메모에 넣고 적중·미적중 횟수를 더합니다."""
+        for signature, value in state['learned']:
+            self.put(signature, value)
+        self.hits += state['hits']
+        self.misses += state['misses']
+
+    def save(self) -> None:
+        """메모를 파일에 저장합니다. (path가 없으면 아무것도 하지 않음)"""
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'version': self.version, 'entries': list(self.entries.items())}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
@@ -1,34 +1,105 @@
+import argparse
 import csv
 import re
 import html
 import json
-from bs4 import BeautifulSoup
+import gzip
+import logging
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import TYPE_CHECKING, List, Dict, Tuple, Optional, Iterable, Iterator
+from table_ir import Cell, Row, Table, Section
+from table_cache import TableCache, ExtractionManifest, HeaderMemo
+from panel_store import PanelStore
+from extraction_rules import ExtractionRules
+from notes_index import NotesIndex
+from job_specs import iter_jobs, iter_shard, job_key, load_extraction_config, shard_arg, shard_path
+from stage_metrics import METRICS, export_run_metrics
+from structured_log import get_logger, job_context, logging_settings, progress, setup_logging
+from job_profiler import PROFILER
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+# HTML 파싱/표 추출(병합 전 중간 표현) 로직이 바뀌면 올려서 기존 표 캐시를 무효화
+PARSER_VERSION = "1"
+# 병합/CSV 변환을 포함한 출력이 바뀌면 올려서 증분 추출 매니페스트를 무효화
+EXTRACTOR_VERSION = f"{PARSER_VERSION}.3"
+
+log = get_logger('extractor')
+
+# CSV 각 행 앞에 붙는 메타데이터 열
+META_HEADERS = ['회사명', '년도', '보고서구분', '항목번호', '항목제목', '기간구분', '단위']
 
 class TableExtractor:
     """HTML 파일에서 표 데이터를 추출하여 CSV로 변환하는 클래스"""
     
-    def __init__(self, html_file_path: str):
+    # 별도 규칙을 주지 않으면 시작 시 한 번 컴파일한 기본 규칙(extraction_rules.json) 사용
+    default_rules = ExtractionRules.load()
+    
+    # 별도 메모를 주지 않으면 프로세스 안의 모든 추출기가 공유하는 헤더 메모
+    shared_header_memo = HeaderMemo()
+    
+    def __init__(self, html_file_path: str, cache: Optional[TableCache] = None, panel: Optional[PanelStore] = None,
+                 header_memo: Optional[HeaderMemo] = None, rules: Optional[ExtractionRules] = None,
+                 use_index: bool = False, output_dir: str = "result", output_format: str = "csv"):
         """
         Args:
             html_file_path (str): HTML 파일 경로
+            cache (TableCache, optional): 파싱 결과 캐시 (있으면 같은 파일은 다시 파싱하지 않음)
+            panel (PanelStore, optional): 추출한 값을 함께 쌓을 기간별 패널 저장소
+            header_memo (HeaderMemo, optional): 헤더 구조 메모 (없으면 공유 메모 사용)
+            rules (ExtractionRules, optional): 추출 규칙 (없으면 기본 규칙 사용)
+            use_index (bool): True면 바이트 오프셋 인덱스로 기본 정보와 개요 주석 구간만 읽어 파싱
+            output_dir (str): 공시별 CSV를 저장할 디렉토리
+            output_format (str): 공시별 출력 형식 ("csv" 또는 "csv.gz")
         """
         self.html_file_path = Path(html_file_path)
+        self.output_dir = output_dir
+        self.output_format = output_format
         self.soup = None
         self.company_info = {}
+        self.cache = cache
+        self.panel = panel
+        self.header_memo = header_memo if header_memo is not None else self.shared_header_memo
+        self.rules = rules if rules is not None else self.default_rules
+        self.use_index = use_index
+        
+    def parse_html(self, content: Optional[str] = None) -> bool:
+        """HTML 파일을 파싱합니다.
         
-    def parse_html(self) -> bool:
-        """HTML 파일을 파싱합니다."""
+        Args:
+            content (str, optional): 파일 대신 파싱할 HTML 문자열 (라이브러리 API에서 메모리의 HTML을 넘길 때)
+        """
         try:
-            with open(self.html_file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            self.soup = BeautifulSoup(content, 'html.parser')
+            with METRICS.stage('html_parse'):
+                if content is None and self.use_index:
+                    content = self.read_indexed_content()
+                if content is None:
+                    with open(self.html_file_path, 'r', encoding='utf-8') as f:
+                        content = f.read()
+                METRICS.add_bytes('html_parse', len(content.encode('utf-8')))
+                # 캐시·매니페스트로 파싱을 건너뛰는 실행에서는 bs4를 불러오지 않도록 여기서 import
+                from bs4 import BeautifulSoup
+                self.soup = BeautifulSoup(content, 'html.parser')
             return True
         except Exception as e:
-            print(f"❌ HTML 파일 파싱 실패: {e}")
+            progress(log, logging.WARNING, "❌", "HTML 파일 파싱 실패: %s", e, exc_info=True)
             return False
     
+    def read_indexed_content(self) -> Optional[str]:
+        """인덱스로 기본 정보 헤더와 개요 주석 구간만 읽습니다. (개요 제목이 없으면 None)"""
+        notes_index = NotesIndex.load_or_build(self.html_file_path)
+        position = notes_index.find_heading(self.rules.overview_headings)
+        if position is None:
+            return None
+        start, end = notes_index.note_span(position)
+        progress(log, logging.DEBUG, "⚡", "인덱스로 개요 주석 구간만 파싱: %s / %s 바이트",
+                 f"{end - start:,}", f"{notes_index.index['size']:,}")
+        return notes_index.read_header_and_note(position)
+    
     def extract_basic_info(self) -> Dict[str, str]:
         """HTML에서 기본 정보(회사명, 연도, 보고서구분)를 추출합니다."""
         try:
@@ -53,11 +124,11 @@ class TableExtractor:
                     'report_type': report_type
                 }
                 
-                print(f"✅ 기본 정보 추출 완료: {company} | {year} | {report_type}")
+                progress(log, logging.DEBUG, "✅", "기본 정보 추출 완료: %s | %s | %s", company, year, report_type)
                 return self.company_info
                 
         except Exception as e:
-            print(f"❌ 기본 정보 추출 실패: {e}")
+            progress(log, logging.WARNING, "❌", "기본 정보 추출 실패: %s", e, exc_info=True)
             
         # 기본값 설정
         self.company_info = {
@@ -67,7 +138,7 @@ class TableExtractor:
         }
         return self.company_info
     
-    def find_sections(self) -> Dict[str, BeautifulSoup]:
+    def find_sections(self) -> Dict[str, 'BeautifulSoup']:
         """1. 지배기업의 개요 섹션에서 (1)~(7) 하위 섹션들을 찾습니다."""
         sections = {}
         
@@ -76,22 +147,20 @@ class TableExtractor:
             overview_section = None
             section_title = None
             
+            overview_headings = set(self.rules.overview_headings)
             for p in self.soup.find_all('p'):
                 text = p.get_text().strip()
-                if text == "1. 지배기업의 개요":
+                if text in overview_headings:
                     overview_section = p
-                    section_title = "1. 지배기업의 개요"
-                    break
-                elif text == "1. 회사의 개요":
-                    overview_section = p
-                    section_title = "1. 회사의 개요"
+                    section_title = text
                     break
             
             if not overview_section:
-                print("❌ '1. 지배기업의 개요' 또는 '1. 회사의 개요' 섹션을 찾을 수 없습니다.")
+                progress(log, logging.DEBUG, "❌", "%s 섹션을 찾을 수 없습니다.",
+                         ' 또는 '.join(repr(heading) for heading in self.rules.overview_headings))
                 return sections
             
-            print(f"✅ '{section_title}' 섹션을 찾았습니다.")
+            progress(log, logging.DEBUG, "✅", "'%s' 섹션을 찾았습니다.", section_title)
             
             # (1)~(7) 패턴 찾기
             current_element = overview_section
@@ -119,7 +188,7 @@ class TableExtractor:
                         # 새 섹션 시작
                         current_section = f"({section_match.group(1)})"
                         section_content = [current_element]
-                        print(f"   📋 섹션 발견: {current_section} - {text[:50]}...")
+                        log.debug("섹션 발견: %s - %s", current_section, text[:50], extra={'section': current_section})
                         continue
                 
                 # 현재 섹션에 요소 추가
@@ -130,14 +199,14 @@ class TableExtractor:
             if current_section and section_content:
                 sections[current_section] = section_content
             
-            print(f"✅ 총 {len(sections)}개 섹션을 찾았습니다: {list(sections.keys())}")
+            progress(log, logging.DEBUG, "✅", "총 %d개 섹션을 찾았습니다: %s", len(sections), list(sections.keys()))
             return sections
             
         except Exception as e:
-            print(f"❌ 섹션 찾기 실패: {e}")
+            progress(log, logging.WARNING, "❌", "섹션 찾기 실패: %s", e, exc_info=True)
             return {}
     
-    def extract_table_title_and_data(self, section_name: str, section_elements: List) -> List[Dict]:
+    def extract_table_title_and_data(self, section_name: str, section_elements: List) -> List[Table]:
         """섹션 내 표들과 제목을 추출합니다."""
         tables_data = []
         
@@ -155,35 +224,8 @@ class TableExtractor:
                     # 전체 제목에서 의미있는 부분 추출
                     full_title = section_match.group(1)
                     
-                    # 각 섹션별로 적절한 제목 추출
-                    if '현황' in full_title:
-                        section_title = "종속기업의 현황"
-                    elif '재무상태' in full_title:
-                        section_title = "연결대상 종속기업의 요약재무상태"
-                    elif '경영성과' in full_title:
-                        section_title = "연결대상 종속기업의 요약경영성과"
-                    elif '현금흐름' in full_title:
-                        section_title = "연결대상 종속기업의 요약현금흐름"
-                    else:
-                        # 6번, 7번 등의 경우 실제 제목을 그대로 사용
-                        # "다음과 같습니다" 앞까지만 가져오기
-                        #if '다음과 같습니다' in full_title:
-                        #    section_title = full_title.split('다음과 같습니다')[0].strip()
-                        # 첫 번째 문장만 가져오기 (줄바꿈이나 긴 설명 제거)
-                        #el
-                        # if '\n' in full_title:
-                        #     section_title = full_title.split('\n')[0].strip()
-                        # 첫 문장이 너무 길면 적당히 자르기
-                        # elif len(full_title) > 50:
-                        #     # 마침표나 쉼표 기준으로 자르기
-                             if '.' in full_title[:50]:
-                                 section_title = full_title.split('.')[0].strip()
-                             elif ',' in full_title[:50]:
-                                 section_title = full_title.split(',')[0].strip()
-                             else:
-                                 section_title = full_title.strip()
-                        # else:
-                            # section_title = full_title.strip()
+                    # 각 섹션별로 적절한 제목 추출 (같은 제목은 메모에서 재사용)
+                    section_title = self.rules.map_section_title(full_title)
             
             for element in section_elements:
                 # 기간구분 찾기 (< > 패턴)
@@ -196,34 +238,31 @@ class TableExtractor:
                     period_match = re.search(r'<([^>]+)>', decoded_text)
                     if period_match:
                         current_period = period_match.group(1)
-                        print(f"      🏷️  기간구분 발견: {current_period}")
+                        log.debug("기간구분 발견: %s", current_period, extra={'period': current_period})
                 
                 # 표 데이터 추출
                 elif element.name == 'table':
-                    table_data = self.extract_table_content(element)
-                    if table_data:
+                    table = self.extract_table_content(element)
+                    if table:
                         # 기간구분이 없으면 "없음"
                         final_period = current_period if current_period else "없음"
                         
-                        tables_data.append({
-                            'section_title': section_title,
-                            'period': final_period,
-                            'headers': table_data['headers'],
-                            'raw_headers': table_data.get('raw_headers', table_data['headers']),
-                            'unit': table_data.get('unit', ''),
-                            'rows': table_data['rows']
-                        })
-                        print(f"      📊 표 데이터 추출 완료: {len(table_data['rows'])}행 (항목: {section_title}, 기간: {final_period})")
+                        table.section_title = section_title
+                        table.period = final_period
+                        tables_data.append(table)
+                        log.debug("표 데이터 추출 완료: %d행 (항목: %s, 기간: %s)", len(table.rows), section_title,
+                                  final_period, extra={'rows': len(table.rows), 'period': final_period})
                         
                         # 기간구분 리셋 (다음 표를 위해)
                         current_period = ""
         
         except Exception as e:
-            print(f"❌ 표 제목 및 데이터 추출 실패: {e}")
+            progress(log, logging.WARNING, "❌", "표 제목 및 데이터 추출 실패: %s", e, exc_info=True,
+                     extra={'section': section_name})
         
         return tables_data
     
-    def extract_table_content(self, table_element) -> Optional[Dict]:
+    def extract_table_content(self, table_element) -> Optional[Table]:
         """HTML 표에서 헤더와 데이터를 추출합니다."""
         try:
             headers = []
@@ -234,7 +273,7 @@ class TableExtractor:
             # 헤더 추출 (배경색이 회색인 행들)
             header_rows = table_element.find_all('tr')
             data_started = False
-            header_structure = []  # 헤더 구조 정보 저장
+            header_signature = []  # 헤더 행별 (원본 텍스트, colspan, rowspan) 튜플
             
             for tr in header_rows:
                 cells = tr.find_all(['td', 'th'])
@@ -247,12 +286,12 @@ class TableExtractor:
                     unit_match = re.search(r'\(단위:([^)]+)\)', cell_text)
                     if unit_match:
                         unit_info = unit_match.group(1)
-                        print(f"         🎯 단위 정보 발견: '{unit_info}'")
+                        log.debug("단위 정보 발견: %s", unit_info, extra={'unit': unit_info})
                         continue
                 
                 # 헤더인지 데이터인지 판별 (배경색 체크)
                 is_header = False
-                row_info = []  # 각 셀의 정보 저장
+                row_info = []  # 각 셀의 (원본 텍스트, colspan, rowspan)
                 
                 for cell in cells:
                     # 원본 텍스트 
@@ -260,60 +299,61 @@ class TableExtractor:
                     raw_cell_text = html.unescape(raw_cell_text)
                     raw_cell_text = re.sub(r'\s+', ' ', raw_cell_text).strip()
                     
-                    # 정리된 텍스트
-                    cell_text = self.clean_text(raw_cell_text)
-                    
                     # colspan, rowspan 정보
                     colspan = int(cell.get('colspan', 1))
                     rowspan = int(cell.get('rowspan', 1))
                     
                     # 배경색이 회색이면 헤더로 판단
                     style = cell.get('style', '')
-                    if 'background-color:#D7D7D7' in style or cell.name == 'th':
+                    if self.rules.is_header_cell(cell.name, style):
                         is_header = True
                     
-                    # 셀 정보 저장
-                    row_info.append({
-                        'text': cell_text,
-                        'raw_text': raw_cell_text,
-                        'colspan': colspan,
-                        'rowspan': rowspan
-                    })
+                    # 셀 정보 저장 (텍스트 정리는 데이터 행/헤더 메모 미스일 때만)
+                    row_info.append((raw_cell_text, colspan, rowspan))
                 
                 if is_header and not data_started:
-                    header_structure.append(row_info)
+                    header_signature.append(tuple(row_info))
                 elif row_info and not is_header:
                     data_started = True
                     # 데이터 행 처리
-                    row_data = [cell['text'] for cell in row_info]
-                    if len(row_data) > 1:
-                        rows.append(row_data)
+                    if len(row_info) > 1:
+                        rows.append(Row([self.clean_text(raw_text) for raw_text, _, _ in row_info]))
             
-            # 헤더 구조를 분석하여 최종 헤더 생성
-            if header_structure:
-                headers, raw_headers = self.build_final_headers(header_structure)
+            # 헤더 구조를 분석하여 최종 헤더 생성 (같은 구조는 메모에서 재사용)
+            if header_signature:
+                headers, raw_headers = self.resolve_headers(tuple(header_signature))
             
             if headers and rows:
-                return {
-                    'headers': headers,
-                    'raw_headers': raw_headers,
-                    'unit': unit_info,
-                    'rows': rows
-                }
+                # 항목제목과 기간구분은 호출하는 쪽에서 채움
+                return Table('', '', headers, raw_headers, unit_info, rows)
             
         except Exception as e:
-            print(f"❌ 표 내용 추출 실패: {e}")
+            progress(log, logging.WARNING, "❌", "표 내용 추출 실패: %s", e, exc_info=True)
         
         return None
     
-    def build_final_headers(self, header_structure):
+    def resolve_headers(self, header_signature: Tuple) -> Tuple[List[str], List[str]]:
+        """헤더 시그니처로 최종 헤더를 구합니다. (메모에 있으면 재사용)"""
+        resolved = self.header_memo.get(header_signature)
+        if resolved is None:
+            header_structure = [
+                [Cell(self.clean_text(raw_text), raw_text, colspan, rowspan) for raw_text, colspan, rowspan in header_row]
+                for header_row in header_signature
+            ]
+            headers, raw_headers = self.build_final_headers(header_structure)
+            resolved = (tuple(headers), tuple(raw_headers))
+            self.header_memo.put(header_signature, resolved)
+        # 표마다 독립된 리스트를 갖도록 복사
+        return list(resolved[0]), list(resolved[1])
+    
+    def build_final_headers(self, header_structure: List[List[Cell]]) -> Tuple[List[str], List[str]]:
         """헤더 구조를 분석하여 최종 헤더를 생성합니다."""
         if not header_structure:
             return [], []
         
         # 첫 번째 행의 구조를 기반으로 최종 컬럼 수 계산
         first_row = header_structure[0]
-        total_cols = sum(cell['colspan'] for cell in first_row)
+        total_cols = sum(cell.colspan for cell in first_row)
         
         # 최종 헤더 배열 초기화
         final_headers = [''] * total_cols
@@ -322,9 +362,9 @@ class TableExtractor:
         # 첫 번째 헤더 행 처리
         col_idx = 0
         for cell in first_row:
-            text = cell['text']
-            raw_text = cell['raw_text']
-            colspan = cell['colspan']
+            text = cell.text
+            raw_text = cell.raw_text
+            colspan = cell.colspan
             
             if colspan == 1:
                 # rowspan인 경우 해당 위치에 직접 설정
@@ -346,19 +386,19 @@ class TableExtractor:
             # 두 번째 행의 셀들을 첫 번째 행의 colspan 영역과 매핑
             second_col_idx = 0
             for i, cell in enumerate(first_row):
-                if cell['colspan'] > 1:
+                if cell.colspan > 1:
                     # colspan 영역에 두 번째 행 데이터 병합
-                    for j in range(cell['colspan']):
+                    for j in range(cell.colspan):
                         if second_col_idx < len(second_row):
-                            base_text = cell['text']
-                            sub_text = second_row[second_col_idx]['text']
+                            base_text = cell.text
+                            sub_text = second_row[second_col_idx].text
                             
                             # 최종 위치 계산
-                            final_pos = sum(prev_cell['colspan'] for prev_cell in first_row[:i]) + j
+                            final_pos = sum(prev_cell.colspan for prev_cell in first_row[:i]) + j
                             
                             if final_pos < total_cols:
                                 final_headers[final_pos] = f"{base_text}_{sub_text}"
-                                final_raw_headers[final_pos] = f"{cell['raw_text']}_{second_row[second_col_idx]['raw_text']}"
+                                final_raw_headers[final_pos] = f"{cell.raw_text}_{second_row[second_col_idx].raw_text}"
                             
                             second_col_idx += 1
         
@@ -396,179 +436,169 @@ class TableExtractor:
     
     def should_pivot_table(self, section_name: str, section_title: str) -> bool:
         """표를 피벗해야 하는지 판단합니다."""
-        # 7번 항목이고 특정 키워드가 있으면 피벗 (단, 병합 전에만)
-        if section_name.strip('()') == '7' and ('비지배지분과의 거래' in section_title or '자본에 미치는 영향' in section_title):
-            return True
-        return False
+        # 규칙 파일의 피벗 대상 항목이고 제목에 키워드가 있으면 피벗 (단, 병합 전에만)
+        return self.rules.should_pivot(section_name.strip('()'), section_title)
+    
+    def needs_pivot(self, section_name: str, tables_data: List[Table]) -> bool:
+        """섹션의 표 목록이 아직 피벗되지 않은 피벗 대상인지 확인합니다."""
+        return bool(tables_data) and self.should_pivot_table(section_name, tables_data[0].section_title)
     
-    def should_merge_performance_tables(self, all_sections: Dict[str, List]) -> bool:
+    def item_number_for(self, section_num: str, section_title: str) -> str:
+        """CSV에 기록할 항목번호를 반환합니다. (4,5,7번 통합 표는 병합 결과 항목번호)"""
+        if section_title == self.rules.performance_title:
+            return self.rules.performance_output_section
+        return section_num
+    
+    def should_merge_performance_tables(self, all_sections: Dict[str, List[Table]]) -> bool:
         """4,5,7번 성과 관련 표들을 병합해야 하는지 판단합니다."""
-        target_sections = {'4', '5', '7'}
-        found_sections = set(all_sections.keys())
-        return target_sections.issubset(found_sections)
+        target_sections = set(self.rules.performance_sections)
+        return bool(target_sections) and target_sections.issubset(all_sections.keys())
     
-    def should_merge_equity_tables(self, all_sections: Dict[str, List]) -> bool:
+    def should_merge_equity_tables(self, all_sections: Dict[str, List[Table]]) -> bool:
         """6번 비지배지분 표들을 병합해야 하는지 판단합니다."""
-        return '6' in all_sections and len(all_sections['6']) > 1
+        section = self.rules.equity_section
+        return section in all_sections and len(all_sections[section]) >= self.rules.equity_min_tables
+    
+    @staticmethod
+    def row_key(values: List[str]) -> str:
+        """행의 조인 키(첫 번째 컬럼, 보통 종속기업명/구분)를 반환합니다."""
+        return re.sub(r'\s+', '', values[0]) if values else ''
     
-    def merge_equity_tables(self, section_6_data: List[Dict]) -> List[Dict]:
-        """6번 항목의 표들을 병합합니다."""
+    @staticmethod
+    def union_columns(header_lists: Iterable[List[str]], merged_headers: List[str]) -> List[List[int]]:
+        """여러 표의 헤더를 이름 기준으로 merged_headers 뒤에 합치고, 표별 각 컬럼의 병합 위치를 반환합니다.
+        
+        같은 표 안의 중복 컬럼명은 등장 순서로 구분합니다. (예: 구분, 금액, 금액 → 두 번째 '금액'은 별도 컬럼)
+        """
+        column_index = {}  # (컬럼명, 표 안에서 몇 번째 등장인지) → 병합 위치
+        table_positions = []
+        for headers in header_lists:
+            seen = {}
+            positions = []
+            for header in headers:
+                occurrence = seen.get(header, 0)
+                seen[header] = occurrence + 1
+                column = (header, occurrence)
+                if column not in column_index:
+                    column_index[column] = len(merged_headers)
+                    merged_headers.append(header)
+                positions.append(column_index[column])
+            table_positions.append(positions)
+        return table_positions
+    
+    def merge_equity_tables(self, section_6_data: List[Table]) -> List[Table]:
+        """6번 항목의 표들을 (기간구분, 종속기업) 기준으로 병합합니다.
+        
+        모든 표의 컬럼을 이름 기준으로 합친 뒤, 각 표의 모든 행을 같은 컬럼 배치로 옮깁니다.
+        예) [구분, 기초, 기타변동, 연결범위의 변동, 반기말] + [구분, 기초, 기타변동, 전기말]
+            → [구분, 기초, 기타변동, 연결범위의 변동, 반기말, 전기말]
+        """
         if len(section_6_data) < 2:
             return section_6_data
         
-        # 두 표를 기간별로 분석
-        table_1 = section_6_data[0]  # 당반기말 및 당반기
-        table_2 = section_6_data[1]  # 전기말 및 전기
-        
-        # 공통 헤더 찾기 (기타변동까지)
-        headers_1 = table_1['headers']
-        headers_2 = table_2['headers']
-        
-        # 공통 부분 찾기
-        common_headers = []
-        diff_headers_1 = []
-        diff_headers_2 = []
-        
-        # 기타변동까지 공통으로 가정
-        common_count = 0
-        for i, (h1, h2) in enumerate(zip(headers_1, headers_2)):
-            if h1 == h2:
-                common_headers.append(h1)
-                common_count = i + 1
-            else:
-                break
-        
-        # 차이나는 부분
-        diff_headers_1 = headers_1[common_count:]  # 연결범위의 변동, 반기말 비지배지분
-        diff_headers_2 = headers_2[common_count:]  # 전기말 비지배지분
-        
-        # 통합된 헤더 생성: 공통 + 모든 고유 헤더들 
-        merged_headers = common_headers + diff_headers_1 + diff_headers_2
-        
-        # 데이터 행들 생성
-        row_1 = table_1['rows'][0] if table_1['rows'] else []
-        row_2 = table_2['rows'][0] if table_2['rows'] else []
-        
-        # 첫 번째 행: 당반기 데이터 (전기말 비지배지분은 빈값)
-        merged_row_1 = row_1[:common_count] + row_1[common_count:] + [''] * len(diff_headers_2)
-        
-        # 두 번째 행: 전기 데이터 (연결범위의 변동, 반기말 비지배지분은 빈값)
-        merged_row_2 = row_2[:common_count] + [''] * len(diff_headers_1) + row_2[common_count:]
-        
-        # 병합된 표 데이터 생성 - 각 행의 원래 기간구분 유지
-        merged_table = {
-            'section_title': '당반기말 및 전기말의 연결대상 종속기업에 대한 비지배지분의 몫',
-            'period': None,  # 행별로 다른 기간이므로 None으로 설정
-            'headers': merged_headers,
-            'raw_headers': merged_headers, 
-            'unit': table_1.get('unit', ''),
-            'rows': [
-                {'data': merged_row_1, 'period': table_1['period']},  # 원래 기간구분 유지
-                {'data': merged_row_2, 'period': table_2['period']}   # 원래 기간구분 유지
-            ]
-        }
+        # 컬럼 합집합
+        merged_headers = []
+        table_positions = self.union_columns((table.headers for table in section_6_data), merged_headers)
+        
+        # (기간구분, 종속기업) 해시 조인 - 각 행의 원래 기간구분 유지
+        width = len(merged_headers)
+        joined = {}
+        for table, positions in zip(section_6_data, table_positions):
+            for row in table.rows:
+                period = table.period if row.period is None else row.period
+                merged_row = joined.get((period, self.row_key(row.values)))
+                if merged_row is None:
+                    merged_row = Row([''] * width, period)
+                    joined[(period, self.row_key(row.values))] = merged_row
+                for position, value in zip(positions, row.values):
+                    if value or not merged_row.values[position]:
+                        merged_row.values[position] = value
+        
+        merged_table = Table(
+            section_title=self.rules.equity_title,
+            period=None,  # 행별로 다른 기간이므로 None으로 설정
+            headers=merged_headers,
+            raw_headers=merged_headers,
+            unit=section_6_data[0].unit,
+            rows=list(joined.values())
+        )
         
         return [merged_table]
     
-    def merge_performance_tables(self, section_4_data: List[Dict], section_5_data: List[Dict], section_7_data: List[Dict]) -> List[Dict]:
-        """4,5,7번 항목의 표들을 기간구분별로 병합합니다."""
-        merged_tables = {}
-        
-        # 모든 표 데이터를 기간구분별로 그룹화
-        all_tables = []
-        
-        # 4번 데이터 추가
-        for table in section_4_data:
-            table['source_section'] = '4'
-            all_tables.append(table)
-        
-        # 5번 데이터 추가
-        for table in section_5_data:
-            table['source_section'] = '5'
-            all_tables.append(table)
-        
-        # 7번 데이터 추가 (이미 피벗됨)
-        for table in section_7_data:
-            table['source_section'] = '7'
-            all_tables.append(table)
-        
-        # 기간구분별로 그룹화
-        period_groups = {}
-        for table in all_tables:
-            period = table['period']
-            if period not in period_groups:
-                period_groups[period] = []
-            period_groups[period].append(table)
-        
-        # 각 기간별로 병합
-        merged_result = []
-        for period, tables in period_groups.items():
-            # 병합된 헤더와 데이터 생성
-            merged_headers = []
-            merged_values = []
-            base_table = tables[0]
-            
-            # 7번 항목의 헤더를 미리 수집 (모든 기간에 동일하게 적용하기 위해)
-            section_7_headers = []
-            for table in tables:
-                if table.get('source_section') == '7':
-                    section_7_headers = table['headers']
-                    break
-            
-            # 7번 헤더가 없으면 전체 테이블에서 찾기
-            if not section_7_headers:
-                for period_tables in period_groups.values():
-                    for table in period_tables:
-                        if table.get('source_section') == '7':
-                            section_7_headers = table['headers']
-                            break
-                    if section_7_headers:
-                        break
-            
-            first_section_processed = False
+    def merge_performance_tables(self, *sections_data: List[Table]) -> List[Table]:
+        """4,5,7번 항목의 표들을 (기간구분, 종속기업) 기준으로 한 번에 조인합니다.
+        
+        Args:
+            sections_data: 규칙 파일 merge_performance.sections 순서(기본 4,5,7번)의 표 목록들
+        
+        항목별 컬럼은 그 항목의 모든 표(모든 기간) 헤더의 합집합이므로,
+        기간마다 컬럼이 달라도(예: 전반기에만 있는 총포괄손익) 값이 잘리지 않습니다.
+        4,5번은 첫 번째 컬럼(종속기업명/구분)을 키로 모든 행을 조인하고,
+        피벗된 7번은 종속기업 구분이 없으므로 기간마다 키가 빈 행 하나로 기록합니다.
+        결과는 기간별 표 하나, 종속기업별 행 하나(+ 7번 행)입니다.
+        
+        3번(요약재무상태)은 기간구분이 시점(당반기말·전기말)이라 4,5번의 기간(당반기·전반기)과 겹치지 않고,
+        전기말과 전반기는 서로 다른 날짜라 억지로 짝지을 수도 없으므로 조인하지 않고 따로 기록합니다.
+        """
+        sources = list(zip(self.rules.performance_sections, sections_data))
+        keyless_sources = self.rules.pivot_sections
+        
+        # 1. 컬럼 배치: 키 컬럼 + 4번 값 컬럼 합집합 + 5번 값 컬럼 합집합 + 7번 컬럼 합집합
+        key_header = next((tables[0].headers[0] for source, tables in sources
+                           if source not in keyless_sources and tables and tables[0].headers), '구분')
+        merged_headers = [key_header]
+        placements = []  # (항목번호, 표, 표의 값 컬럼별 병합 위치)
+        for source, tables in sources:
             for table in tables:
-                if table.get('source_section') == '7':
-                    # 7번 데이터가 있는 기간
-                    merged_headers.extend(table['headers'])
-                    if table['rows']:
-                        merged_values.extend(table['rows'][0])
-                    else:
-                        merged_values.extend([''] * len(table['headers']))
+                table.source_section = source
+            # 키가 있는 표는 첫 번째 컬럼(키)을 빼고 합침
+            skip = 0 if source in keyless_sources else 1
+            positions = self.union_columns((table.headers[skip:] for table in tables), merged_headers)
+            placements.extend((source, table, table_positions) for table, table_positions in zip(tables, positions))
+        width = len(merged_headers)
+        
+        # 2. 해시 조인: (기간구분, 키) → 병합 행
+        period_rows = {}  # 기간구분 → {키: 값 목록} (등장 순서 유지)
+        period_units = {}
+        period_extras = {}  # 기간구분 → 키 없는(피벗된) 표의 값을 모은 행
+        for source, table, positions in placements:
+            rows_by_key = period_rows.setdefault(table.period, {})
+            period_units.setdefault(table.period, table.unit)
+            for row in table.rows:
+                if source in keyless_sources:
+                    merged_values = period_extras.setdefault(table.period, [''] * width)
+                    values = row.values
                 else:
-                    # 4,5번 일반 처리 - 첫 번째 섹션 이후로는 구분 컬럼 제거
-                    headers_to_add = table['headers']
-                    values_to_add = table['rows'][0] if table['rows'] else [''] * len(table['headers'])
-                    
-                    if first_section_processed:
-                        # 두 번째 섹션부터는 첫 번째 컬럼(구분) 제거
-                        if headers_to_add and headers_to_add[0] == '구분':
-                            headers_to_add = headers_to_add[1:]
-                            values_to_add = values_to_add[1:] if values_to_add else []
-                    
-                    merged_headers.extend(headers_to_add)
-                    merged_values.extend(values_to_add)
-                    first_section_processed = True
-            
-            # 7번 헤더가 아직 추가되지 않았으면 빈 값으로 추가 (전반기 등)
-            if section_7_headers and not any(table.get('source_section') == '7' for table in tables):
-                merged_headers.extend(section_7_headers)
-                merged_values.extend([''] * len(section_7_headers))
-            
-            # 병합된 표 데이터 생성
-            merged_table = {
-                'section_title': '연결대상 종속기업의 종합 경영성과',  # 통합 제목
-                'period': period,
-                'headers': merged_headers,
-                'raw_headers': merged_headers,
-                'unit': base_table.get('unit', ''),
-                'rows': [merged_values] if merged_values else []
-            }
-            
-            merged_result.append(merged_table)
+                    key = self.row_key(row.values)
+                    merged_values = rows_by_key.get(key)
+                    if merged_values is None:
+                        merged_values = [''] * width
+                        merged_values[0] = row.values[0] if row.values else ''
+                        rows_by_key[key] = merged_values
+                    values = row.values[1:]
+                for position, value in zip(positions, values):
+                    if value or not merged_values[position]:
+                        merged_values[position] = value
+        
+        # 3. 기간별 통합 표 생성 (7번 값은 종속기업 행마다 복사하지 않고 기간마다 한 번만)
+        merged_result = []
+        for period, rows_by_key in period_rows.items():
+            merged_rows = list(rows_by_key.values())
+            if period in period_extras:
+                merged_rows.append(period_extras[period])
+            
+            merged_result.append(Table(
+                section_title=self.rules.performance_title,  # 통합 제목
+                period=period,
+                headers=merged_headers,
+                raw_headers=merged_headers,
+                unit=period_units.get(period, ''),
+                rows=[Row(values) for values in merged_rows]
+            ))
         
         return merged_result
     
-    def pivot_table_data(self, tables_data: List[Dict]) -> List[Dict]:
+    def pivot_table_data(self, tables_data: List[Table]) -> List[Table]:
         """세로 형태의 표를 가로로 피벗합니다."""
         if not tables_data:
             return tables_data
@@ -576,7 +606,7 @@ class TableExtractor:
         # 모든 표에서 데이터 수집
         all_rows = []
         for table in tables_data:
-            all_rows.extend(table['rows'])
+            all_rows.extend(row.values for row in table.rows)
         
         if not all_rows:
             return tables_data
@@ -601,31 +631,33 @@ class TableExtractor:
         pivot_row = pivot_values
         
         # 새로운 표 데이터 구조 생성
-        pivoted_table = {
-            'section_title': base_table['section_title'],
-            'period': '당반기',  # 기간구분을 당반기로 설정
-            'headers': pivot_headers,
-            'raw_headers': pivot_headers,  # 같은 값 사용
-            'unit': base_table['unit'],
-            'rows': [pivot_row]
-        }
+        pivoted_table = Table(
+            section_title=base_table.section_title,
+            period='당반기',  # 기간구분을 당반기로 설정
+            headers=pivot_headers,
+            raw_headers=pivot_headers,  # 같은 값 사용
+            unit=base_table.unit,
+            rows=[Row(pivot_row)]
+        )
         
         return [pivoted_table]
 
-    def convert_to_csv_format(self, section_name: str, tables_data: List[Dict]) -> List[List[str]]:
+    def convert_to_csv_format(self, section_name: str, tables_data: List[Table]) -> List[List[str]]:
         """표 데이터를 CSV 형식으로 변환합니다."""
-        csv_rows = []
-        
+        return list(self.iter_csv_rows(section_name, tables_data))
+    
+    def iter_csv_rows(self, section_name: str, tables_data: List[Table]) -> Iterator[List[str]]:
+        """표 데이터를 CSV 행 단위로 하나씩 생성합니다."""
         try:
             # 피벗이 필요한지 확인
-            if tables_data and self.should_pivot_table(section_name, tables_data[0]['section_title']):
+            if self.needs_pivot(section_name, tables_data):
                 tables_data = self.pivot_table_data(tables_data)
             
             # 같은 항목의 표들을 그룹화
             grouped_tables = {}
             
             for table in tables_data:
-                section_title = table['section_title']
+                section_title = table.section_title
                 
                 # 항목번호에서 괄호 제거: (1) → 1
                 item_number = section_name.strip('()')
@@ -640,112 +672,103 @@ class TableExtractor:
             # 각 그룹별로 처리
             for group_key, tables in grouped_tables.items():
                 # 그룹 내 모든 표의 헤더가 동일한지 확인
-                first_headers = None
-                headers_identical = True
-                
-                for table in tables:
-                    current_headers = table['headers']
-                    if first_headers is None:
-                        first_headers = current_headers
-                    elif first_headers != current_headers:
-                        headers_identical = False
-                        break
+                first_headers = tables[0].headers
+                headers_identical = all(table.headers == first_headers for table in tables)
                 
-                print(f"      🔍 그룹 {group_key}: 헤더 동일 여부 = {headers_identical}")
+                log.debug("그룹 %s: 헤더 동일 여부 = %s", group_key, headers_identical)
                 
                 header_written = False
                 
                 for table in tables:
-                    section_title = table['section_title']
-                    period = table['period']
-                    headers = table['headers']
-                    raw_headers = table.get('raw_headers', headers)
-                    rows = table['rows']
-                    
-                    # 메타데이터를 별도 컬럼들로 분리
-                    company = self.company_info['company']
-                    year = self.company_info['year']
-                    report_type = self.company_info['report_type']
-                    
-                    # 항목번호에서 괄호 제거: (1) → 1
-                    item_number = section_name.strip('()')
-                    
-                    # 병합된 4,5,7번 데이터는 모두 4번으로 통일
-                    if section_title == '연결대상 종속기업의 종합 경영성과':
-                        item_number = '4'
-                    
-                    # 단위 정보 사용 (표에서 직접 추출된 것)
-                    unit = table.get('unit', '')
-                    
                     # 헤더 행 추가 조건:
                     # 1) 헤더가 모두 동일한 경우: 첫 번째 표에서만 헤더 출력
                     # 2) 헤더가 다른 경우: 각 표마다 헤더 출력
-                    should_write_header = False
-                    if headers_identical:
-                        # 헤더가 동일한 경우: 첫 번째만
-                        should_write_header = not header_written
-                    else:
-                        # 헤더가 다른 경우: 항상
-                        should_write_header = True
+                    should_write_header = not header_written if headers_identical else True
                     
-                    if should_write_header and headers:
-                        header_row = ['회사명', '년도', '보고서구분', '항목번호', '항목제목', '기간구분', '단위'] + headers
-                        csv_rows.append(header_row)
+                    if should_write_header and table.headers:
+                        yield META_HEADERS + table.headers
                         header_written = True
                     
                     # 데이터 행들 추가
-                    for row in rows:
-                        # 6번 병합된 데이터의 경우 각 행별 기간구분 처리
-                        if isinstance(row, dict) and 'data' in row and 'period' in row:
-                            # 6번 병합된 데이터
-                            row_data = row['data']
-                            row_period = row['period']
-                            
-                            # 헤더 개수에 맞춰 행 데이터 조정
-                            adjusted_row = row_data[:len(headers)] if headers else row_data
-                            while len(adjusted_row) < len(headers):
-                                adjusted_row.append("")
-                            
-                            data_row = [company, year, report_type, item_number, section_title, row_period, unit] + adjusted_row
-                            csv_rows.append(data_row)
-                        else:
-                            # 일반 데이터
-                            # 헤더 개수에 맞춰 행 데이터 조정
-                            adjusted_row = row[:len(headers)] if headers else row
-                            while len(adjusted_row) < len(headers):
-                                adjusted_row.append("")
-                            
-                            data_row = [company, year, report_type, item_number, section_title, period, unit] + adjusted_row
-                            csv_rows.append(data_row)
+                    yield from self.iter_table_rows(section_name, table)
         
         except Exception as e:
-            print(f"❌ CSV 형식 변환 실패: {e}")
-        
-        return csv_rows
+            progress(log, logging.WARNING, "❌", "CSV 형식 변환 실패: %s", e, exc_info=True,
+                     extra={'section': section_name})
     
-    def save_to_csv(self, csv_data: List[List[str]], output_filename: str) -> bool:
+    def iter_table_rows(self, section_name: str, table: Table) -> Iterator[List[str]]:
+        """표 하나의 데이터 행을 메타데이터 열(META_HEADERS)과 헤더 개수에 맞춘 값으로 하나씩 생성합니다."""
+        # 메타데이터를 별도 컬럼들로 분리
+        company = self.company_info['company']
+        year = self.company_info['year']
+        report_type = self.company_info['report_type']
+        
+        section_title = table.section_title
+        period = table.period
+        headers = table.headers
+        header_count = len(headers)
+        
+        # 항목번호에서 괄호 제거: (1) → 1, 병합된 4,5,7번 데이터는 모두 4번으로 통일
+        item_number = self.item_number_for(section_name.strip('()'), section_title)
+        
+        # 단위 정보 사용 (표에서 직접 추출된 것)
+        unit = table.unit
+        
+        for row in table.rows:
+            # 6번 병합된 데이터처럼 행별 기간구분이 있으면 우선 사용
+            row_period = period if row.period is None else row.period
+            values = row.values
+            
+            # 헤더 개수에 맞춰 행 데이터 조정 (부족한 칸은 한 번에 채움)
+            if headers:
+                values = values[:header_count]
+                if len(values) < header_count:
+                    values = values + [''] * (header_count - len(values))
+            
+            yield [company, year, report_type, item_number, section_title, row_period, unit] + values
+    
+    def save_to_csv(self, csv_data: Iterable[List[str]], output_filename: str) -> bool:
         """CSV 파일로 저장합니다."""
         try:
-            output_path = Path(output_filename)
-            output_path.parent.mkdir(exist_ok=True)
+            with CsvStreamWriter(output_filename) as writer:
+                writer.write_rows(csv_data)
             
-            # UTF-8 BOM을 추가하여 Excel에서도 한글이 제대로 표시되도록 함
-            with open(output_path, 'w', newline='', encoding='utf-8-sig') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerows(csv_data)
-            
-            print(f"✅ CSV 파일 저장 완료: {output_path}")
-            print(f"   📊 총 {len(csv_data)}행 저장됨")
+            progress(log, logging.INFO, "✅", "CSV 파일 저장 완료: %s (총 %d행)", writer.output_path, writer.row_count)
             return True
             
         except Exception as e:
-            print(f"❌ CSV 파일 저장 실패: {e}")
+            progress(log, logging.WARNING, "❌", "CSV 파일 저장 실패: %s", e, exc_info=True)
             return False
     
-    def extract_all_tables(self) -> bool:
-        """모든 표를 추출하여 CSV로 저장합니다."""
-        print("🚀 HTML 표 데이터 추출 시작")
-        print("=" * 50)
+    def get_output_filename(self) -> str:
+        """기본 정보를 바탕으로 CSV 출력 파일 경로를 생성합니다."""
+        company = self.company_info['company']
+        year = self.company_info['year']
+        report_type = self.company_info['report_type']
+        return f"{self.output_dir}/{company}_{year}_{report_type}_표데이터.{self.output_format}"
+    
+    def extract_all_tables(self, writer: Optional['CsvStreamWriter'] = None) -> bool:
+        """모든 표를 추출하여 CSV로 저장합니다.
+        
+        Args:
+            writer (CsvStreamWriter, optional): 여러 공시를 하나의 CSV(.gz)로 이어 쓰는 경우 전달.
+                없으면 공시별 CSV 파일을 새로 만듭니다.
+        """
+        progress(log, logging.DEBUG, "🚀", "HTML 표 데이터 추출 시작: %s", self.html_file_path)
+        
+        # 0. 캐시 확인 (같은 파일 + 같은 추출기 버전이면 파싱 생략)
+        cache_key = None
+        if self.cache:
+            try:
+                cache_key = self.cache.key_for(self.html_file_path)
+            except Exception as e:
+                progress(log, logging.WARNING, "❌", "HTML 파일을 읽을 수 없습니다: %s", e)
+                return False
+            cached = self.cache.load(cache_key)
+            if cached:
+                progress(log, logging.DEBUG, "⚡", "캐시된 표 데이터 사용: %s...", cache_key[:12])
+                self.company_info = cached['company_info']
+                return self.write_sections(cached['sections'], writer)
         
         # 1. HTML 파싱
         if not self.parse_html():
@@ -755,100 +778,330 @@ class TableExtractor:
         self.extract_basic_info()
         
         # 3. 섹션 찾기
-        sections = self.find_sections()
+        with METRICS.stage('section_find'):
+            sections = self.find_sections()
         if not sections:
-            print("❌ 추출할 섹션을 찾을 수 없습니다.")
+            progress(log, logging.WARNING, "❌", "추출할 섹션을 찾을 수 없습니다.")
             return False
         
-        # 4. 각 섹션별로 표 추출
-        all_csv_data = []
-        all_sections_data = {}  # 모든 섹션 데이터 저장
+        if not cache_key:
+            return self.write_sections(self.iter_sections(sections), writer)
+        
+        # 스트리밍 기록은 그대로 두고, 지나가는 섹션만 모아서 캐시에 저장
+        extracted_sections = []
+        def collect():
+            for section in self.iter_sections(sections):
+                extracted_sections.append(section)
+                yield section
+        
+        success = self.write_sections(collect(), writer)
+        try:
+            self.cache.save(cache_key, self.company_info, extracted_sections)
+        except Exception as e:
+            progress(log, logging.WARNING, "⚠️", "표 캐시 저장 실패: %s", e)
+        return success
+    
+    def extract_sections(self, content: Optional[str] = None) -> Optional[List[Section]]:
+        """파싱부터 섹션별 표 추출까지만 하고 섹션 목록을 반환합니다. (CSV 기록 없음, 병렬 추출·라이브러리 API용)
+        
+        Args:
+            content (str, optional): 파일 대신 파싱할 HTML 문자열 (캐시는 파일 기준이므로 쓰지 않음)
+        """
+        cache_key = None
+        if self.cache and content is None:
+            try:
+                cache_key = self.cache.key_for(self.html_file_path)
+            except Exception as e:
+                progress(log, logging.WARNING, "❌", "HTML 파일을 읽을 수 없습니다: %s", e)
+                return None
+            cached = self.cache.load(cache_key)
+            if cached:
+                progress(log, logging.DEBUG, "⚡", "캐시된 표 데이터 사용: %s...", cache_key[:12])
+                self.company_info = cached['company_info']
+                return cached['sections']
+        
+        if not self.parse_html(content):
+            return None
+        self.extract_basic_info()
+        with METRICS.stage('section_find'):
+            sections = self.find_sections()
+        if not sections:
+            progress(log, logging.WARNING, "❌", "추출할 섹션을 찾을 수 없습니다.")
+            return None
         
+        extracted_sections = list(self.iter_sections(sections))
+        if cache_key:
+            try:
+                self.cache.save(cache_key, self.company_info, extracted_sections)
+            except Exception as e:
+                progress(log, logging.WARNING, "⚠️", "표 캐시 저장 실패: %s", e)
+        return extracted_sections
+    
+    def iter_sections(self, sections: Dict[str, List]) -> Iterator[Section]:
+        """찾은 섹션마다 표를 추출하여 표가 있는 섹션을 하나씩 생성합니다."""
         for section_name, section_elements in sections.items():
-            print(f"\n📋 {section_name} 섹션 처리 중...")
+            log.debug("%s 섹션 처리 중", section_name, extra={'section': section_name})
             
-            tables_data = self.extract_table_title_and_data(section_name, section_elements)
-            if tables_data:
-                all_sections_data[section_name.strip('()')] = tables_data
-                print(f"   ✅ {len(tables_data)}개 표 추출 완료")
-            else:
-                print(f"   ❌ {section_name}에서 표를 찾을 수 없습니다.")
+            with METRICS.stage('table_extract'):
+                tables_data = self.extract_table_title_and_data(section_name, section_elements)
+            if not tables_data:
+                log.debug("%s에서 표를 찾을 수 없습니다.", section_name, extra={'section': section_name})
+                continue
+            
+            log.debug("%s: %d개 표 추출 완료", section_name, len(tables_data),
+                      extra={'section': section_name, 'tables': len(tables_data)})
+            METRICS.count('tables_extracted', len(tables_data))
+            yield Section(section_name.strip('()'), tables_data)
+    
+    def write_sections(self, sections: Iterable[Section], writer: Optional['CsvStreamWriter'] = None) -> bool:
+        """섹션별 표를 병합 규칙에 따라 CSV로 기록합니다."""
+        own_writer = writer is None
+        if own_writer:
+            writer = CsvStreamWriter(self.get_output_filename())
+        start_count = writer.row_count
         
+        try:
+            for section_num, tables_data in self.iter_merged_sections(sections):
+                self.write_section(writer, section_num, tables_data)
+        finally:
+            if own_writer:
+                writer.close()
+        
+        written = writer.row_count - start_count
+        if written:
+            progress(log, logging.INFO, "✅", "CSV 파일 저장 완료: %s (총 %d행)", writer.output_path, written)
+            return True
+        else:
+            progress(log, logging.WARNING, "❌", "추출된 표 데이터가 없습니다.")
+            return False
+    
+    def iter_merged_sections(self, sections: Iterable[Section]) -> Iterator[Tuple[str, List[Table]]]:
+        """섹션별 표에 병합 규칙을 적용해 (항목번호, 표 목록)을 출력 순서대로 하나씩 생성합니다."""
+        # 4. 섹션별 표 → 병합 대상이 아니면 바로 내보냄
+        pending_sections = {}  # 4,5,7번 병합 여부가 결정될 때까지 보류된 섹션들
+        
+        for section in sections:
+            # 병합 대상 섹션이 나오면 이후 섹션은 출력 순서 유지를 위해 함께 보류
+            if pending_sections or section.number in self.rules.performance_sections:
+                pending_sections[section.number] = section.tables
+            else:
+                with METRICS.stage('merge'):
+                    merged_sections = self.merge_sections({section.number: section.tables})
+                yield from merged_sections.items()
+        
+        # 5. 보류된 섹션들 병합 후 내보냄
+        with METRICS.stage('merge'):
+            merged_sections = self.merge_sections(pending_sections)
+        yield from merged_sections.items()
+    
+    def merge_sections(self, all_sections_data: Dict[str, List[Table]]) -> Dict[str, List[Table]]:
+        """4,5,7번 및 6번 병합 규칙을 적용합니다."""
         # 4,5,7번 병합 처리
         if self.should_merge_performance_tables(all_sections_data):
-            print(f"\n🔄 4,5,7번 항목 병합 처리 중...")
+            progress(log, logging.DEBUG, "\n🔄", "4,5,7번 항목 병합 처리 중...")
+            
+            performance_sections = self.rules.performance_sections
             
             # 7번 먼저 피벗 처리
-            if '7' in all_sections_data:
-                section_7_name = '(7)'
-                if self.should_pivot_table(section_7_name, all_sections_data['7'][0]['section_title']):
-                    all_sections_data['7'] = self.pivot_table_data(all_sections_data['7'])
+            for section_num in performance_sections:
+                if self.needs_pivot(f"({section_num})", all_sections_data[section_num]):
+                    all_sections_data[section_num] = self.pivot_table_data(all_sections_data[section_num])
             
             # 4,5,7번 병합
             merged_tables = self.merge_performance_tables(
-                all_sections_data.get('4', []),
-                all_sections_data.get('5', []),
-                all_sections_data.get('7', [])
+                *[all_sections_data.get(section_num, []) for section_num in performance_sections]
             )
             
             # 병합된 데이터를 4번으로 추가하고 5,7번은 제거
-            all_sections_data['4'] = merged_tables
-            all_sections_data.pop('5', None)
-            all_sections_data.pop('7', None)
+            output_section = self.rules.performance_output_section
+            all_sections_data[output_section] = merged_tables
+            for section_num in performance_sections:
+                if section_num != output_section:
+                    all_sections_data.pop(section_num, None)
             
-            print(f"   ✅ 병합 완료: {len(merged_tables)}개 통합 표 생성")
+            progress(log, logging.DEBUG, "   ✅", "병합 완료: %d개 통합 표 생성", len(merged_tables))
         
         # 6번 비지배지분 병합 처리
         if self.should_merge_equity_tables(all_sections_data):
-            print(f"\n🔄 6번 항목 병합 처리 중...")
+            progress(log, logging.DEBUG, "\n🔄", "6번 항목 병합 처리 중...")
             
-            merged_equity_tables = self.merge_equity_tables(all_sections_data['6'])
-            all_sections_data['6'] = merged_equity_tables
-            
-            print(f"   ✅ 6번 병합 완료: {len(merged_equity_tables)}개 통합 표 생성")
-        
-        # CSV 변환
-        for section_num, tables_data in all_sections_data.items():
-            section_name = f"({section_num})"
+            equity_section = self.rules.equity_section
+            merged_equity_tables = self.merge_equity_tables(all_sections_data[equity_section])
+            all_sections_data[equity_section] = merged_equity_tables
             
-            # 7번이 이미 병합되었으면 피벗 건너뛰기
-            if section_num != '7':  # 7번은 이미 병합되었거나 제거됨
-                csv_data = self.convert_to_csv_format(section_name, tables_data)
-                all_csv_data.extend(csv_data)
-                print(f"   📄 {section_name} → {len(csv_data)}행 CSV 변환")
+            progress(log, logging.DEBUG, "   ✅", "6번 병합 완료: %d개 통합 표 생성", len(merged_equity_tables))
         
-        # 5. CSV 파일 저장
-        if all_csv_data:
-            company = self.company_info['company']
-            year = self.company_info['year']
-            report_type = self.company_info['report_type']
-            
-            output_filename = f"result/{company}_{year}_{report_type}_표데이터.csv"
-            return self.save_to_csv(all_csv_data, output_filename)
+        return all_sections_data
+    
+    def write_section(self, writer: 'CsvStreamWriter', section_num: str, tables_data: List[Table]) -> int:
+        """한 섹션의 표들을 CSV 행으로 변환하여 바로 기록합니다."""
+        section_name = f"({section_num})"
+        with METRICS.stage('csv_write'):
+            written = writer.write_rows(self.iter_csv_rows(section_name, tables_data))
+        METRICS.count('csv_rows', written)
+        log.debug("%s → %d행 CSV 변환", section_name, written, extra={'section': section_name, 'rows': written})
+        
+        if self.panel:
+            # 병합된 4,5,7번은 4번으로 통일 (CSV와 동일)
+            item_number = self.item_number_for(section_num, tables_data[0].section_title) if tables_data else section_num
+            # 병합 규칙이 종속기업으로 조인하는 항목만 첫 번째 컬럼을 행 키로 쓰고, 나머지는 행 순서로 구분
+            pivot = self.needs_pivot(section_name, tables_data)
+            keyed = not pivot and section_num in self.rules.keyed_sections
+            with METRICS.stage('panel_write'):
+                panel_count = self.panel.add_tables(self.company_info, item_number,
+                                                    self.pivot_table_data(tables_data) if pivot else tables_data,
+                                                    keyed=keyed)
+            log.debug("%s → 패널 %d개 값 갱신", section_name, panel_count,
+                      extra={'section': section_name, 'values': panel_count})
+        return written
+
+class CsvStreamWriter:
+    """CSV 행을 받는 즉시 파일에 기록하는 클래스 (.gz 확장자면 gzip 압축)"""
+    
+    def __init__(self, output_path: str, append: bool = False, encoding: str = 'utf-8-sig'):
+        """
+        Args:
+            output_path (str): 출력 파일 경로 (.csv 또는 .csv.gz)
+            append (bool): 기존 파일 뒤에 이어 쓸지 여부 (여러 공시를 하나로 합칠 때 사용)
+            encoding (str): 파일 인코딩 (gzip은 BOM 없이 utf-8로 기록)
+        """
+        self.output_path = Path(output_path)
+        self.append = append
+        self.encoding = encoding
+        self.row_count = 0
+        self._file = None
+        self._writer = None
+    
+    def _open(self):
+        """첫 행이 기록될 때 파일을 엽니다. (빈 결과면 파일을 만들지 않음)"""
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        mode = 'a' if self.append else 'w'
+        if self.output_path.suffix == '.gz':
+            encoding = 'utf-8' if self.encoding == 'utf-8-sig' else self.encoding
+            self._file = gzip.open(self.output_path, mode + 't', newline='', encoding=encoding)
         else:
-            print("❌ 추출된 표 데이터가 없습니다.")
-            return False
+            # 이어 쓰기 모드에서는 파일 중간에 BOM이 다시 기록되지 않음
+            self._file = open(self.output_path, mode, newline='', encoding=self.encoding)
+        self._writer = csv.writer(self._file)
+    
+    def write_rows(self, rows: Iterable[List[str]]) -> int:
+        """행들을 기록하고 기록한 행 수를 반환합니다."""
+        count = 0
+        for row in rows:
+            if self._writer is None:
+                self._open()
+            self._writer.writerow(row)
+            count += 1
+        self.row_count += count
+        return count
+    
+    def close(self):
+        """파일을 닫습니다."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+# 병렬 추출 작업자 프로세스의 상태 (_init_extract_worker에서 설정)
+_worker_state: Dict = {}
+
+def _init_extract_worker(rules_file: Optional[str], cache_dir: Optional[str], header_memo_path: Optional[str],
+                         use_index: bool, log_settings: Dict, profile_settings: Dict) -> None:
+    """병렬 추출 작업자 프로세스를 초기화합니다. (규칙·캐시·헤더 메모를 프로세스당 한 번만 준비)"""
+    if log_settings:
+        # 부모의 로그 기록 스레드는 자식 프로세스로 넘어오지 않으므로 같은 설정으로 다시 시작
+        setup_logging(**log_settings)
+    if profile_settings:
+        PROFILER.configure(**profile_settings)
+    rules = ExtractionRules.load(rules_file) if rules_file else TableExtractor.default_rules
+    _worker_state['rules'] = rules
+    _worker_state['cache'] = TableCache(cache_dir, f"{PARSER_VERSION}-{rules.fingerprint}") if cache_dir else None
+    _worker_state['use_index'] = use_index
+    if header_memo_path:
+        # 작업자는 저장된 메모로 시작하고, 새로 배운 양식은 작업마다 부모에게 넘겨 부모가 저장
+        TableExtractor.shared_header_memo = HeaderMemo(path=header_memo_path,
+                                                       version=f"{PARSER_VERSION}-{rules.fingerprint}")
+
+def _extract_sections_job(html_file_path: str, job_id: str) -> Tuple[Optional[Tuple[Dict[str, str], List[Section]]], Dict, Dict]:
+    """작업자 프로세스에서 HTML 하나를 파싱해 ((기본 정보, 섹션 목록) 또는 None, 단계별 지표, 헤더 메모 변경분)을 반환합니다."""
+    extractor = TableExtractor(html_file_path, cache=_worker_state['cache'], rules=_worker_state['rules'],
+                               use_index=_worker_state['use_index'])
+    try:
+        with job_context(job_id), PROFILER.job('extract', job_id):
+            sections = extractor.extract_sections()
+    finally:
+        # 작업자에서 잰 파싱·추출 시간은 부모 프로세스의 지표에 합침
+        metrics_state = METRICS.drain()
+        memo_state = extractor.header_memo.drain()
+    if sections is None:
+        return None, metrics_state, memo_state
+    return (extractor.company_info, sections), metrics_state, memo_state
 
 class BatchTableExtractor:
     """JSON 설정 파일을 읽어서 여러 기업의 표 데이터를 일괄 처리하는 클래스"""
     
-    def __init__(self, config_file: str = "companies_config.json"):
+    def __init__(self, config_file: str = "companies_config.json", combined_output: Optional[str] = None,
+                 cache_dir: Optional[str] = None, force: bool = False,
+                 manifest_path: Optional[str] = None, panel_db: Optional[str] = None,
+                 shard: Optional[Tuple[int, int]] = None, output_dir: str = "result",
+                 output_format: str = "csv", workers: int = 1):
         """
         Args:
-            config_file (str): 기업 정보가 담긴 JSON 설정 파일 경로
+            config_file (str): 기업 정보가 담긴 JSON 설정 파일 또는 JSONL 작업 명세 경로
+            combined_output (str, optional): 모든 공시를 이어 쓸 통합 CSV(.csv / .csv.gz) 경로.
+                없으면 설정 파일의 extraction_config.combined_output을 사용하고, 그것도 없으면 공시별 CSV를 만듭니다.
+            cache_dir (str, optional): 파싱된 표 캐시 디렉토리.
+                없으면 설정 파일의 extraction_config.cache_dir을 사용하고, 그것도 없으면 캐시를 쓰지 않습니다.
+            force (bool): True면 매니페스트상 최신인 작업도 다시 추출합니다.
+            manifest_path (str, optional): 입력 해시·추출기 버전·설정 해시·출력 경로를 기록하는 매니페스트 경로
+                (없으면 {output_dir}/.extract_manifest.jsonl)
+            panel_db (str, optional): 모든 공시를 기간별로 쌓는 패널 SQLite 경로.
+                없으면 설정 파일의 extraction_config.panel_db를 사용하고, 그것도 없으면 패널을 만들지 않습니다.
+            shard (tuple, optional): (i, N)이면 전체 작업 중 i번 샤드만 처리합니다.
+                통합 CSV·패널·매니페스트·헤더 메모 경로에는 샤드 번호를 붙여 다른 샤드와 겹치지 않게 합니다.
+            output_dir (str): 주석 HTML을 읽고 공시별 CSV를 저장할 디렉토리
+            output_format (str): 공시별 출력 형식 ("csv" 또는 "csv.gz")
+            workers (int): 2 이상이면 HTML 파싱을 여러 프로세스로 나눠 처리합니다.
+                기록은 이 프로세스에서 작업 순서대로 하므로 출력 내용은 workers=1과 같습니다.
         """
         self.config_file = Path(config_file)
         self.config = None
+        self.combined_output = combined_output
+        self.cache_dir = cache_dir
+        self.cache = None
+        self.writer = None
+        self.force = force
+        self.shard = shard
+        self.output_dir = output_dir
+        self.output_format = output_format
+        self.workers = max(1, workers)
+        self.manifest = ExtractionManifest(shard_path(manifest_path or f"{output_dir}/.extract_manifest.jsonl", shard))
+        self.config_hash = ""
+        self.combined_path = None
+        self.rewrite_combined = False
+        self.panel_db = panel_db
+        self.panel = None
+        self.header_memo = TableExtractor.shared_header_memo
+        self.rules = TableExtractor.default_rules
+        self.use_index = False
         
     def load_config(self) -> bool:
-        """JSON 설정 파일을 로드합니다."""
+        """설정 파일의 extraction_config를 로드합니다.
+
+        작업 목록은 여기서 읽지 않고 process_all_companies()에서 iter_jobs()로 하나씩 읽습니다.
+        """
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                self.config = json.load(f)
-            print(f"✅ 설정 파일 로드 완료: {len(self.config['companies'])}개 기업")
+            self.config = {'extraction_config': load_extraction_config(str(self.config_file))}
+            progress(log, logging.INFO, "✅", "설정 파일 로드 완료: %s", self.config_file)
             return True
         except Exception as e:
-            print(f"❌ 설정 파일 로드 실패: {e}")
+            progress(log, logging.ERROR, "❌", "설정 파일 로드 실패: %s", e)
             return False
     
     def get_html_file_path(self, company_info: Dict[str, str]) -> str:
@@ -857,80 +1110,293 @@ class BatchTableExtractor:
         year = company_info['year']
         report_type = company_info['report_type']
         
-        # HTML 파일명 규칙: result/{회사명}_{년도}_{보고서종류}_연결재무제표주석.html
+        # HTML 파일명 규칙: {출력 디렉토리}/{회사명}_{년도}_{보고서종류}_연결재무제표주석.html
         html_filename = f"{company}_{year}_{report_type}_연결재무제표주석.html"
-        return f"result/{html_filename}"
+        return f"{self.output_dir}/{html_filename}"
     
-    def process_single_company(self, company_info: Dict[str, str]) -> bool:
-        """단일 기업의 표 데이터를 처리합니다."""
-        print(f"\n🏢 {company_info['company_name']} {company_info['year']} {company_info['report_type']} 처리 중...")
+    def prepare_job(self, company_info: Dict[str, str]):
+        """작업의 HTML 경로와 입력 해시를 확인합니다.
+
+        Returns:
+            (HTML 경로, 입력 해시) 또는 파일이 없으면 False, 변경 사항이 없어 건너뛰면 True
+        """
+        progress(log, logging.DEBUG, "\n🏢", "%s %s %s 처리 중...",
+                 company_info['company_name'], company_info['year'], company_info['report_type'])
         
         html_file_path = self.get_html_file_path(company_info)
         
         # HTML 파일 존재 확인
         if not Path(html_file_path).exists():
-            print(f"❌ HTML 파일을 찾을 수 없습니다: {html_file_path}")
+            progress(log, logging.WARNING, "❌", "HTML 파일을 찾을 수 없습니다: %s", html_file_path)
+            METRICS.count('extract_jobs_missing_html')
             return False
         
-        # 표 데이터 추출
-        extractor = TableExtractor(html_file_path)
-        success = extractor.extract_all_tables()
-        
+        # 입력/추출기/설정이 그대로면 건너뛰기
+        input_hash = TableCache.file_hash(html_file_path)
+        skip_allowed = not self.force and not self.rewrite_combined
+        if skip_allowed and self.manifest.is_up_to_date(html_file_path, input_hash, EXTRACTOR_VERSION, self.config_hash,
+                                                        self.combined_path):
+            progress(log, logging.DEBUG, "⏭️", "변경 사항이 없어 건너뜁니다: %s", html_file_path)
+            METRICS.count('extract_jobs_skipped')
+            return True
+        return html_file_path, input_hash
+    
+    def new_extractor(self, html_file_path: str) -> TableExtractor:
+        """이 일괄 처리 설정(캐시·패널·규칙·출력 위치)으로 추출기를 만듭니다."""
+        return TableExtractor(html_file_path, cache=self.cache, panel=self.panel, header_memo=self.header_memo,
+                              rules=self.rules, use_index=self.use_index,
+                              output_dir=self.output_dir, output_format=self.output_format)
+    
+    def process_single_company(self, company_info: Dict[str, str]) -> bool:
+        """단일 기업의 표 데이터를 처리합니다."""
+        with job_context(job_key(company_info)):
+            return self._process_single_company(company_info)
+    
+    def _process_single_company(self, company_info: Dict[str, str]) -> bool:
+        prepared = self.prepare_job(company_info)
+        if isinstance(prepared, bool):
+            return prepared
+        html_file_path, input_hash = prepared
+        
+        # 표 데이터 추출 (통합 출력이 열려 있으면 그 스트림에 이어 씀)
+        extractor = self.new_extractor(html_file_path)
+        with PROFILER.job('extract', job_key(company_info)):
+            success = extractor.extract_all_tables(writer=self.writer)
+        return self.finish_job(company_info, extractor, input_hash, success)
+    
+    def finish_job(self, company_info: Dict[str, str], extractor: TableExtractor, input_hash: str,
+                   success: bool) -> bool:
+        """추출 결과를 매니페스트에 기록하고 결과를 알립니다."""
+        html_file_path = str(extractor.html_file_path)
         if success:
-            print(f"✅ {company_info['company_name']} 처리 완료")
-        else:
-            print(f"❌ {company_info['company_name']} 처리 실패")
+            output_path = self.combined_path if self.writer else extractor.get_output_filename()
+            self.manifest.record(html_file_path, input_hash, EXTRACTOR_VERSION, self.config_hash, output_path)
+        progress(log, logging.INFO, "✅" if success else "❌", "%s 표 추출 %s", company_info['company_name'],
+                 "완료" if success else "실패", extra={'html': html_file_path, 'ok': success})
+        METRICS.count('extract_jobs_ok' if success else 'extract_jobs_failed')
             
         return success
     
     def process_all_companies(self) -> bool:
         """모든 기업의 표 데이터를 일괄 처리합니다."""
         if not self.config:
-            print("❌ 설정이 로드되지 않았습니다. load_config()을 먼저 실행하세요.")
+            progress(log, logging.ERROR, "❌", "설정이 로드되지 않았습니다. load_config()을 먼저 실행하세요.")
             return False
         
         success_count = 0
-        total_count = len(self.config['companies'])
+        total_count = 0
+        
+        progress(log, logging.INFO, "\n🚀", "표 데이터 추출을 시작합니다... (%s)", self.config_file)
+        if self.shard:
+            progress(log, logging.INFO, "🧩", "샤드 %s/%s만 처리합니다.", *self.shard)
+        
+        extraction_config = self.config.get('extraction_config', {})
+        self.use_index = bool(extraction_config.get('use_index', False))
+        rules_file = extraction_config.get('rules_file')
+        if rules_file:
+            self.rules = ExtractionRules.load(rules_file)
+            progress(log, logging.INFO, "📐", "추출 규칙 파일 사용: %s", rules_file)
+        cache_dir = self.cache_dir or extraction_config.get('cache_dir')
+        if cache_dir:
+            self.cache = TableCache(cache_dir, f"{PARSER_VERSION}-{self.rules.fingerprint}")
+            progress(log, logging.INFO, "⚡", "표 캐시 사용: %s", cache_dir)
+        
+        header_memo_path = shard_path(extraction_config.get('header_memo'), self.shard)
+        if header_memo_path:
+            self.header_memo = HeaderMemo(path=header_memo_path, version=f"{PARSER_VERSION}-{self.rules.fingerprint}")
+            progress(log, logging.INFO, "🧠", "헤더 메모 사용: %s (%d개 양식)", header_memo_path, len(self.header_memo.entries))
+        
+        panel_db = shard_path(self.panel_db or extraction_config.get('panel_db'), self.shard)
+        if panel_db:
+            self.panel = PanelStore(panel_db)
+            progress(log, logging.INFO, "🗂️", "기간별 패널 갱신: %s", panel_db)
+        
+        combined_output = shard_path(self.combined_output or extraction_config.get('combined_output'), self.shard)
+        self.combined_path = combined_output
+        
+        # 규칙 내용이나 출력 설정(형식·위치·통합 출력·패널)이 바뀌면 매니페스트와 캐시가 모두 무효화되도록 함께 해시
+        self.config_hash = ExtractionManifest.config_hash({
+            'extraction_config': extraction_config,
+            'rules': self.rules.fingerprint,
+            'output': {'output_dir': self.output_dir, 'output_format': self.output_format,
+                       'combined_output': combined_output, 'panel_db': panel_db},
+        })
+        
+        combined_tmp = None
+        self.rewrite_combined = False
+        if combined_output:
+            if not self.force and self.combined_up_to_date():
+                progress(log, logging.INFO, "⏭️", "통합 출력 파일이 최신이라 건너뜁니다: %s", combined_output)
+            else:
+                # 바뀐 공시의 이전 행이 남지 않도록 통합 출력은 이어 쓰지 않고 임시 파일에 새로 쓴 뒤 교체
+                self.rewrite_combined = True
+                combined_tmp = Path(combined_output).with_name(f"{Path(combined_output).stem}.tmp{Path(combined_output).suffix}")
+                self.writer = CsvStreamWriter(str(combined_tmp))
+                progress(log, logging.INFO, "📦", "통합 출력 파일을 새로 씁니다: %s", combined_output)
         
-        print(f"\n🚀 {total_count}개 기업의 표 데이터 추출을 시작합니다...")
+        try:
+            jobs = iter_shard(iter_jobs(str(self.config_file)), self.shard)
+            if self.workers > 1:
+                progress(log, logging.INFO, "🧵", "%d개 프로세스로 HTML을 나눠 파싱합니다.", self.workers)
+                total_count, success_count = self.process_parallel(jobs, rules_file, cache_dir, header_memo_path)
+            else:
+                for company_info in jobs:
+                    total_count += 1
+                    try:
+                        if self.process_single_company(company_info):
+                            success_count += 1
+                    except Exception as e:
+                        progress(log, logging.ERROR, "❌", "%s 처리 중 오류 발생: %s", company_info['company_name'], e,
+                                 exc_info=True, extra={'job_id': job_key(company_info)})
+        finally:
+            if self.writer is not None:
+                self.writer.close()
+                self.writer = None
+                if combined_tmp.exists():
+                    os.replace(combined_tmp, combined_output)
+                elif Path(combined_output).exists():
+                    # 기록된 행이 없으면 이전 결과가 최신처럼 보이지 않도록 지움
+                    Path(combined_output).unlink()
+            if self.panel is not None:
+                panel_csv = shard_path(extraction_config.get('panel_csv'), self.shard)
+                if panel_csv:
+                    panel_count = self.panel.export_csv(panel_csv)
+                    progress(log, logging.INFO, "🗂️", "기간별 패널 CSV 저장 완료: %s (%d행)", panel_csv, panel_count)
+                self.panel.close()
+                self.panel = None
         
-        for company_info in self.config['companies']:
-            try:
-                if self.process_single_company(company_info):
-                    success_count += 1
-            except Exception as e:
-                print(f"❌ {company_info['company_name']} 처리 중 오류 발생: {e}")
+        try:
+            self.header_memo.save()
+        except Exception as e:
+            progress(log, logging.WARNING, "⚠️", "헤더 메모 저장 실패: %s", e)
+        progress(log, logging.INFO, "🧠", "헤더 메모 적중: %d회 / 미적중: %d회", self.header_memo.hits, self.header_memo.misses)
         
-        print(f"\n📊 처리 결과: {success_count}/{total_count}개 기업 성공")
+        progress(log, logging.INFO, "\n📊", "처리 결과: %d/%d개 기업 성공", success_count, total_count)
         return success_count == total_count
+    
+    def combined_up_to_date(self) -> bool:
+        """통합 출력 파일이 있고 모든 작업이 매니페스트상 최신이면 True를 반환합니다. (하나라도 바뀌면 바로 False)"""
+        if not Path(self.combined_path).exists():
+            return False
+        for company_info in iter_shard(iter_jobs(str(self.config_file)), self.shard):
+            html_file_path = self.get_html_file_path(company_info)
+            if not Path(html_file_path).exists():
+                return False
+            if not self.manifest.is_up_to_date(html_file_path, TableCache.file_hash(html_file_path), EXTRACTOR_VERSION,
+                                               self.config_hash, self.combined_path):
+                return False
+        return True
+    
+    def process_parallel(self, jobs: Iterable[Dict[str, str]], rules_file: Optional[str],
+                         cache_dir: Optional[str], header_memo_path: Optional[str]) -> Tuple[int, int]:
+        """HTML 파싱·표 추출은 작업자 프로세스에서, 기록은 이 프로세스에서 작업 순서대로 처리합니다.
 
-def main():
-    """메인 실행 함수"""
-    # JSON 설정 파일이 있으면 일괄 처리, 없으면 기본 단일 처리
-    config_file = "companies_config.json"
-    
-    if Path(config_file).exists():
-        # 일괄 처리 모드
-        batch_extractor = BatchTableExtractor(config_file)
-        if batch_extractor.load_config():
-            success = batch_extractor.process_all_companies()
-            if success:
-                print("\n🎉 모든 기업의 표 데이터 추출이 완료되었습니다!")
-            else:
-                print("\n⚠️ 일부 기업의 표 데이터 추출에 실패했습니다.")
-        else:
-            print("\n❌ 설정 파일 로드에 실패했습니다.")
-    else:
-        # 기본 단일 처리 모드 (기존 동작)
-        html_file = "result/한솔피엔에스_2025_반기보고서_연결재무제표주석.html"
+        제출한 뒤 아직 기록하지 않은 작업은 workers×2개까지만 유지해 메모리를 제한합니다.
+
+        Returns:
+            (전체 작업 수, 성공 작업 수)
+        """
+        total_count = 0
+        success_count = 0
+        window = deque()
         
-        extractor = TableExtractor(html_file)
-        success = extractor.extract_all_tables()
+        def finish_oldest():
+            company_info, html_file_path, input_hash, future = window.popleft()
+            with job_context(job_key(company_info)):
+                return finish(company_info, html_file_path, input_hash, future)
         
-        if success:
-            print("\n🎉 표 데이터 추출이 완료되었습니다!")
-        else:
-            print("\n❌ 표 데이터 추출에 실패했습니다.")
+        def finish(company_info, html_file_path, input_hash, future):
+            extractor = self.new_extractor(html_file_path)
+            try:
+                result, metrics_state, memo_state = future.result()
+                METRICS.merge(metrics_state)
+                self.header_memo.merge(memo_state)
+                if result is None:
+                    success = False
+                else:
+                    extractor.company_info, sections = result
+                    success = extractor.write_sections(sections, self.writer)
+            except Exception as e:
+                progress(log, logging.ERROR, "❌", "%s 처리 중 오류 발생: %s", company_info['company_name'], e,
+                         exc_info=True, extra={'job_id': job_key(company_info)})
+                return 0
+            return int(self.finish_job(company_info, extractor, input_hash, success))
+        
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_extract_worker,
+                                 initargs=(rules_file, cache_dir, header_memo_path, self.use_index,
+                                           logging_settings(), PROFILER.settings())) as pool:
+            for company_info in jobs:
+                total_count += 1
+                try:
+                    with job_context(job_key(company_info)):
+                        prepared = self.prepare_job(company_info)
+                except Exception as e:
+                    progress(log, logging.ERROR, "❌", "%s 처리 중 오류 발생: %s", company_info['company_name'], e,
+                             exc_info=True, extra={'job_id': job_key(company_info)})
+                    continue
+                if isinstance(prepared, bool):
+                    success_count += int(prepared)
+                    continue
+                html_file_path, input_hash = prepared
+                window.append((company_info, html_file_path, input_hash,
+                               pool.submit(_extract_sections_job, html_file_path, job_key(company_info))))
+                if len(window) >= self.workers * 2:
+                    success_count += finish_oldest()
+            while window:
+                success_count += finish_oldest()
+        return total_count, success_count
+
+def extract_html_files(html_files: Iterable[str], output_dir: str = "result", output_format: str = "csv",
+                       cache_dir: Optional[str] = None) -> bool:
+    """HTML 파일들을 하나씩 공시별 CSV로 추출하고 모두 성공했는지 반환합니다."""
+    cache = TableCache(cache_dir, f"{PARSER_VERSION}-{TableExtractor.default_rules.fingerprint}") if cache_dir else None
+    success_count = 0
+    html_files = list(html_files)
+    for html_file in html_files:
+        extractor = TableExtractor(html_file, cache=cache, output_dir=output_dir, output_format=output_format)
+        # 파일 단위로 로그의 job_id와 --profile/--trace-memory 결과를 나눔
+        job_id = Path(html_file).stem
+        with job_context(job_id), PROFILER.job('extract', job_id):
+            if extractor.extract_all_tables():
+                success_count += 1
+    
+    if success_count == len(html_files):
+        print("\n🎉 표 데이터 추출이 완료되었습니다!")
+    else:
+        print(f"\n❌ 표 데이터 추출에 실패했습니다. ({success_count}/{len(html_files)}개 성공)")
+    return success_count == len(html_files)
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="DART 연결재무제표 주석 표 데이터 추출")
+    parser.add_argument('html_files', nargs='*', help="추출할 주석 HTML 파일 (지정하면 설정 파일 대신 이 파일들만 처리)")
+    parser.add_argument('--force', action='store_true', help="변경 사항이 없는 공시도 다시 추출")
+    parser.add_argument('--config', default='companies_config.json', help="설정 파일 (JSON 또는 JSONL 작업 명세)")
+    parser.add_argument('--shard', type=shard_arg, help="전체 작업 중 i번 샤드만 처리 (i/N, i는 0부터)")
+    args = parser.parse_args()
+    setup_logging()
+    
+    if args.html_files:
+        success = extract_html_files(args.html_files)
+        export_run_metrics('extract')
+        return 0 if success else 1
+    
+    if not Path(args.config).exists():
+        print(f"❌ 설정 파일을 찾을 수 없습니다: {args.config}")
+        return 2
+    
+    # 일괄 처리 모드
+    batch_extractor = BatchTableExtractor(args.config, force=args.force, shard=args.shard)
+    if not batch_extractor.load_config():
+        print("\n❌ 설정 파일 로드에 실패했습니다.")
+        return 2
+    success = batch_extractor.process_all_companies()
+    export_run_metrics('extract', batch_extractor.output_dir, shard=args.shard)
+    if success:
+        print("\n🎉 모든 기업의 표 데이터 추출이 완료되었습니다!")
+        return 0
+    print("\n⚠️ 일부 기업의 표 데이터 추출에 실패했습니다.")
+    return 1
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
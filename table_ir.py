@@ -0,0 +1,46 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+@dataclass(slots=True)
+class Cell:
+    """표 헤더 셀 (정리된 텍스트, 원본 텍스트, 병합 정보)"""
+    text: str
+    raw_text: str
+    colspan: int = 1
+    rowspan: int = 1
+
+
+@dataclass(slots=True)
+class Row:
+    """표 데이터 행
+
+    period가 None이면 소속 표의 기간구분을 따르고,
+    6번 병합 표처럼 행마다 기간구분이 다르면 행에 직접 기록합니다.
+    """
+    values: List[str]
+    period: Optional[str] = None
+
+
+@dataclass(slots=True)
+class Table:
+    """섹션 내 표 하나의 중간 표현"""
+    section_title: str
+    period: Optional[str]
+    headers: List[str]
+    raw_headers: List[str]
+    unit: str = ''
+    rows: List[Row] = field(default_factory=list)
+    source_section: str = ''  # 4,5,7번 병합 시 원래 항목번호
+
+
+@dataclass(slots=True)
+class Section:
+    """(1)~(7) 하위 섹션과 그 안의 표들"""
+    number: str  # 괄호 없는 항목번호 (예: '4')
+    tables: List[Table] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        """괄호 포함 섹션명 (예: '(4)')"""
+        return f"({self.number})"
@@ -0,0 +1,74 @@
+import threading
+
+import pytest
+
+import api_key_pool
+from api_key_pool import ApiKeyPool, QuotaExhausted, key_id
+
+
+def no_sleep(seconds):
+    raise AssertionError(f"토큰이 있는 키가 있는데 {seconds:.3f}초 기다림")
+
+
+def test_key_with_tokens_is_used_before_waiting_for_key_with_more_headroom(tmp_path, monkeypatch):
+    pool = ApiKeyPool(['a', 'b'], usage_db=str(tmp_path / 'usage.db'), rate_per_second=1)
+    # b가 오늘 더 많이 썼으므로 남은 한도는 a가 더 많음
+    pool.conn.execute("INSERT INTO key_usage (day, key_id, requests) VALUES (?, ?, 5)", (pool.today(), key_id('b')))
+    monkeypatch.setattr(api_key_pool.time, 'sleep', no_sleep)
+
+    assert pool.acquire() == 'a'
+    # a의 버킷이 비었으므로 기다리지 않고 b를 씀
+    assert pool.acquire() == 'b'
+    pool.close()
+
+
+def test_pool_waits_only_when_no_key_has_a_token(tmp_path, monkeypatch):
+    pool = ApiKeyPool(['a'], usage_db=str(tmp_path / 'usage.db'), rate_per_second=1)
+    waits = []
+
+    def sleep(seconds):
+        waits.append(seconds)
+        pool._buckets['a'][0] = 1  # 기다린 만큼 토큰이 찬 것으로 처리
+
+    monkeypatch.setattr(api_key_pool.time, 'sleep', sleep)
+
+    pool.acquire()
+    pool.acquire()
+
+    assert len(waits) == 1 and 0 < waits[0] <= 1
+    pool.close()
+
+
+def test_daily_quota_holds_across_pools_sharing_the_db(tmp_path):
+    usage_db = str(tmp_path / 'usage.db')
+    pools = [ApiKeyPool(['a'], usage_db=usage_db, daily_quota=40, rate_per_second=1e6) for _ in range(4)]
+    granted = []
+
+    def drain(pool):
+        try:
+            while True:
+                granted.append(pool.acquire())
+        except QuotaExhausted:
+            pass
+
+    threads = [threading.Thread(target=drain, args=(pool,)) for pool in pools]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(granted) == 40
+    assert pools[0].usage()[key_id('a')]['requests'] == 40
+    for pool in pools:
+        pool.close()
+
+
+def test_retired_key_is_not_used(tmp_path):
+    pool = ApiKeyPool(['a', 'b'], usage_db=str(tmp_path / 'usage.db'))
+    assert pool.retire('a') == 1
+
+    assert {pool.acquire() for _ in range(3)} == {'b'}
+    assert pool.retire('b') == 0
+    with pytest.raises(QuotaExhausted):
+        pool.acquire()
+    pool.close()
@@ -0,0 +1,59 @@
+import csv
+import gzip
+
+from benchmarks.synthetic_notes import write_notes_file
+from table_extractor import CsvStreamWriter, TableExtractor
+from table_ir import Row, Section, Table
+
+
+def read_rows(path, opener=open):
+    with opener(path, 'rt', encoding='utf-8-sig', newline='') as f:
+        return list(csv.reader(f))
+
+
+def test_empty_writer_creates_no_file(tmp_path):
+    path = tmp_path / 'out.csv'
+
+    with CsvStreamWriter(str(path)) as writer:
+        assert writer.write_rows(iter([])) == 0
+
+    assert not path.exists()
+
+
+def test_append_does_not_repeat_the_bom(tmp_path):
+    path = tmp_path / 'out.csv'
+    for rows in ([['회사명'], ['가']], [['나']]):
+        with CsvStreamWriter(str(path), append=True) as writer:
+            writer.write_rows(rows)
+
+    assert path.read_bytes().count('\ufeff'.encode('utf-8')) == 1
+    assert read_rows(path) == [['회사명'], ['가'], ['나']]
+
+
+def test_sections_are_written_before_later_sections_are_parsed(tmp_path):
+    extractor = TableExtractor('unused.html', output_dir=str(tmp_path))
+    extractor.company_info = {'company': '합성', 'year': '2025', 'report_type': '반기보고서'}
+    parsed = []
+
+    def sections():
+        for number in ('1', '2'):
+            parsed.append(number)
+            yield Section(number, [Table('항목', None, ['구분'], ['구분'], rows=[Row([number])])])
+
+    merged = extractor.iter_merged_sections(sections())
+
+    assert next(merged)[0] == '1'
+    assert parsed == ['1']
+
+
+def test_filings_are_appended_to_one_combined_gzip(tmp_path):
+    combined = tmp_path / 'all.csv.gz'
+    with CsvStreamWriter(str(combined)) as writer:
+        for company in ('합성가', '합성나'):
+            html_file = write_notes_file(str(tmp_path), 'tiny', company=company)
+            assert TableExtractor(str(html_file), output_dir=str(tmp_path)).extract_all_tables(writer)
+
+    rows = read_rows(combined, opener=gzip.open)
+    assert {row[0] for row in rows if row[0] != '회사명'} == {'합성가', '합성나'}
+    # 공시별 CSV는 만들지 않음
+    assert not list(tmp_path.glob('*_표데이터.csv'))
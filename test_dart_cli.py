@@ -0,0 +1,33 @@
+import pytest
+
+import dart_cli
+
+
+def run_crashing_command(tmp_path, monkeypatch, error):
+    """명령 함수가 error를 던지게 하고 (종료 코드, 실행 지표에 기록된 종료 코드)를 반환합니다."""
+    exported = {}
+
+    def crash(args):
+        raise error
+
+    monkeypatch.setattr(dart_cli, 'cmd_index', crash)
+    monkeypatch.setattr(dart_cli, 'export_run_metrics', lambda command, output_dir, **extra: exported.update(extra))
+    exit_code = dart_cli.main(['index', '--output-dir', str(tmp_path)])
+    return exit_code, exported['exit_code']
+
+
+def test_crash_is_recorded_with_crash_exit_code(tmp_path, monkeypatch):
+    assert run_crashing_command(tmp_path, monkeypatch, RuntimeError('망가짐')) == (dart_cli.EXIT_CRASH,) * 2
+
+
+def test_interrupt_is_recorded_as_interrupted(tmp_path, monkeypatch):
+    assert run_crashing_command(tmp_path, monkeypatch, KeyboardInterrupt()) == (dart_cli.EXIT_INTERRUPTED,) * 2
+
+
+@pytest.mark.parametrize('option', [['--combined-output', 'all.csv'], ['--force'], ['--shard', '0/2'], ['--workers', '2']])
+def test_batch_only_options_are_rejected_with_html_files(tmp_path, option, capsys):
+    with pytest.raises(SystemExit) as exc_info:
+        dart_cli.main(['extract', str(tmp_path / 'notes.html'), *option])
+
+    assert exc_info.value.code == dart_cli.EXIT_USAGE
+    assert option[0] in capsys.readouterr().err
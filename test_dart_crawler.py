@@ -0,0 +1,56 @@
+import pytest
+
+from api_key_pool import QuotaExhausted
+from dart_crawler import run_jobs_concurrently
+
+JOBS = [{'company_name': name, 'year': '2025', 'report_type': '반기보고서'} for name in ('가', '나', '다')]
+
+
+def failing_handler(job):
+    if job['company_name'] == '나':
+        raise ConnectionError('연결 끊김')
+    return True
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_job_error_is_recorded_as_failure_and_batch_continues(workers):
+    results = {job['company_name']: ok for job, ok in run_jobs_concurrently(iter(JOBS), failing_handler, workers)}
+
+    assert results == {'가': True, '나': False, '다': True}
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_quota_exhaustion_stops_the_batch(workers):
+    def handler(job):
+        raise QuotaExhausted('한도 소진')
+
+    with pytest.raises(QuotaExhausted):
+        list(run_jobs_concurrently(iter(JOBS), handler, workers))
+
+
+def test_batch_extraction_reads_from_client_output_dir(tmp_path, monkeypatch):
+    import dart_crawler
+    import table_extractor
+
+    config_file = tmp_path / 'jobs.jsonl'
+    config_file.write_text('{"company_name": "가", "year": "2025", "report_type": "반기보고서"}\n', encoding='utf-8')
+    monkeypatch.setenv('COMPANIES_CONFIG', str(config_file))
+    monkeypatch.setattr('sys.argv', ['dart_crawler.py', '--shard', '0/1'])
+    monkeypatch.setattr(dart_crawler, '_default_client',
+                        dart_crawler.DartClient(api_keys=['test'], output_dir=str(tmp_path / 'custom')))
+    monkeypatch.setattr(dart_crawler, 'process_companies_from_config', lambda *args, **kwargs: True)
+    monkeypatch.setattr(dart_crawler, 'export_run_metrics', lambda *args, **kwargs: None)
+    created = {}
+
+    class FakeBatchExtractor:
+        def __init__(self, config_file, shard=None, output_dir='result'):
+            created.update(output_dir=output_dir)
+
+        def load_config(self):
+            return False
+
+    monkeypatch.setattr(table_extractor, 'BatchTableExtractor', FakeBatchExtractor)
+
+    dart_crawler.main()
+
+    assert created['output_dir'] == str(tmp_path / 'custom')
@@ -0,0 +1,43 @@
+import pytest
+
+from dart_throttle import AdaptiveLimiter, DartThrottled
+
+
+def throttled_once(key_rotated):
+    """첫 요청만 020으로 응답하는 함수"""
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        if len(calls) == 1:
+            raise DartThrottled('요청 제한 초과', key_rotated=key_rotated)
+        return 'ok'
+    return fetch
+
+
+def test_throttle_with_another_key_keeps_the_limit():
+    limiter = AdaptiveLimiter('list', initial_limit=4.0, throttle_pause=0.0)
+
+    assert limiter.call(throttled_once(key_rotated=True)) == 'ok'
+
+    assert limiter.limit > 4.0
+    assert limiter.stats['throttled'] == 1
+
+
+def test_throttle_without_another_key_halves_the_limit():
+    limiter = AdaptiveLimiter('list', initial_limit=4.0, throttle_pause=0.0)
+
+    assert limiter.call(throttled_once(key_rotated=False)) == 'ok'
+
+    assert limiter.limit < 4.0
+    assert limiter.stats['throttled'] == 1
+
+
+def test_throttle_is_raised_after_retries():
+    limiter = AdaptiveLimiter('list', throttle_pause=0.0)
+
+    def fetch():
+        raise DartThrottled('요청 제한 초과', key_rotated=True)
+
+    with pytest.raises(DartThrottled):
+        limiter.call(fetch, retries=1)
@@ -0,0 +1,127 @@
+import json
+from datetime import datetime
+
+import pytest
+import requests
+
+import dart_crawler
+from dart_watch import FilingWatcher
+
+TODAY = datetime.now().strftime('%Y%m%d')
+
+
+def filing(seq: int, corp_name: str = '합성가') -> dict:
+    return {'rcept_no': f"{TODAY}{seq:06d}", 'rcept_dt': TODAY, 'corp_name': corp_name,
+            'corp_code': '00000000', 'report_nm': '반기보고서 (2025.06)'}
+
+
+@pytest.fixture
+def watcher(tmp_path, monkeypatch):
+    """목록 조회와 공시 처리를 가짜로 바꾼 감시기 (filings: 목록, failing: 실패시킬 접수번호)"""
+    monkeypatch.setenv('METRICS_TEXTFILE', '')
+    monkeypatch.setattr(dart_crawler, '_default_client',
+                        dart_crawler.DartClient(api_keys=['test'], output_dir=str(tmp_path)))
+    watcher = FilingWatcher(state_file=str(tmp_path / 'state.json'))
+    watcher.watchlist = {'합성가'}
+    watcher.filings, watcher.failing, watcher.processed = [], set(), []
+
+    def fetch_list(params):
+        return {'status': '000', 'total_page': 1, 'list': watcher.filings}
+
+    def process_filing(item):
+        if item['rcept_no'] in watcher.failing:
+            raise requests.ConnectionError('연결 끊김')
+        watcher.processed.append(item['rcept_no'])
+        return True
+
+    monkeypatch.setattr(watcher, '_get_list', fetch_list)
+    monkeypatch.setattr(watcher, 'process_filing', process_filing)
+    return watcher
+
+
+def test_failed_filing_is_retried_on_next_poll(watcher):
+    first, second = filing(1), filing(2)
+    watcher.filings = [first, second]
+    watcher.failing = {first['rcept_no']}
+
+    assert watcher.poll_once() == 1
+    assert watcher.state['failed'] == {first['rcept_no']: 1}
+    # 재시작해도 실패한 접수번호가 남아 있어야 함
+    saved = json.loads(watcher.state_file.read_text(encoding='utf-8'))
+    assert saved['failed'] == {first['rcept_no']: 1}
+    assert saved['rcept_no'] == second['rcept_no']
+
+    watcher.failing = set()
+    assert watcher.poll_once() == 1
+    assert watcher.processed == [second['rcept_no'], first['rcept_no']]
+    assert watcher.state['failed'] == {}
+
+
+def test_unwatched_filings_only_advance_watermark(watcher):
+    watcher.filings = [filing(1, corp_name='다른회사')]
+
+    assert watcher.poll_once() == 0
+    assert watcher.state['rcept_no'] == watcher.filings[0]['rcept_no']
+    assert watcher.state['failed'] == {}
+
+
+def test_filing_is_abandoned_after_max_retries(watcher):
+    watcher.filings = [filing(1)]
+    watcher.failing = {watcher.filings[0]['rcept_no']}
+
+    for _ in range(FilingWatcher.MAX_RETRIES):
+        watcher.poll_once()
+
+    assert watcher.state['failed'] == {}
+    assert watcher.poll_once() == 0
+    assert watcher.processed == []
+
+
+def test_watched_filings_save_state_each_and_others_once_per_poll(watcher, monkeypatch):
+    saves = []
+    monkeypatch.setattr(watcher, 'save_state', lambda: saves.append(watcher.state['rcept_no']))
+    watcher.filings = [filing(1, corp_name='다른회사'), filing(2), filing(3, corp_name='다른회사'),
+                       filing(4, corp_name='다른회사')]
+
+    watcher.poll_once()
+
+    assert saves == [filing(2)['rcept_no'], filing(4)['rcept_no']]
+
+
+def test_watchlist_can_be_a_jsonl_job_spec(tmp_path):
+    jobs_file = tmp_path / 'jobs.jsonl'
+    jobs_file.write_text('{"extraction_config": {"output_format": "csv"}}\n'
+                         '{"company_name": "합성가", "year": "2025", "report_type": "반기보고서"}\n'
+                         '{"company_name": "합성나", "corp_code": "00000001", "year": "2025", "report_type": "사업보고서"}\n',
+                         encoding='utf-8')
+    watcher = FilingWatcher(str(jobs_file), state_file=str(tmp_path / 'state.json'))
+
+    assert watcher.load()
+    assert watcher.watchlist == {'합성가', '합성나', '00000001'}
+
+
+def test_watch_extraction_writes_to_client_output_dir(tmp_path, monkeypatch):
+    import dart_watch
+    import table_extractor
+
+    output_dir = tmp_path / 'custom'
+    monkeypatch.setattr(dart_crawler, '_default_client',
+                        dart_crawler.DartClient(api_keys=['test'], output_dir=str(output_dir)))
+    monkeypatch.setattr(dart_watch, 'get_consolidated_notes_from_report',
+                        lambda rcept_no: {'title': '연결재무제표 주석', 'url': 'http://example',
+                                          'html_content': '<p>주석</p>', 'text_content': '주석'})
+    monkeypatch.setattr(dart_watch, 'index_notes_result', lambda result: True)
+    created = {}
+
+    class FakeExtractor:
+        def __init__(self, html_file_path, output_dir='result'):
+            created.update(html=html_file_path, output_dir=output_dir)
+
+        def extract_all_tables(self):
+            return True
+
+    monkeypatch.setattr(table_extractor, 'TableExtractor', FakeExtractor)
+
+    assert FilingWatcher(state_file=str(tmp_path / 'state.json')).process_filing(filing(1))
+    assert created['output_dir'] == str(output_dir)
+    assert created['html'].startswith(str(output_dir))
@@ -0,0 +1,110 @@
+import csv
+import gzip
+import json
+from pathlib import Path
+
+from benchmarks.synthetic_notes import write_notes_file
+from stage_metrics import METRICS
+from table_extractor import BatchTableExtractor
+
+JOBS = [('합성가', '2025', '반기보고서'), ('합성나', '2025', '사업보고서')]
+
+
+def write_jobs(tmp_path: Path, seed: int = 0) -> str:
+    """작업 명세(JSONL)와 각 작업의 주석 HTML을 tmp_path에 만듭니다."""
+    jobs_file = tmp_path / 'jobs.jsonl'
+    with open(jobs_file, 'w', encoding='utf-8') as f:
+        for company, year, report_type in JOBS:
+            write_notes_file(str(tmp_path), 'tiny', company=company, year=year, report_type=report_type, seed=seed)
+            f.write(json.dumps({'company_name': company, 'year': year, 'report_type': report_type},
+                               ensure_ascii=False) + '\n')
+    return str(jobs_file)
+
+
+def run_batch(jobs_file: str, tmp_path: Path, **options) -> dict:
+    """일괄 추출을 실행하고 (성공 여부, 건너뛴 작업 수)를 반환합니다."""
+    METRICS.drain()
+    batch = BatchTableExtractor(jobs_file, output_dir=str(tmp_path), **options)
+    assert batch.load_config()
+    success = batch.process_all_companies()
+    counters = METRICS.drain()['counters']
+    return {'success': success, 'skipped': counters.get('extract_jobs_skipped', 0)}
+
+
+def read_rows(path: Path) -> list:
+    opener = gzip.open if path.suffix == '.gz' else open
+    with opener(path, 'rt', encoding='utf-8-sig', newline='') as f:
+        return list(csv.reader(f))
+
+
+def test_unchanged_rerun_is_skipped(tmp_path):
+    jobs_file = write_jobs(tmp_path)
+    assert run_batch(jobs_file, tmp_path)['skipped'] == 0
+    assert run_batch(jobs_file, tmp_path)['skipped'] == len(JOBS)
+
+
+def test_switching_to_combined_output_reextracts(tmp_path):
+    jobs_file = write_jobs(tmp_path)
+    run_batch(jobs_file, tmp_path)
+    combined = tmp_path / 'all.csv.gz'
+
+    result = run_batch(jobs_file, tmp_path, combined_output=str(combined))
+
+    assert result == {'success': True, 'skipped': 0}
+    assert combined.exists()
+    companies = {row[0] for row in read_rows(combined) if row[0] != '회사명'}
+    assert companies == {company for company, _, _ in JOBS}
+
+
+def test_switching_output_format_reextracts(tmp_path):
+    jobs_file = write_jobs(tmp_path)
+    run_batch(jobs_file, tmp_path)
+
+    result = run_batch(jobs_file, tmp_path, output_format='csv.gz')
+
+    assert result == {'success': True, 'skipped': 0}
+    assert len(list(tmp_path.glob('*_표데이터.csv.gz'))) == len(JOBS)
+
+
+def test_changed_input_rewrites_combined_output_without_duplicates(tmp_path):
+    jobs_file = write_jobs(tmp_path)
+    combined = tmp_path / 'all.csv'
+    run_batch(jobs_file, tmp_path, combined_output=str(combined))
+    first_rows = read_rows(combined)
+
+    # 한 작업의 입력만 바꿔도 통합 출력 전체를 다시 씀
+    company, year, report_type = JOBS[0]
+    write_notes_file(str(tmp_path), 'tiny', company=company, year=year, report_type=report_type, seed=5)
+    result = run_batch(jobs_file, tmp_path, combined_output=str(combined))
+    rows = read_rows(combined)
+
+    assert result == {'success': True, 'skipped': 0}
+    assert len(rows) == len(first_rows)
+    assert rows != first_rows
+
+
+def test_unchanged_combined_output_is_skipped(tmp_path):
+    jobs_file = write_jobs(tmp_path)
+    combined = tmp_path / 'all.csv'
+    run_batch(jobs_file, tmp_path, combined_output=str(combined))
+    first_rows = read_rows(combined)
+
+    result = run_batch(jobs_file, tmp_path, combined_output=str(combined))
+
+    assert result == {'success': True, 'skipped': len(JOBS)}
+    assert read_rows(combined) == first_rows
+
+
+def test_parallel_extraction_saves_header_forms_learned_by_workers(tmp_path):
+    from table_cache import HeaderMemo
+    from table_extractor import PARSER_VERSION, TableExtractor
+
+    memo_path = tmp_path / 'header_memo.pkl'
+    jobs_file = Path(write_jobs(tmp_path))
+    jobs_file.write_text(json.dumps({'extraction_config': {'header_memo': str(memo_path)}}) + '\n'
+                         + jobs_file.read_text(encoding='utf-8'), encoding='utf-8')
+
+    assert run_batch(str(jobs_file), tmp_path, workers=2)['success']
+
+    version = f"{PARSER_VERSION}-{TableExtractor.default_rules.fingerprint}"
+    assert HeaderMemo(path=str(memo_path), version=version).entries
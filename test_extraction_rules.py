@@ -0,0 +1,40 @@
+import json
+
+from extraction_rules import ExtractionRules
+
+RULES = ExtractionRules.load()
+
+
+def test_section_titles_follow_rule_order():
+    assert RULES.map_section_title('연결대상 종속기업의 요약재무상태는 다음과 같습니다.') == "연결대상 종속기업의 요약재무상태"
+    # 여러 규칙의 키워드가 함께 있으면 먼저 선언된 규칙이 우선
+    assert RULES.map_section_title('종속기업의 현황 및 재무상태') == "종속기업의 현황"
+
+
+def test_unmatched_title_is_cut_at_the_first_sentence():
+    assert RULES.map_section_title('기타 사항. 세부 내용은 다음과 같습니다') == "기타 사항"
+
+
+def test_pivot_and_merge_rules():
+    assert RULES.should_pivot('7', '비지배지분과의 거래가 자본에 미치는 영향')
+    assert not RULES.should_pivot('7', '기타 거래')
+    assert not RULES.should_pivot('4', '비지배지분과의 거래')
+    assert RULES.keyed_sections == {'4', '5', '6'}
+
+
+def test_header_cell_by_tag_or_gray_background():
+    assert RULES.is_header_cell('th', '')
+    assert RULES.is_header_cell('td', 'text-align:center; background-color:#D7D7D7')
+    assert not RULES.is_header_cell('td', 'background-color:#FFFFFF')
+
+
+def test_custom_rules_file_changes_matching_and_fingerprint(tmp_path):
+    rules = json.loads(json.dumps(RULES.rules))
+    rules['section_titles'].append({'keywords': ['리스'], 'title': '리스'})
+    rules_file = tmp_path / 'rules.json'
+    rules_file.write_text(json.dumps(rules, ensure_ascii=False), encoding='utf-8')
+
+    custom = ExtractionRules.load(str(rules_file))
+
+    assert custom.map_section_title('리스부채의 변동내역') == '리스'
+    assert custom.fingerprint != RULES.fingerprint
@@ -0,0 +1,32 @@
+import json
+import tracemalloc
+
+import pytest
+
+import dart_cli
+from benchmarks.synthetic_notes import write_notes_file
+from job_profiler import PROFILER
+
+
+@pytest.fixture
+def profiler_off(monkeypatch):
+    """테스트가 켠 전역 프로파일러를 다시 끕니다."""
+    monkeypatch.setenv('METRICS_TEXTFILE', '')
+    monkeypatch.setenv('METRICS_SUMMARY_DIR', '')
+    yield
+    PROFILER.profile = PROFILER.trace_memory = False
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def test_extracting_html_files_profiles_each_file(tmp_path, profiler_off):
+    html_file = write_notes_file(str(tmp_path), 'tiny')
+    profile_dir = tmp_path / 'profile'
+
+    exit_code = dart_cli.main(['extract', str(html_file), '--output-dir', str(tmp_path),
+                               '--profile', '--trace-memory', '--profile-dir', str(profile_dir)])
+
+    assert exit_code == dart_cli.EXIT_OK
+    assert [path.name for path in profile_dir.glob('extract-*.prof')] == [f"extract-{html_file.stem}.prof"]
+    entries = [json.loads(line) for line in (profile_dir / 'memory.jsonl').read_text(encoding='utf-8').splitlines()]
+    assert [(entry['kind'], entry['job_id']) for entry in entries] == [('extract', html_file.stem)]
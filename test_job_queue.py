@@ -0,0 +1,110 @@
+import pytest
+
+import job_queue
+from job_queue import JobQueue
+
+JOBS = [{'company_name': '합성가', 'year': '2025', 'report_type': '반기보고서'},
+        {'company_name': '합성나', 'year': '2025', 'report_type': '사업보고서'}]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """job_queue가 보는 현재 시각 (now[0]을 바꿔 임대 만료를 흉내냄)"""
+    now = [1000.0]
+    monkeypatch.setattr(job_queue.time, 'time', lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    queue = JobQueue(str(tmp_path / 'queue.db'), lease_seconds=60, max_attempts=2)
+    queue.enqueue(JOBS)
+    yield queue
+    queue.close()
+
+
+def states(queue):
+    return dict(queue.conn.execute("SELECT job_id, state FROM jobs").fetchall())
+
+
+def test_enqueue_is_idempotent(queue):
+    assert queue.enqueue(JOBS) == 0
+    assert queue.stats() == {'pending': 2, 'running': 0, 'done': 0, 'failed': 0}
+
+
+def test_claim_hands_each_job_to_one_worker_in_order(queue):
+    first = queue.claim('w1')
+    second = queue.claim('w2')
+
+    assert [first['spec'], second['spec']] == JOBS
+    assert first['attempts'] == 1
+    assert queue.claim('w3') is None
+    assert queue.stats()['running'] == 2
+
+
+def test_expired_lease_is_reclaimed_and_stale_worker_cannot_complete(queue, clock):
+    job = queue.claim('w1')
+    queue.claim('w1')
+    clock[0] += 61
+
+    reclaimed = queue.claim('w2')
+    assert reclaimed['job_id'] == job['job_id']
+    assert reclaimed['attempts'] == 2
+
+    # 임대를 잃은 작업자의 완료 보고는 무시됨
+    queue.complete(job['job_id'], 'w1')
+    assert states(queue)[job['job_id']] == 'running'
+    queue.complete(job['job_id'], 'w2')
+    assert states(queue)[job['job_id']] == 'done'
+
+
+def test_failed_job_is_retried_until_max_attempts(queue):
+    job = queue.claim('w1')
+    queue.fail(job['job_id'], 'w1', 'ConnectionError: 연결 끊김')
+    assert states(queue)[job['job_id']] == 'pending'
+
+    retried = queue.claim('w1')
+    assert retried['job_id'] == job['job_id']
+    queue.fail(job['job_id'], 'w1', 'ConnectionError: 연결 끊김')
+
+    assert states(queue)[job['job_id']] == 'failed'
+    assert queue.failures() == [(job['job_id'], 2, 'ConnectionError: 연결 끊김')]
+    assert queue.retry_failed() == 1
+    assert queue.claim('w1')['attempts'] == 1
+
+
+def test_expired_lease_without_attempts_left_is_failed(queue, clock):
+    job = queue.claim('w1')
+    queue.fail(job['job_id'], 'w1', '처리 실패')
+    queue.claim('w1')
+    queue.claim('w1')
+    clock[0] += 61
+
+    queue.claim('w2')
+
+    assert states(queue)[job['job_id']] == 'failed'
+
+
+def test_release_returns_job_without_using_an_attempt(queue):
+    job = queue.claim('w1')
+    queue.release(job['job_id'], 'w1')
+
+    assert states(queue)[job['job_id']] == 'pending'
+    assert queue.claim('w2')['attempts'] == 1
+
+
+def test_run_worker_records_failures_and_releases_on_stop(queue):
+    class Stop(Exception):
+        pass
+
+    def handler(spec):
+        if spec['company_name'] == '합성나':
+            raise Stop()
+        raise ValueError('잘못된 표')
+
+    with pytest.raises(Stop):
+        queue.run_worker(handler, worker_id='w1', stop_on=(Stop,))
+
+    # 실패한 작업은 시도 횟수를 다 쓸 때까지 다시 처리하고, 중단된 작업은 시도 횟수 없이 대기 상태로
+    rows = queue.conn.execute("SELECT state, attempts, error FROM jobs ORDER BY seq").fetchall()
+    assert rows == [('failed', 2, 'ValueError: 잘못된 표'), ('pending', 0, None)]
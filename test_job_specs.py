@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+import dart_crawler
+import table_extractor
+from job_specs import (iter_jobs, iter_shard, job_key, load_extraction_config, parse_shard, parse_year_range,
+                       shard_of, shard_path)
+
+JOBS = [{'company_name': f"합성{i}", 'corp_code': f"{i:08d}", 'year': '2025', 'report_type': '반기보고서'}
+        for i in range(50)]
+
+
+@pytest.mark.parametrize('main', [table_extractor.main, dart_crawler.main])
+def test_invalid_shard_reports_reason_and_exits_with_usage_error(main, monkeypatch, capsys):
+    monkeypatch.setattr('sys.argv', ['prog', '--shard', '3/2'])
+
+    with pytest.raises(SystemExit) as exited:
+        main()
+
+    assert exited.value.code == 2
+    assert "샤드 번호는 0 이상 1 이하여야 합니다: 3/2" in capsys.readouterr().err
+
+
+def test_shards_partition_jobs_without_overlap():
+    shards = [list(iter_shard(iter(JOBS), (index, 4))) for index in range(4)]
+
+    assert sorted(job['corp_code'] for shard in shards for job in shard) == [job['corp_code'] for job in JOBS]
+    assert all(shards)
+    assert list(iter_shard(iter(JOBS), None)) == JOBS
+
+
+def test_shard_of_is_stable_across_runs():
+    # 해시 시드와 관계없는 SHA-1 기반이어야 노드끼리 같은 분할을 계산함 (값이 바뀌면 진행 중인 샤드 실행이 섞임)
+    jobs = [{'corp_code': corp_code, 'year': '2025', 'report_type': '사업보고서'}
+            for corp_code in ('00126380', '00164779', '00401731')]
+
+    assert [shard_of(job, 4) for job in jobs] == [0, 2, 1]
+
+
+def test_shard_paths_do_not_collide():
+    assert shard_path('result/전체_표데이터.csv.gz', (0, 4)) == 'result/전체_표데이터.shard-0-of-4.csv.gz'
+    assert shard_path('result/.header_memo.pkl', (1, 4)) == 'result/.header_memo.shard-1-of-4.pkl'
+    assert shard_path('result/panel', (2, 4)) == 'result/panel.shard-2-of-4'
+    assert shard_path('result/panel.db', None) == 'result/panel.db'
+
+
+@pytest.mark.parametrize('value', ['1', 'a/b', '2/2', '-1/2', '0/0'])
+def test_invalid_shard_values_are_rejected(value):
+    with pytest.raises(ValueError):
+        parse_shard(value)
+
+
+def test_jsonl_jobs_are_streamed_after_the_config_line(tmp_path, capsys):
+    jobs_file = tmp_path / 'jobs.jsonl'
+    jobs_file.write_text('{"extraction_config": {"output_format": "csv.gz"}}\n'
+                         '# 주석 줄\n'
+                         '{"company_name": "합성가", "year": "2025", "report_type": "반기보고서"}\n'
+                         '\n'
+                         '{잘못된 줄\n'
+                         '{"company_name": "합성나", "year": "2025", "report_type": "사업보고서"}\n', encoding='utf-8')
+
+    jobs = iter_jobs(str(jobs_file))
+
+    assert next(jobs)['company_name'] == '합성가'
+    assert [job['company_name'] for job in jobs] == ['합성나']
+    assert "작업 명세 형식이 올바르지 않아" in capsys.readouterr().out
+    assert load_extraction_config(str(jobs_file)) == {'output_format': 'csv.gz'}
+
+
+def test_json_config_lists_companies(tmp_path):
+    config_file = tmp_path / 'companies_config.json'
+    config_file.write_text(json.dumps({'extraction_config': {'cache_dir': 'cache'},
+                                       'companies': JOBS[:2]}, ensure_ascii=False), encoding='utf-8')
+
+    assert list(iter_jobs(str(config_file))) == JOBS[:2]
+    assert load_extraction_config(str(config_file)) == {'cache_dir': 'cache'}
+
+
+def test_job_key_prefers_corp_code():
+    assert job_key(JOBS[0]) == '00000000|2025|반기보고서'
+    assert job_key({'company_name': '합성가', 'year': '2025', 'report_type': '반기보고서'}) == '합성가|2025|반기보고서'
+
+
+def test_year_range_accepts_ranges_and_lists():
+    assert parse_year_range('2023-2025') == ['2023', '2024', '2025']
+    assert parse_year_range('2024, 2025,') == ['2024', '2025']
@@ -0,0 +1,77 @@
+from table_extractor import TableExtractor
+from table_ir import Row, Table
+
+
+def table(period, headers, rows, title=''):
+    return Table(section_title=title, period=period, headers=list(headers), raw_headers=list(headers), unit='천원',
+                 rows=[Row(list(values)) for values in rows])
+
+
+def rows_by_key(merged_table):
+    """병합 표의 행을 {키: {컬럼: 값}}으로 바꿉니다. (키 없는 행은 '')"""
+    return {row.values[0]: dict(zip(merged_table.headers, row.values)) for row in merged_table.rows}
+
+
+def test_performance_merge_keeps_columns_that_only_some_periods_have():
+    extractor = TableExtractor('unused.html')
+    section_4 = [
+        table('당반기', ['구분', '매출액', '반기순이익'], [['A', '1', '2'], ['B', '3', '4']]),
+        table('전반기', ['구분', '매출액', '반기순이익', '총포괄손익'], [['A', '5', '6', '7'], ['B', '8', '9', '10']]),
+    ]
+    section_5 = [
+        table('당반기', ['구분', '영업활동'], [['A', '11'], ['B', '12']]),
+        table('전반기', ['구분', '영업활동'], [['A', '13'], ['B', '14']]),
+    ]
+
+    merged = extractor.merge_performance_tables(section_4, section_5, [])
+
+    assert [t.period for t in merged] == ['당반기', '전반기']
+    assert merged[0].headers == ['구분', '매출액', '반기순이익', '총포괄손익', '영업활동']
+    previous = rows_by_key(merged[1])
+    assert previous['A']['총포괄손익'] == '7'
+    assert previous['B']['총포괄손익'] == '10'
+    assert previous['B']['영업활동'] == '14'
+    assert rows_by_key(merged[0])['A']['총포괄손익'] == ''
+
+
+def test_pivoted_section_7_values_are_emitted_once_per_period():
+    extractor = TableExtractor('unused.html')
+    section_4 = [table('당반기', ['구분', '매출액'], [['A', '1'], ['B', '2'], ['C', '3']])]
+    section_7 = [table('당반기', ['취득 장부금액', '지급 대가'], [['100', '200']])]
+
+    merged = extractor.merge_performance_tables(section_4, [], section_7)
+
+    rows = rows_by_key(merged[0])
+    assert [rows[key]['취득 장부금액'] for key in ('A', 'B', 'C')] == ['', '', '']
+    assert rows['']['취득 장부금액'] == '100'
+    assert rows['']['지급 대가'] == '200'
+    totals = sum(int(row.values[merged[0].headers.index('지급 대가')] or 0) for row in merged[0].rows)
+    assert totals == 200
+
+
+def test_equity_merge_unions_columns_that_differ_between_periods():
+    extractor = TableExtractor('unused.html')
+    section_6 = [
+        table('당반기말', ['구분', '기초', '연결범위의 변동', '반기말'], [['A', '1', '2', '3']]),
+        table('전기말', ['구분', '기초', '전기말'], [['A', '4', '5'], ['B', '6', '7']]),
+    ]
+
+    merged = extractor.merge_equity_tables(section_6)
+
+    assert len(merged) == 1
+    assert merged[0].headers == ['구분', '기초', '연결범위의 변동', '반기말', '전기말']
+    values = {(row.period, row.values[0]): row.values for row in merged[0].rows}
+    assert values[('당반기말', 'A')] == ['A', '1', '2', '3', '']
+    assert values[('전기말', 'A')] == ['A', '4', '', '', '5']
+    assert values[('전기말', 'B')] == ['B', '6', '', '', '7']
+
+
+def test_financial_position_is_kept_out_of_the_performance_merge(tmp_path):
+    import notes_api
+    from benchmarks.synthetic_notes import write_notes_file
+
+    items = notes_api.extract(write_notes_file(str(tmp_path), 'tiny'), backend='columns')
+
+    # 3번은 시점(기말) 기준이라 4,5번 기간과 조인하지 않고 따로 남음
+    assert set(items['3']['기간구분']) == {'당반기말', '전기말'}
+    assert '자산' not in items['4'] and {'매출액', '영업활동현금흐름'} <= set(items['4'])
@@ -0,0 +1,83 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+import dart_crawler
+from api_key_pool import QuotaExhausted
+from benchmarks.mock_dart import start_mock_server
+
+
+@pytest.fixture
+def mock_server():
+    servers = []
+
+    def start(**options):
+        server = start_mock_server(**options)
+        servers.append(server)
+        return server
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """모의 서버로 향하는 크롤러 클라이언트를 만드는 함수"""
+    monkeypatch.setenv('METRICS_TEXTFILE', '')
+
+    def make(server, api_keys=('k1', 'k2')):
+        for name, value in server.env().items():
+            monkeypatch.setenv(name, value)
+        client = dart_crawler.DartClient(api_keys=list(api_keys), output_dir=str(tmp_path))
+        monkeypatch.setattr(dart_crawler, '_default_client', client)
+        return client
+    return make
+
+
+def test_crawler_fetches_notes_end_to_end(mock_server, client):
+    server = mock_server(companies=3)
+    client(server)
+
+    result = dart_crawler.get_consolidated_financial_notes('모의기업0002', '2025', '2')
+
+    assert result['rcept_no'] == '20250814000002'
+    assert '지배기업의 개요' in result['html_content']
+    assert {endpoint: stats['responses'] for endpoint, stats in server.snapshot().items()} == {
+        'corp_code': {'ok': 1}, 'list': {'ok': 1}, 'sub_docs': {'ok': 1}, 'viewer': {'ok': 2}}
+
+
+def test_list_requires_a_key_and_returns_periodic_filings(mock_server):
+    server = mock_server(companies=2)
+    list_url = server.env()['DART_LIST_URL']
+
+    assert requests.get(list_url, params={'corp_code': '00000001', 'bgn_de': '20250101'}).json()['status'] == '010'
+    data = requests.get(list_url, params={'corp_code': '00000001', 'bgn_de': '20250101', 'crtfc_key': 'k'}).json()
+    assert [filing['report_nm'] for filing in data['list']] == [
+        '사업보고서 (2024.12)', '분기보고서 (2025.03)', '반기보고서 (2025.06)', '분기보고서 (2025.09)']
+
+
+def test_throttled_key_is_retired_and_the_other_key_is_used(mock_server, client):
+    server = mock_server(companies=2, throttle_rate=1.0)
+    crawler = client(server)
+    crawler.throttle.get('corp_code').throttle_pause = 0.0
+
+    with pytest.raises(QuotaExhausted):
+        list(dart_crawler.iter_corp_codes(crawler))
+
+    usage = crawler.key_pool.usage()
+    assert all(info['retired'] for info in usage.values())
+    assert server.snapshot()['corp_code']['responses'] == {'throttled': 2}
+
+
+def test_errors_and_overload_are_injected(mock_server):
+    list_url = mock_server(error_rate=1.0).env()['DART_LIST_URL']
+    assert requests.get(list_url).status_code == 500
+
+    server = mock_server(latency=0.3, max_concurrency=1)
+    viewer_url = server.env()['DART_VIEWER_URL']
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        codes = sorted(pool.map(lambda _: requests.get(viewer_url).status_code, range(3)))
+    assert codes[0] == 200 and 429 in codes
+    assert server.snapshot()['viewer']['max_in_flight'] >= 2
@@ -0,0 +1,52 @@
+import pytest
+
+import notes_api
+from benchmarks.synthetic_notes import write_notes_file
+
+
+@pytest.fixture
+def html_file(tmp_path):
+    return write_notes_file(str(tmp_path), 'tiny', company='합성가')
+
+
+def test_path_string_and_bytes_give_the_same_columns(html_file):
+    from_path = notes_api.extract(str(html_file), backend='columns')
+    html = html_file.read_text(encoding='utf-8')
+
+    assert from_path
+    assert notes_api.extract(html, backend='columns') == from_path
+    assert notes_api.extract(html.encode('utf-8'), backend='columns') == from_path
+    assert from_path['1']['회사명'][0] == '합성가'
+
+
+def test_existing_file_with_tag_characters_in_name_is_read_as_path(tmp_path, html_file):
+    odd_path = tmp_path / '<합성>.html'
+    odd_path.write_bytes(html_file.read_bytes())
+
+    assert notes_api.read_source(str(odd_path)) == (str(odd_path), None)
+    assert notes_api.extract(str(odd_path), backend='columns') == notes_api.extract(html_file, backend='columns')
+
+
+def test_arrow_backend_round_trips_columns(html_file):
+    pytest.importorskip('pyarrow')
+    columns = notes_api.extract(html_file, backend='columns')
+
+    tables = notes_api.extract(html_file, backend='arrow')
+
+    assert {item: table.to_pydict() for item, table in tables.items()} == columns
+
+
+def test_pandas_backend_round_trips_columns(html_file):
+    pytest.importorskip('pandas')
+    columns = notes_api.extract(html_file, backend='columns')
+
+    frames = notes_api.extract(html_file, backend='pandas')
+
+    for item, frame in frames.items():
+        assert list(frame.columns) == list(columns[item])
+        assert frame.astype(object).where(frame.notna(), None).to_dict('list') == columns[item]
+
+
+def test_unknown_backend_is_rejected(html_file):
+    with pytest.raises(ValueError):
+        notes_api.extract(html_file, backend='polars')
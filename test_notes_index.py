@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+from benchmarks.synthetic_notes import write_notes_file
+from notes_index import NotesIndex
+from table_extractor import TableExtractor
+
+
+@pytest.fixture
+def html_file(tmp_path):
+    return write_notes_file(str(tmp_path), 'tiny')
+
+
+def test_sidecar_is_reused_until_the_file_changes(html_file):
+    index = NotesIndex.load_or_build(str(html_file))
+    sidecar = NotesIndex.sidecar_path(str(html_file))
+    assert sidecar.exists()
+    assert NotesIndex.load_or_build(str(html_file)).index == index.index
+
+    html_file.write_text(html_file.read_text(encoding='utf-8') + '<table><tr><td>끝</td></tr></table>',
+                         encoding='utf-8')
+    os.utime(html_file, ns=(0, index.index['mtime_ns'] + 1))
+
+    assert len(NotesIndex.load_or_build(str(html_file)).index['tables']) == len(index.index['tables']) + 1
+
+
+def test_table_k_of_note_n_is_parsed_alone(html_file):
+    index = NotesIndex.build(str(html_file))
+    spans = index.tables_in_note(1)
+
+    first = index.parse_table(1, 0)
+
+    assert spans and first.name == 'table'
+    assert '종속기업' in first.get_text()
+    assert index.parse_table(1, len(spans)) is None
+    assert index.parse_table(99, 0) is None
+
+
+def test_indexed_extraction_matches_full_parse(html_file):
+    full = TableExtractor(str(html_file)).extract_sections()
+    indexed = TableExtractor(str(html_file), use_index=True).extract_sections()
+
+    assert indexed == full
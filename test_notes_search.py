@@ -0,0 +1,33 @@
+import pytest
+
+from notes_search import NotesSearchIndex, build_match_query, ngram_tokens
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = NotesSearchIndex(str(tmp_path / 'notes_index.db'))
+    index.add_document('1', '합성가', '2025', '1분기보고서', '당분기 중 리스부채를 재평가하였습니다. 리스 부채 재평가 금액')
+    index.add_document('2', '합성나', '2025', '1분기보고서', '리스부채 재평가는 없습니다.')
+    index.add_document('3', '합성다', '2025', '반기보고서', '리스부채를 재평가하였습니다.')
+    index.add_document('4', '합성라', '2025', '1분기보고서', '매출채권 손상')
+    yield index
+    index.close()
+
+
+def test_korean_words_are_split_into_overlapping_bigrams():
+    assert ngram_tokens('리스부채를 재') == ['리스', '스부', '부채', '채를', '재']
+    assert build_match_query('리스 부채') == '"리스" AND "부채"'
+
+
+def test_search_matches_inside_compound_words_and_ranks_by_relevance(index):
+    results = index.search('리스 부채 재평가', period='2025-Q1')
+
+    assert [result['company'] for result in results] == ['합성가', '합성나']
+    assert results[0]['score'] <= results[1]['score']
+
+
+def test_reindexing_a_filing_replaces_it(index):
+    index.add_document('4', '합성라', '2025', '1분기보고서', '리스부채 재평가')
+
+    assert {result['rcept_no'] for result in index.search('재평가', report_type='1분기보고서')} == {'1', '2', '4'}
+    assert index.search('매출채권') == []
@@ -0,0 +1,76 @@
+from panel_store import PanelStore
+from table_extractor import CsvStreamWriter, TableExtractor
+from table_ir import Row, Table
+
+COMPANY = {'company': '합성', 'year': '2025', 'report_type': '반기보고서'}
+
+
+def table(period, headers, rows):
+    return Table(section_title='항목', period=period, headers=list(headers), raw_headers=list(headers), unit='천원',
+                 rows=[Row(list(values)) for values in rows])
+
+
+def panel_rows(panel, item):
+    return panel.conn.execute("SELECT subsidiary, row_no, metric, value FROM panel WHERE item = ? "
+                              "ORDER BY row_no, subsidiary, metric", (item,)).fetchall()
+
+
+def test_unkeyed_rows_with_same_first_column_are_not_overwritten(tmp_path):
+    panel = PanelStore(str(tmp_path / 'panel.db'))
+    tables = [table('당반기', ['구분', '회사명', '사유'], [['신규', 'A', '설립'], ['신규', 'B', '취득']])]
+
+    assert panel.add_tables(COMPANY, '2', tables, keyed=False) == 6
+
+    rows = panel_rows(panel, '2')
+    assert {(row_no, value) for _, row_no, metric, value in rows if metric == '회사명'} == {(0, 'A'), (1, 'B')}
+    panel.close()
+
+
+def test_keyed_rows_use_first_column_as_subsidiary(tmp_path):
+    panel = PanelStore(str(tmp_path / 'panel.db'))
+    tables = [table('당반기', ['구분', '매출액'], [['A', '1'], ['B', '2']])]
+
+    panel.add_tables(COMPANY, '4', tables)
+
+    assert panel_rows(panel, '4') == [('A', 0, '매출액', '1'), ('B', 0, '매출액', '2')]
+    panel.close()
+
+
+def test_reextracted_item_replaces_previous_rows(tmp_path):
+    panel = PanelStore(str(tmp_path / 'panel.db'))
+    panel.add_tables(COMPANY, '2', [table('당반기', ['구분', '금액'], [['가', '1'], ['나', '2']])], keyed=False)
+
+    panel.add_tables(COMPANY, '2', [table('당반기', ['구분', '금액'], [['가', '3']])], keyed=False)
+
+    assert panel_rows(panel, '2') == [('', 0, '구분', '가'), ('', 0, '금액', '3')]
+    panel.close()
+
+
+def test_extractor_keys_panel_rows_by_merge_rule(tmp_path):
+    panel = PanelStore(str(tmp_path / 'panel.db'))
+    extractor = TableExtractor('unused.html', panel=panel, output_dir=str(tmp_path))
+    extractor.company_info = COMPANY
+    changes = [table('당반기', ['구분', '회사명'], [['신규', 'A'], ['신규', 'B']])]
+    performance = [table('당반기', ['구분', '매출액'], [['A', '1'], ['B', '2']])]
+
+    with CsvStreamWriter(str(tmp_path / 'out.csv')) as writer:
+        extractor.write_section(writer, '2', changes)
+        extractor.write_section(writer, '4', performance)
+
+    # 2번은 병합 규칙상 종속기업 키가 없으므로 행번호로, 4번은 종속기업으로 구분
+    assert [(row_no, value) for _, row_no, metric, value in panel_rows(panel, '2') if metric == '회사명'] == \
+        [(0, 'A'), (1, 'B')]
+    assert {subsidiary for subsidiary, _, _, _ in panel_rows(panel, '4')} == {'A', 'B'}
+    panel.close()
+
+
+def test_keyed_rows_with_duplicate_keys_are_not_overwritten(tmp_path):
+    panel = PanelStore(str(tmp_path / 'panel.db'))
+    tables = [table('당반기', ['구분', '매출액'], [['A', '1'], ['A', '2'], ['B', '3']]),
+              table('당반기', ['구분', '순이익'], [['A', '4']])]
+
+    assert panel.add_tables(COMPANY, '4', tables) == 4
+
+    assert panel_rows(panel, '4') == [('A', 0, '매출액', '1'), ('A', 0, '순이익', '4'), ('B', 0, '매출액', '3'),
+                                      ('A', 1, '매출액', '2')]
+    panel.close()
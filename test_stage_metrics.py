@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+import stage_metrics
+from stage_metrics import StageMetrics
+
+
+def test_stage_records_latency_errors_and_bytes():
+    metrics = StageMetrics()
+    with metrics.stage('list'):
+        pass
+    with pytest.raises(ValueError):
+        with metrics.stage('list'):
+            raise ValueError('응답 오류')
+    metrics.add_bytes('list', 2048)
+    metrics.observe('html_parse', 0.3)
+
+    summary = metrics.summary()
+
+    assert summary['stages']['list']['count'] == 2
+    assert summary['stages']['list']['errors'] == 1
+    assert summary['stages']['list']['bytes'] == 2048
+    # 분위수는 히스토그램 구간 상한 (최대값을 넘지 않음)
+    assert summary['stages']['html_parse']['p95_seconds'] == 0.3
+    assert list(summary['stages']) == ['list', 'html_parse']
+
+
+def test_worker_metrics_are_merged_into_parent():
+    parent, worker = StageMetrics(), StageMetrics()
+    parent.observe('html_parse', 0.1)
+    worker.observe('html_parse', 2.0)
+    worker.count('csv_rows', 10)
+
+    parent.merge(worker.drain())
+
+    assert parent.stages['html_parse']['count'] == 2
+    assert parent.stages['html_parse']['max'] == 2.0
+    assert parent.counters == {'csv_rows': 10}
+    assert worker.stages == {} and worker.counters == {}
+
+
+def test_prometheus_histogram_is_cumulative():
+    metrics = StageMetrics()
+    for seconds in (0.004, 0.2, 100.0):
+        metrics.observe('notes_fetch', seconds)
+
+    lines = metrics.prometheus_text().splitlines()
+
+    assert 'dart_stage_duration_seconds_bucket{stage="notes_fetch",le="0.005"} 1' in lines
+    assert 'dart_stage_duration_seconds_bucket{stage="notes_fetch",le="60.0"} 2' in lines
+    assert 'dart_stage_duration_seconds_bucket{stage="notes_fetch",le="+Inf"} 3' in lines
+    assert 'dart_stage_duration_seconds_count{stage="notes_fetch"} 3' in lines
+
+
+def test_export_writes_textfile_and_run_summary(tmp_path, monkeypatch):
+    metrics = StageMetrics()
+    metrics.observe('csv_write', 0.01)
+    monkeypatch.setattr(stage_metrics, 'METRICS', metrics)
+    monkeypatch.delenv('METRICS_TEXTFILE', raising=False)
+    monkeypatch.delenv('METRICS_SUMMARY_DIR', raising=False)
+
+    stage_metrics.export_run_metrics('extract', str(tmp_path), exit_code=0)
+
+    assert 'stage="csv_write"' in (tmp_path / 'metrics' / 'dart.prom').read_text(encoding='utf-8')
+    [summary_file] = (tmp_path / 'metrics' / 'runs').glob('*_extract.json')
+    summary = json.loads(summary_file.read_text(encoding='utf-8'))
+    assert summary['command'] == 'extract' and summary['exit_code'] == 0
+    assert summary['stages']['csv_write']['count'] == 1
@@ -0,0 +1,59 @@
+import logging
+
+import pytest
+
+import structured_log
+from benchmarks.synthetic_notes import write_notes_file
+from structured_log import get_logger, progress, set_interactive
+from table_extractor import TableExtractor
+
+
+@pytest.fixture
+def interactive():
+    set_interactive()
+    yield
+    set_interactive(False)
+
+
+def test_progress_is_logged_once_outside_interactive_mode(capsys, caplog):
+    with caplog.at_level(logging.DEBUG, logger=structured_log.ROOT_LOGGER):
+        progress(get_logger('test'), logging.WARNING, "   ❌", "%s 처리 실패", '합성가')
+
+    assert capsys.readouterr().out == ''
+    assert [(record.levelno, record.getMessage()) for record in caplog.records] == [(logging.WARNING, '합성가 처리 실패')]
+
+
+def test_progress_is_printed_once_in_interactive_mode(interactive, capsys, caplog):
+    with caplog.at_level(logging.DEBUG, logger=structured_log.ROOT_LOGGER):
+        progress(get_logger('test'), logging.WARNING, "   ❌", "%s 처리 실패", '합성가')
+
+    assert capsys.readouterr().out == "   ❌ 합성가 처리 실패\n"
+    assert caplog.records == []
+
+
+def test_extracting_a_filing_prints_nothing_per_job(tmp_path, capsys, caplog):
+    html_file = write_notes_file(str(tmp_path), 'tiny')
+
+    with caplog.at_level(logging.INFO, logger=structured_log.ROOT_LOGGER):
+        assert TableExtractor(str(html_file), output_dir=str(tmp_path)).extract_all_tables()
+
+    assert capsys.readouterr().out == ''
+    messages = [record.getMessage() for record in caplog.records if record.levelno >= logging.INFO]
+    assert len(messages) == 1 and messages[0].startswith("CSV 파일 저장 완료")
+    # 기록 위치는 progress()가 아니라 호출한 추출기
+    assert {record.filename for record in caplog.records} == {'table_extractor.py'}
+
+
+def test_circuit_breaker_messages_are_logged_outside_interactive_mode(capsys, caplog):
+    from dart_throttle import AdaptiveLimiter
+
+    limiter = AdaptiveLimiter('list', failure_threshold=1, cooldown=0.0)
+    with caplog.at_level(logging.INFO, logger=structured_log.ROOT_LOGGER):
+        limiter.acquire()
+        limiter.release(1.0, failed=True)
+        limiter.acquire()
+        limiter.release(0.1)
+
+    assert capsys.readouterr().out == ''
+    assert [(record.levelno, record.endpoint) for record in caplog.records] == [(logging.WARNING, 'list'),
+                                                                                (logging.INFO, 'list')]
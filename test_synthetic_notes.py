@@ -0,0 +1,37 @@
+import notes_api
+from benchmarks import bench_extract
+from benchmarks.synthetic_notes import generate_notes_html, write_notes_file
+
+
+def test_same_seed_gives_the_same_file_and_other_seeds_differ():
+    assert generate_notes_html(seed=1) == generate_notes_html(seed=1)
+    assert generate_notes_html(seed=1) != generate_notes_html(seed=2)
+
+
+def test_target_size_is_reached_with_more_subsidiaries():
+    html = generate_notes_html(subsidiaries=40, target_bytes=200_000)
+
+    assert 200_000 <= len(html.encode('utf-8')) < 260_000
+    items = notes_api.extract(html, backend='columns')
+    # 현황 표는 당반기말·전기말 지분율을 한 행에 담음
+    assert len(items['1']['종속기업명']) == 40
+    assert {'자산', '부채', '자본'} <= set(items['3'])
+
+
+def test_generated_notes_have_dart_structure():
+    html = generate_notes_html()
+
+    assert '1. 지배기업의 개요' in html
+    assert all(f'({number})' in html for number in range(1, 8))
+    assert 'background-color:#D7D7D7' in html and 'ROWSPAN=' in html and 'COLSPAN=' in html
+    assert '&lt;당반기&gt;' in html and '(단위:천원)' in html
+
+
+def test_extract_benchmark_runs_on_generated_notes(tmp_path):
+    html_file = write_notes_file(str(tmp_path), 'tiny')
+
+    result = bench_extract.extract_once(str(html_file), str(tmp_path))
+
+    assert result['success']
+    assert result['tables'] > 0 and result['rows'] > 0
+    assert 'html_parse' in result['stages']
@@ -0,0 +1,30 @@
+import pickle
+
+from table_cache import HeaderMemo
+
+
+def test_header_memo_survives_save_with_same_version(tmp_path):
+    path = tmp_path / 'memo.pkl'
+    memo = HeaderMemo(path=str(path), version='1-abc')
+    memo.put(('구분', 1, 1), (['구분'], ['구분']))
+    memo.save()
+
+    assert HeaderMemo(path=str(path), version='1-abc').get(('구분', 1, 1)) == (['구분'], ['구분'])
+
+
+def test_header_memo_is_dropped_when_version_changes(tmp_path):
+    path = tmp_path / 'memo.pkl'
+    memo = HeaderMemo(path=str(path), version='1-abc')
+    memo.put(('구분', 1, 1), (['구분'], ['구분']))
+    memo.save()
+
+    assert HeaderMemo(path=str(path), version='2-abc').entries == {}
+    assert HeaderMemo(path=str(path), version='1-def').entries == {}
+
+
+def test_unversioned_header_memo_file_is_dropped(tmp_path):
+    path = tmp_path / 'memo.pkl'
+    with open(path, 'wb') as f:
+        pickle.dump([(('구분', 1, 1), (['구분'], ['구분']))], f)
+
+    assert HeaderMemo(path=str(path), version='1-abc').entries == {}
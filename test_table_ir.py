@@ -0,0 +1,39 @@
+import pickle
+
+import pytest
+
+from benchmarks.synthetic_notes import write_notes_file
+from table_extractor import TableExtractor
+from table_ir import Cell, Row, Section, Table
+
+
+@pytest.fixture(scope='module')
+def sections(tmp_path_factory):
+    html_file = write_notes_file(str(tmp_path_factory.mktemp('notes')), 'tiny')
+    return TableExtractor(str(html_file)).extract_sections()
+
+
+def test_ir_objects_have_no_per_instance_dict():
+    for obj in (Cell('a', 'a'), Row(['a']), Table('항목', None, [], []), Section('1')):
+        assert not hasattr(obj, '__dict__')
+
+
+def test_extracted_sections_are_typed_ir(sections):
+    assert [section.number for section in sections] == ['1', '2', '3', '4', '5', '6', '7']
+    tables = [table for section in sections for table in section.tables]
+    assert all(isinstance(table, Table) for table in tables)
+    assert all(isinstance(row, Row) and isinstance(row.values, list) for table in tables for row in table.rows)
+
+
+def test_equity_merge_keeps_each_rows_period_on_the_row(sections):
+    extractor = TableExtractor('unused.html')
+    equity = next(section for section in sections if section.number == '6')
+
+    merged = extractor.merge_equity_tables(equity.tables)
+
+    assert len(merged) == 1
+    assert {row.period for row in merged[0].rows} == {table.period for table in equity.tables}
+
+
+def test_sections_survive_pickling_for_cache_and_workers(sections):
+    assert pickle.loads(pickle.dumps(sections)) == sections